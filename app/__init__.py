@@ -1,17 +1,116 @@
-from app.scale_generator import ScaleGenerator
-from app.chord_generator import ChordGenerator
-from app.scale_fretboard import ScaleFretboard
-from app.utils import generate_sequence_from_intervals, generate_string, generate_cache_key, get_or_generate, determine_pattern_type
-
-__all__ = [
-
-    "ScaleGenerator",
-    "ChordGenerator",
-    "ScaleFretboard",
-    "generate_sequence_from_intervals",
-    "generate_string",
-    "generate_cache_key",
-    "get_or_generate",
-    "determine_pattern_type"
-    
-]
+import sys
+
+# Builtin generics are used here rather than typing, which would dominate the cost of importing the package
+
+# Public names and the submodule that defines each, imported on first attribute access so "import app" stays cheap
+_lazy_attributes: dict[str, str] = {
+
+    "ScaleGenerator": "app.scale_generator",
+    "ChordGenerator": "app.chord_generator",
+    "ScaleFretboard": "app.scale_fretboard",
+    "ChordFretboard": "app.chord_fretboard",
+    "BatchFretboard": "app.batch_fretboard",
+    "FretboardRequest": "app.batch_fretboard",
+    "ChordVoicings": "app.chord_voicings",
+    "ScalePositions": "app.scale_positions",
+    "transpose": "app.transposition",
+    "transpose_to_all_keys": "app.transposition",
+    "transpose_progression": "app.transposition",
+    "ChordRecogniser": "app.chord_recogniser",
+    "NoteEvent": "app.chord_recogniser",
+    "Match": "app.chord_recogniser",
+    "read_events": "app.chord_recogniser",
+    "FretboardRecord": "app.exporters",
+    "Exporter": "app.exporters",
+    "register_exporter": "app.exporters",
+    "export_records": "app.exporters",
+    "Scale": "app.values",
+    "Chord": "app.values",
+    "ChordSet": "app.values",
+    "FretboardStrings": "app.values",
+    "Fretboard": "app.fretboard",
+    "fretboard_from_notes": "app.fretboard",
+    "PatternIndex": "app.pattern_index",
+    "PatternEntry": "app.pattern_index",
+    "get_pattern_index": "app.pattern_index",
+    "positions_to_mask": "app.pattern_index",
+    "FretboardDiagram": "app.print_fretboard",
+    "render_fretboard": "app.print_fretboard",
+    "render_fretboards": "app.print_fretboard",
+    "CacheBackend": "app.cache",
+    "LRUCache": "app.cache",
+    "CacheInfo": "app.cache",
+    "LazySequence": "app.cache",
+    "SQLiteCache": "app.persistent_cache",
+    "SingleFlightCache": "app.cache",
+    "ThreadSafeGenerators": "app.thread_safe",
+    "BinaryCatalogue": "app.binary_catalogue",
+    "BinaryCatalogueCache": "app.binary_catalogue",
+    "build_catalogue": "app.build_catalogue",
+    "DistanceTables": "app.voice_leading",
+    "get_distance_tables": "app.voice_leading",
+    "minimal_voice_leading": "app.voice_leading",
+    "common_tones": "app.voice_leading",
+    "distance": "app.voice_leading",
+    "nearest": "app.voice_leading",
+    "rank": "app.voice_leading",
+    "smoothest_path": "app.voice_leading",
+    "determine_mode": "app.modes",
+    "rotate_intervals": "app.modes",
+    "chord_numerals": "app.modes",
+    "spell_scale": "app.spelling",
+    "spell_note": "app.spelling",
+    "spelled_chromatic_scale": "app.spelling",
+    "get_default_cache": "app.cache",
+    "set_default_cache": "app.cache",
+    "cache_info": "app.cache",
+    "generate_sequence_from_intervals": "app.utils",
+    "generate_string": "app.utils",
+    "generate_cache_key": "app.utils",
+    "get_or_generate": "app.utils",
+    "determine_pattern_type": "app.utils",
+    "notes_to_mask": "app.utils",
+    "intervals_to_mask": "app.utils",
+    "rotate_mask": "app.utils",
+    "mask_to_pitch_classes": "app.utils",
+    "mask_to_notes": "app.utils",
+    "chord_masks_from_scale_mask": "app.utils",
+    "build_pattern_table": "app.utils",
+    "get_pattern_table": "app.utils"
+
+}
+
+__all__ = list(_lazy_attributes)
+
+def __getattr__(name: str) -> object:
+
+    """
+    A function to import the submodule defining a public name on first access, then cache the name on the package.
+
+    Args:
+
+        name: The attribute being accessed.
+
+    Return:
+
+        The public object.
+
+    """
+
+    module_name: str | None = _lazy_attributes.get(name)
+
+    if module_name is None:
+
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    __import__(module_name)
+
+    value: object = getattr(sys.modules[module_name], name)
+
+    globals()[name] = value
+
+    return value
+
+def __dir__() -> list[str]:
+
+    return sorted(set(globals()) | set(__all__))
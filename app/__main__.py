@@ -0,0 +1,5 @@
+from app.print_fretboard import main
+
+if __name__ == "__main__":
+
+    main()
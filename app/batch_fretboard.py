@@ -0,0 +1,348 @@
+from typing import List, Dict, Tuple, Set, Optional, NamedTuple, Sequence, Iterator
+
+import numpy as np
+
+from config.config import CHROMATIC_SCALE, PITCH_CLASSES, FRETBOARD_LEN, NUM_PITCH_CLASSES
+from app.library.intervals import chord_intervals
+from app.library.masks import scale_masks
+from app.library.tunings import tunings
+from app.library.enums import ScaleTypes, ChordTypes
+from app.utils import generate_cache_key, get_or_generate, rotate_mask, chord_masks_from_scale_mask, note_width
+from app.spelling import spell_scale, spelled_chromatic_scale
+
+class FretboardRequest(NamedTuple):
+
+    """
+    A single fretboard request within a batch.
+
+    Attributes:
+
+        scale_key: The root note of the scale.
+        scale_type: The name of the scale type.
+        tuning: A tuple containing the root note of each open string.
+        chord_type: The name of the chord type, or None for a scale fretboard.
+        chord_degree: The index of the scale degree the chord is built on, or None for a scale fretboard.
+
+    """
+
+    scale_key: str
+    scale_type: ScaleTypes
+    tuning: Tuple[str, ...]
+    chord_type: Optional[ChordTypes] = None
+    chord_degree: Optional[int] = None
+
+class BatchFretboard:
+
+    """
+    A class to generate many scale fretboards or chord fretboards at once, as a single boolean array.
+
+    Attributes:
+
+        _fretboard_len: The length of the fretboard.
+        _formatted_notes: An array of the chromatic scale, formatted for guitar string representations of fretboards without a request.
+        _formatted_notes_cache: A dictionary, keyed by a tuple of scale key, scale type, chord type and chord degree, containing the chromatic scale spelled and formatted as the request's scale spells it.
+        _pitch_class_matrix_cache: A dictionary, keyed by a tuple of tuning and fretboard length, containing the pitch class at each string and fret.
+        _mask_cache: A dictionary, keyed by a tuple of scale key, scale type, chord type and chord degree, containing pitch class masks.
+
+    """
+
+    def __init__(self,
+                 fretboard_len: int = FRETBOARD_LEN
+                 ) -> None:
+
+        self._fretboard_len: int = fretboard_len
+        self._formatted_notes: np.ndarray = np.array([f"{note:<2}" for note in CHROMATIC_SCALE] + ["__"])
+        self._formatted_notes_cache: Dict[Tuple[str, str, str, Optional[str], Optional[int]], np.ndarray] = {}
+        self._pitch_class_matrix_cache: Dict[Tuple[str, Tuple[str, ...], int], np.ndarray] = {}
+        self._mask_cache: Dict[Tuple[str, str, str, Optional[str], Optional[int]], int] = {}
+
+    def get_or_generate_pitch_class_matrix(self,
+                                           tuning: Sequence[str]
+                                           ) -> np.ndarray:
+
+        """
+        Retrieves the pitch class matrix of a tuning from the cache.
+        If unavailable, generates the pitch class matrix and stores it in the cache.
+
+        Args:
+
+            tuning: A sequence containing the root note of each open string.
+
+        Returns:
+
+            pitch_class_matrix: An int8 array of shape (strings, frets), containing the pitch class at each fret.
+
+        """
+
+        cache_key: Tuple[str, Tuple[str, ...], int] = generate_cache_key("BatchFretboard", tuple(tuning), self._fretboard_len)
+
+        pitch_class_matrix: np.ndarray = get_or_generate(cache=self._pitch_class_matrix_cache,
+                                                         cache_key=cache_key,
+                                                         generate_function=lambda: self._compute_pitch_class_matrix(tuning=tuning))
+
+        return pitch_class_matrix
+
+    def _compute_pitch_class_matrix(self,
+                                    tuning: Sequence[str]
+                                    ) -> np.ndarray:
+
+        """
+        Computes the pitch class at each string and fret of a tuning.
+
+        Args:
+
+            tuning: A sequence containing the root note of each open string.
+
+        Returns:
+
+            pitch_class_matrix: An int8 array of shape (strings, frets).
+
+        """
+
+        # Open string pitch classes as a column, broadcast against the fret numbers as a row
+        open_pitch_classes: np.ndarray = np.array([PITCH_CLASSES[root_note] for root_note in tuning], dtype=np.int8)[:, None]
+
+        pitch_class_matrix: np.ndarray = (open_pitch_classes + np.arange(self._fretboard_len, dtype=np.int8)[None, :]) % NUM_PITCH_CLASSES
+
+        # Cached matrices are shared between batches, so they are made read-only
+        pitch_class_matrix.setflags(write=False)
+
+        return pitch_class_matrix
+
+    def get_or_generate_mask(self,
+                             request: FretboardRequest
+                             ) -> int:
+
+        """
+        Retrieves the pitch class mask of a request from the cache.
+        If unavailable, generates the pitch class mask and stores it in the cache.
+
+        Args:
+
+            request: The fretboard request.
+
+        Returns:
+
+            mask: The pitch class mask of the scale, or of the chord on the requested degree.
+
+        """
+
+        chord_type_value: Optional[str] = request.chord_type.value if request.chord_type is not None else None
+
+        cache_key: Tuple[str, str, str, Optional[str], Optional[int]] = generate_cache_key("BatchFretboard", request.scale_key, request.scale_type.value, chord_type_value, request.chord_degree)
+
+        mask: int = get_or_generate(cache=self._mask_cache,
+                                    cache_key=cache_key,
+                                    generate_function=lambda: self._compute_mask(request=request))
+
+        return mask
+
+    def _compute_mask(self,
+                      request: FretboardRequest
+                      ) -> int:
+
+        """
+        Computes the pitch class mask of the scale, or of the chord on the requested degree of the scale.
+
+        Args:
+
+            request: The fretboard request.
+
+        Returns:
+
+            mask: An integer pitch class mask.
+
+        """
+
+        scale_key_index: int = PITCH_CLASSES[request.scale_key]
+
+        scale_mask: int = rotate_mask(mask=scale_masks[request.scale_type.value], semitones=scale_key_index)
+
+        if request.chord_type is None:
+
+            return scale_mask
+
+        chord_masks: List[int] = chord_masks_from_scale_mask(scale_mask=scale_mask,
+                                                             start_position=scale_key_index,
+                                                             intervals=chord_intervals[request.chord_type.value])
+
+        return chord_masks[request.chord_degree]
+
+    def get_or_generate_formatted_notes(self,
+                                        request: FretboardRequest
+                                        ) -> np.ndarray:
+
+        """
+        Retrieves the formatted notes of a request from the cache.
+        If unavailable, generates the formatted notes and stores them in the cache.
+
+        Args:
+
+            request: The fretboard request.
+
+        Returns:
+
+            formatted_notes: An array of the twelve formatted notes of the chromatic scale, followed by a blank space.
+
+        """
+
+        chord_type_value: Optional[str] = request.chord_type.value if request.chord_type is not None else None
+
+        cache_key: Tuple[str, str, str, Optional[str], Optional[int]] = generate_cache_key("BatchFretboard", request.scale_key, request.scale_type.value, chord_type_value, request.chord_degree)
+
+        formatted_notes: np.ndarray = get_or_generate(cache=self._formatted_notes_cache,
+                                                      cache_key=cache_key,
+                                                      generate_function=lambda: self._compute_formatted_notes(request=request))
+
+        return formatted_notes
+
+    def _compute_formatted_notes(self,
+                                 request: FretboardRequest
+                                 ) -> np.ndarray:
+
+        """
+        Computes the chromatic scale as ScaleFretboard and ChordFretboard spell it: respelled with the notes of the scale, or of the chord, and padded to the widest of them.
+
+        Args:
+
+            request: The fretboard request.
+
+        Returns:
+
+            formatted_notes: An array of the twelve formatted notes of the chromatic scale, followed by a blank space.
+
+        """
+
+        mask: int = self.get_or_generate_mask(request=request)
+
+        # Only the scale notes that sound in the fretboard, so a chord is padded to its own notes as ChordFretboard pads it
+        notes: List[str] = [note for note in spell_scale(scale_key=request.scale_key, scale_type=request.scale_type.value) if mask >> PITCH_CLASSES[note] & 1]
+
+        note_sequence: List[str] = spelled_chromatic_scale(notes=notes)
+
+        width: int = note_width(note_sequence=note_sequence)
+
+        return np.array([f"{note:<{width}}" for note in note_sequence] + ["_" * width])
+
+    def compute_fretboards(self,
+                           requests: Sequence[FretboardRequest]
+                           ) -> np.ndarray:
+
+        """
+        Computes the fretboards of a batch of requests in a single broadcast.
+        Every request in the batch must use a tuning with the same number of strings.
+
+        Args:
+
+            requests: A sequence of fretboard requests.
+
+        Returns:
+
+            fretboards: A boolean array of shape (requests, strings, frets), True where the fret belongs to the scale or chord.
+
+        """
+
+        if not requests:
+
+            return np.zeros((0, 0, self._fretboard_len), dtype=bool)
+
+        # Stacks one pitch class matrix per distinct tuning
+        tuning_indices: Dict[Tuple[str, ...], int] = {}
+
+        for request in requests:
+
+            tuning_indices.setdefault(tuple(request.tuning), len(tuning_indices))
+
+        string_counts: Set[int] = {len(tuning) for tuning in tuning_indices}
+
+        if len(string_counts) != 1:
+
+            raise ValueError(f"All tunings in a batch must have the same number of strings, got {sorted(string_counts)}")
+
+        pitch_class_matrices: np.ndarray = np.stack([self.get_or_generate_pitch_class_matrix(tuning=tuning) for tuning in tuning_indices])
+
+        # Gathers each request's tuning and mask
+        request_tunings: np.ndarray = np.fromiter((tuning_indices[tuple(request.tuning)] for request in requests), dtype=np.intp, count=len(requests))
+
+        masks: np.ndarray = np.fromiter((self.get_or_generate_mask(request=request) for request in requests), dtype=np.int16, count=len(requests))
+
+        # Tests the bit of every fret's pitch class against its request's mask
+        fretboards: np.ndarray = ((masks[:, None, None] >> pitch_class_matrices[request_tunings]) & 1).astype(bool)
+
+        return fretboards
+
+    def format_fretboard(self,
+                         fretboard: np.ndarray,
+                         tuning: Sequence[str],
+                         request: Optional[FretboardRequest] = None
+                         ) -> Dict[str, List[str]]:
+
+        """
+        Formats a single fretboard from a batch into guitar string representations.
+        Given the request the fretboard was computed from, notes are spelled and padded as ScaleFretboard and ChordFretboard spell them, otherwise with the sharps of the chromatic scale.
+
+        Args:
+
+            fretboard: A boolean array of shape (strings, frets).
+            tuning: A sequence containing the root note of each open string.
+            request: The fretboard request, or None.
+
+        Returns:
+
+            scale_string_dict: A dictionary containing root notes as keys and note string representations as values.
+
+        """
+
+        pitch_class_matrix: np.ndarray = self.get_or_generate_pitch_class_matrix(tuning=tuning)
+
+        formatted_notes: np.ndarray = self.get_or_generate_formatted_notes(request=request) if request is not None else self._formatted_notes
+
+        # Unmarked frets index the trailing blank entry of the formatted notes
+        formatted: np.ndarray = formatted_notes[np.where(fretboard, pitch_class_matrix, NUM_PITCH_CLASSES)]
+
+        return {root_note: formatted[string_index].tolist() for string_index, root_note in enumerate(tuning)}
+
+    def iter_formatted_fretboards(self,
+                                  fretboards: np.ndarray,
+                                  requests: Sequence[FretboardRequest]
+                                  ) -> Iterator[Dict[str, List[str]]]:
+
+        """
+        Lazily formats each fretboard of a batch, so only the fretboards that are consumed are formatted.
+
+        Args:
+
+            fretboards: A boolean array of shape (requests, strings, frets).
+            requests: The sequence of fretboard requests the array was computed from.
+
+        Returns:
+
+            An iterator of dictionaries containing root notes as keys and note string representations as values.
+
+        """
+
+        for fretboard, request in zip(fretboards, requests):
+
+            yield self.format_fretboard(fretboard=fretboard, tuning=request.tuning, request=request)
+
+
+
+if __name__ == "__main__":
+
+    print("--------------------")
+
+    demo_batch_fretboard = BatchFretboard()
+
+    demo_requests = [FretboardRequest(scale_key=scale_key, scale_type=ScaleTypes.MAJOR_SCALE, tuning=tunings["e_standard"]) for scale_key in CHROMATIC_SCALE]
+
+    demo_requests.append(FretboardRequest(scale_key="D", scale_type=ScaleTypes.NATURAL_MINOR, tuning=tunings["open_c"], chord_type=ChordTypes.SEVENTH, chord_degree=0))
+
+    demo_fretboards = demo_batch_fretboard.compute_fretboards(requests=demo_requests)
+
+    print(demo_fretboards.shape)
+
+    print("--------------------")
+
+    print(next(demo_batch_fretboard.iter_formatted_fretboards(fretboards=demo_fretboards, requests=demo_requests)))
+
+    print("--------------------")
@@ -0,0 +1,569 @@
+import json
+import mmap
+import struct
+import sys
+from functools import lru_cache
+from typing import List, Dict, Tuple, Any, Optional, Sequence, Callable
+
+from config.config import CHROMATIC_SCALE, PITCH_CLASSES, NOTE_SPELLINGS
+from app.library.degrees import chord_degrees
+from app.library.enums import ScaleTypes, ChordTypes
+from app.cache import CacheBackend, CacheInfo, MISSING, get_default_cache
+from app.persistent_cache import library_fingerprint
+from app.values import FretboardStrings
+from app.fretboard import Fretboard, get_or_generate_fretboard
+from app.spelling import spelled_chromatic_scale
+from app.utils import notes_to_mask, note_width
+
+# Identifies catalogue files, followed by the format version
+CATALOGUE_MAGIC: bytes = b"FBCATLG\0"
+CATALOGUE_FORMAT_VERSION: int = 1
+
+# Magic, format version, fretboard length, library fingerprint, record size, strings per record, number of records, name table offset and length, records offset
+HEADER: struct.Struct = struct.Struct("<8sHH16sIIQQQQ")
+
+# Pitch class mask, 1 if the record is in use, and the number of strings of its tuning, followed by one signed byte per string and fret
+RECORD_HEADER: struct.Struct = struct.Struct("<HBB")
+
+# Records begin on a cache line boundary
+RECORDS_ALIGNMENT: int = 64
+
+# Cache key namespaces answered from the catalogue that are keyed by sorted notes and a tuning, besides chord strings keyed by chord set and tuning
+_STRING_NAMESPACES: Tuple[str, ...] = ("ScaleFretboard", "ChordStrings")
+
+def catalogue_axes(catalogue_tunings: Dict[str, Tuple[str, ...]]) -> Dict[str, Any]:
+
+    """
+    A function to list the names along each axis of the record grid, in record order.
+
+    Args:
+
+        catalogue_tunings: A dictionary containing tuning names as keys and tuples of open string notes as values.
+
+    Return:
+
+        A dictionary of tunings, keys, scale types, chord types with None for the scale itself, and the largest number of chord degrees.
+
+    """
+
+    scale_type_values: List[str] = [scale_type.value for scale_type in ScaleTypes]
+
+    return {
+
+        "tunings": {tuning_name: list(tuning) for tuning_name, tuning in catalogue_tunings.items()},
+        "keys": list(CHROMATIC_SCALE),
+        "scale_types": scale_type_values,
+        "chord_types": [None, *(chord_type.value for chord_type in ChordTypes)],
+        "num_degrees": max(len(chord_degrees[chord_type.value][scale_type_value]) for chord_type in ChordTypes for scale_type_value in scale_type_values)
+
+    }
+
+class BinaryCatalogue:
+
+    """
+    A read-only, memory mapped binary catalogue of pitch class masks and fretboard rows, with random access to any record.
+    Only the header and name table are parsed on opening; records are read in place, so processes mapping the same file share its pages through the page cache.
+
+    Attributes:
+
+        _path: The path of the catalogue file.
+        _file: The open catalogue file.
+        _mmap: The read-only memory map of the file.
+        _view: A signed byte view over the memory map.
+        _fretboard_len: The number of frets of each row.
+        _record_size: The size of each record in bytes.
+        _num_records: The number of record slots.
+        _records_offset: The offset of the first record.
+        _tunings: A dictionary containing tuning names as keys and tuples of open string notes as values.
+        _tuning_indices: A dictionary containing tuning names as keys and their positions as values.
+        _scale_type_indices: A dictionary containing scale type names as keys and their positions as values.
+        _chord_type_indices: A dictionary containing chord type names, with None for the scale itself, as keys and their positions as values.
+        _strides: The number of records spanned by one step of the tuning, key, scale type and chord type axes.
+
+    """
+
+    def __init__(self,
+                 path: str
+                 ) -> None:
+
+        self._path: str = path
+        self._file = open(path, "rb")
+        self._mmap: mmap.mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, fretboard_len, fingerprint, record_size, _, num_records, names_offset, names_length, records_offset = HEADER.unpack_from(self._mmap, 0)
+
+        if magic != CATALOGUE_MAGIC or version != CATALOGUE_FORMAT_VERSION:
+
+            self.close()
+
+            raise ValueError(f"{path} is not a version {CATALOGUE_FORMAT_VERSION} fretboard catalogue")
+
+        if fingerprint.hex() != library_fingerprint():
+
+            self.close()
+
+            raise ValueError(f"{path} was built with different library tables and must be rebuilt")
+
+        axes: Dict[str, Any] = json.loads(self._mmap[names_offset:names_offset + names_length])
+
+        self._view: memoryview = memoryview(self._mmap).cast("b")
+        self._fretboard_len: int = fretboard_len
+        self._record_size: int = record_size
+        self._num_records: int = num_records
+        self._records_offset: int = records_offset
+        self._tunings: Dict[str, Tuple[str, ...]] = {tuning_name: tuple(sys.intern(root_note) for root_note in tuning) for tuning_name, tuning in axes["tunings"].items()}
+        self._tuning_indices: Dict[str, int] = {tuning_name: index for index, tuning_name in enumerate(axes["tunings"])}
+        self._scale_type_indices: Dict[str, int] = {scale_type: index for index, scale_type in enumerate(axes["scale_types"])}
+        self._chord_type_indices: Dict[Optional[str], int] = {chord_type: index for index, chord_type in enumerate(axes["chord_types"])}
+
+        # Records are ordered by tuning, key, scale type, chord type and chord degree
+        chord_type_stride: int = axes["num_degrees"]
+        scale_type_stride: int = chord_type_stride * len(axes["chord_types"])
+        key_stride: int = scale_type_stride * len(axes["scale_types"])
+        tuning_stride: int = key_stride * len(axes["keys"])
+
+        self._strides: Tuple[int, int, int, int] = (tuning_stride, key_stride, scale_type_stride, chord_type_stride)
+
+    @property
+    def tunings(self) -> Dict[str, Tuple[str, ...]]:
+
+        return self._tunings
+
+    @property
+    def fretboard_len(self) -> int:
+
+        return self._fretboard_len
+
+    def __len__(self) -> int:
+
+        return self._num_records
+
+    def record_offset(self,
+                      scale_key: str,
+                      scale_type: ScaleTypes,
+                      tuning_name: str,
+                      chord_type: Optional[ChordTypes] = None,
+                      chord_degree: int = 0
+                      ) -> int:
+
+        """
+        Locates a record by arithmetic on its names, in any enharmonic spelling of the scale key.
+
+        Args:
+
+            scale_key: The root note of the scale.
+            scale_type: The name of the scale type.
+            tuning_name: The name of the tuning.
+            chord_type: The name of the chord type, or None for the scale itself.
+            chord_degree: The index of the scale degree the chord is built on, 0 for the scale itself.
+
+        Returns:
+
+            The byte offset of the record.
+
+        """
+
+        tuning_stride, key_stride, scale_type_stride, chord_type_stride = self._strides
+
+        if not 0 <= chord_degree < chord_type_stride:
+
+            raise IndexError(f"Chord degree {chord_degree} is outside the catalogue")
+
+        record_index: int = (self._tuning_indices[tuning_name] * tuning_stride
+                             + PITCH_CLASSES[NOTE_SPELLINGS[scale_key]] * key_stride
+                             + self._scale_type_indices[scale_type.value] * scale_type_stride
+                             + self._chord_type_indices[chord_type.value if chord_type is not None else None] * chord_type_stride
+                             + chord_degree)
+
+        offset: int = self._records_offset + record_index * self._record_size
+
+        if not self._view[offset + 2]:
+
+            raise KeyError(f"No record for chord degree {chord_degree} of {scale_key} {scale_type.value} {chord_type.value if chord_type is not None else 'scale'}")
+
+        return offset
+
+    def mask(self,
+             scale_key: str,
+             scale_type: ScaleTypes,
+             tuning_name: str,
+             chord_type: Optional[ChordTypes] = None,
+             chord_degree: int = 0
+             ) -> int:
+
+        """
+        Reads the pitch class mask of a scale or chord.
+
+        Args:
+
+            scale_key: The root note of the scale.
+            scale_type: The name of the scale type.
+            tuning_name: The name of the tuning.
+            chord_type: The name of the chord type, or None for the scale itself.
+            chord_degree: The index of the scale degree the chord is built on, 0 for the scale itself.
+
+        Returns:
+
+            The pitch class mask.
+
+        """
+
+        return RECORD_HEADER.unpack_from(self._mmap, self.record_offset(scale_key=scale_key, scale_type=scale_type, tuning_name=tuning_name, chord_type=chord_type, chord_degree=chord_degree))[0]
+
+    def row(self,
+            scale_key: str,
+            scale_type: ScaleTypes,
+            tuning_name: str,
+            string_index: int,
+            chord_type: Optional[ChordTypes] = None,
+            chord_degree: int = 0
+            ) -> memoryview:
+
+        """
+        Reads every fret of one string in place, without copying it out of the memory map.
+
+        Args:
+
+            scale_key: The root note of the scale.
+            scale_type: The name of the scale type.
+            tuning_name: The name of the tuning.
+            string_index: The string number, 0 being the first note of the tuning.
+            chord_type: The name of the chord type, or None for the scale itself.
+            chord_degree: The index of the scale degree the chord is built on, 0 for the scale itself.
+
+        Returns:
+
+            A read-only view of signed bytes, holding the pitch class of each fret or BLANK where it is not in the scale or chord.
+
+        """
+
+        offset: int = self.record_offset(scale_key=scale_key, scale_type=scale_type, tuning_name=tuning_name, chord_type=chord_type, chord_degree=chord_degree)
+
+        if not 0 <= string_index < self._view[offset + 3]:
+
+            raise IndexError(f"String {string_index} is outside the tuning {tuning_name}")
+
+        row_offset: int = offset + RECORD_HEADER.size + string_index * self._fretboard_len
+
+        return self._view[row_offset:row_offset + self._fretboard_len]
+
+    def fretboard(self,
+                  scale_key: str,
+                  scale_type: ScaleTypes,
+                  tuning_name: str,
+                  chord_type: Optional[ChordTypes] = None,
+                  chord_degree: int = 0
+                  ) -> Fretboard:
+
+        """
+        Retrieves the fretboard of a scale or chord from its catalogued mask, shared through the cache with any equal fretboard.
+
+        Args:
+
+            scale_key: The root note of the scale.
+            scale_type: The name of the scale type.
+            tuning_name: The name of the tuning.
+            chord_type: The name of the chord type, or None for the scale itself.
+            chord_degree: The index of the scale degree the chord is built on, 0 for the scale itself.
+
+        Returns:
+
+            A fretboard indexed by string number.
+
+        """
+
+        return get_or_generate_fretboard(mask=self.mask(scale_key=scale_key, scale_type=scale_type, tuning_name=tuning_name, chord_type=chord_type, chord_degree=chord_degree),
+                                         tuning=self._tunings[tuning_name],
+                                         num_frets=self._fretboard_len)
+
+    def record_rows(self,
+                    offset: int
+                    ) -> memoryview:
+
+        """
+        Reads every row of a record in place, one after another in tuning order.
+
+        Args:
+
+            offset: The byte offset of the record, as returned by record_offset or index_masks.
+
+        Returns:
+
+            A read-only view of signed bytes, holding the fret length of each string of the tuning.
+
+        """
+
+        rows_offset: int = offset + RECORD_HEADER.size
+
+        return self._view[rows_offset:rows_offset + self._view[offset + 3] * self._fretboard_len]
+
+    def index_masks(self) -> Dict[Tuple[int, Tuple[str, ...]], int]:
+
+        """
+        Scans the record headers once to find a record for every distinct mask of every tuning.
+
+        Returns:
+
+            A dictionary, keyed by a tuple of pitch class mask and tuning, containing the byte offset of a record.
+
+        """
+
+        mask_offsets: Dict[Tuple[int, Tuple[str, ...]], int] = {}
+
+        tuning_stride: int = self._strides[0]
+
+        for tuning_name, tuning_index in self._tuning_indices.items():
+
+            tuning: Tuple[str, ...] = self._tunings[tuning_name]
+
+            for record_index in range(tuning_index * tuning_stride, (tuning_index + 1) * tuning_stride):
+
+                offset: int = self._records_offset + record_index * self._record_size
+
+                mask, in_use, _ = RECORD_HEADER.unpack_from(self._mmap, offset)
+
+                if in_use:
+
+                    mask_offsets.setdefault((mask, tuning), offset)
+
+        return mask_offsets
+
+    def close(self) -> None:
+
+        """
+        Releases the memory map and the file. Views returned by row must be released first.
+
+        """
+
+        if getattr(self, "_view", None) is not None:
+
+            self._view.release()
+
+            self._view = None
+
+        self._mmap.close()
+
+        self._file.close()
+
+    def __enter__(self) -> "BinaryCatalogue":
+
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+
+        self.close()
+
+class BinaryCatalogueCache(CacheBackend):
+
+    """
+    A read-only cache backend answering scale strings and chord strings lookups from a memory mapped binary catalogue, in front of another backend for everything else.
+    Strings are rendered from the catalogued rows on each lookup rather than stored, so worker processes share the catalogue pages instead of each filling its own cache.
+    Lookups the catalogue cannot answer, such as tunings it does not hold, fall through to the other backend, which also receives every value stored.
+
+    Attributes:
+
+        _catalogue: The binary catalogue.
+        _fallback: The cache backend consulted for lookups the catalogue cannot answer.
+        _mask_offsets: A dictionary, keyed by a tuple of pitch class mask and tuning, containing the byte offset of a record, built on first lookup.
+        _hits: The number of lookups answered from the catalogue.
+
+    """
+
+    def __init__(self,
+                 path: str,
+                 fallback: Optional[CacheBackend] = None
+                 ) -> None:
+
+        self._catalogue: BinaryCatalogue = BinaryCatalogue(path=path)
+        self._fallback: CacheBackend = fallback if fallback is not None else get_default_cache()
+        self._mask_offsets: Optional[Dict[Tuple[int, Tuple[str, ...]], int]] = None
+        self._hits: int = 0
+
+    @property
+    def catalogue(self) -> BinaryCatalogue:
+
+        return self._catalogue
+
+    def get(self,
+            cache_key: Tuple[Any, ...],
+            default: Any = MISSING
+            ) -> Any:
+
+        if cache_key[0] in _STRING_NAMESPACES or (cache_key[0] == "ChordFretboard" and len(cache_key) == 3):
+
+            if self._mask_offsets is None:
+
+                self._mask_offsets = self._catalogue.index_masks()
+
+            value: Any = self._lookup_strings(cache_key=cache_key)
+
+            if value is not MISSING:
+
+                self._hits += 1
+
+                return value
+
+        return self._fallback.get(cache_key, default)
+
+    def set(self,
+            cache_key: Tuple[Any, ...],
+            value: Any
+            ) -> None:
+
+        self._fallback.set(cache_key, value)
+
+    def clear(self) -> None:
+
+        self._fallback.clear()
+
+        self._hits = 0
+
+    def cache_info(self,
+                   namespace: Optional[str] = None
+                   ) -> CacheInfo:
+
+        """
+        Reports the statistics of the fallback backend, with lookups answered from the catalogue counted as hits when no namespace is given.
+
+        Args:
+
+            namespace: The class name prefix of the cache keys, or None for every namespace.
+
+        Returns:
+
+            A CacheInfo tuple.
+
+        """
+
+        info: CacheInfo = self._fallback.cache_info(namespace=namespace)
+
+        return info._replace(hits=info.hits + self._hits) if namespace is None else info
+
+    def _lookup_strings(self,
+                        cache_key: Tuple[Any, ...]
+                        ) -> Any:
+
+        """
+        Renders the strings of a scale, a chord, or every chord degree of a chord set from the catalogue.
+
+        Args:
+
+            cache_key: A scale strings, chord strings or chord set strings cache key.
+
+        Returns:
+
+            The rendered strings, or MISSING if the catalogue does not hold the tuning or any of the notes.
+
+        """
+
+        if cache_key[0] in _STRING_NAMESPACES:
+
+            _, notes, tuning = cache_key
+
+            offset: Optional[int] = self._mask_offsets.get((notes_to_mask(notes=notes), tuning))
+
+            return self._render_strings(offset=offset, notes=notes, tuning=tuning) if offset is not None else MISSING
+
+        _, chord_set, tuning = cache_key
+
+        chord_strings: Dict[str, FretboardStrings] = {}
+
+        for chord_degree, chord_notes in chord_set.items():
+
+            # Sorted as the chord strings cache keys are, so both render the same spelling
+            sorted_chord_notes: Tuple[str, ...] = tuple(sorted(chord_notes, key=PITCH_CLASSES.__getitem__))
+
+            offset = self._mask_offsets.get((notes_to_mask(notes=sorted_chord_notes), tuning))
+
+            if offset is None:
+
+                return MISSING
+
+            chord_strings[chord_degree] = self._render_strings(offset=offset, notes=sorted_chord_notes, tuning=tuning)
+
+        return FretboardStrings(chord_strings)
+
+    def _render_strings(self,
+                        offset: int,
+                        notes: Sequence[str],
+                        tuning: Tuple[str, ...]
+                        ) -> FretboardStrings:
+
+        """
+        Formats the catalogued rows of a record as guitar string representations, spelled as the notes are.
+
+        Args:
+
+            offset: The byte offset of the record.
+            notes: The scale notes or chord notes of the cache key.
+            tuning: A tuple containing the root note of each open string.
+
+        Returns:
+
+            Immutable fretboard strings containing root notes as keys and string representations as values.
+
+        """
+
+        format_note: Callable[[int], str] = _formatted_notes(notes=notes).__getitem__
+
+        fretboard_len: int = self._catalogue.fretboard_len
+
+        # One conversion of the whole record, rather than one per string
+        pitch_classes: List[int] = self._catalogue.record_rows(offset=offset).tolist()
+
+        strings: Dict[str, Tuple[str, ...]] = {}
+
+        for string_index, root_note in enumerate(tuning):
+
+            strings[root_note] = tuple(map(format_note, pitch_classes[string_index * fretboard_len:(string_index + 1) * fretboard_len]))
+
+        return FretboardStrings(strings)
+
+@lru_cache(maxsize=None)
+def _formatted_notes(notes: Tuple[str, ...]) -> List[str]:
+
+    """
+    A function to format the chromatic scale as spelled by some notes, followed by a blank space at index -1 for BLANK.
+
+    Args:
+
+        notes: The sorted scale notes or chord notes of a cache key.
+
+    Return:
+
+        A list of thirteen formatted notes, padded to the widest note name, shared by every caller and not to be modified.
+
+    """
+
+    note_sequence: List[str] = spelled_chromatic_scale(notes=notes)
+
+    width: int = note_width(note_sequence=note_sequence)
+
+    return [f"{note:<{width}}" for note in note_sequence] + ["_" * width]
+
+
+
+if __name__ == "__main__":
+
+    import os
+    import tempfile
+
+    from app.build_catalogue import build_catalogue
+
+    print("--------------------")
+
+    with tempfile.TemporaryDirectory() as demo_directory:
+
+        demo_path = os.path.join(demo_directory, "catalogue.fbc")
+
+        print(build_catalogue(path=demo_path), "records,", os.path.getsize(demo_path), "bytes")
+
+        with BinaryCatalogue(path=demo_path) as demo_catalogue:
+
+            print(bin(demo_catalogue.mask(scale_key="G", scale_type=ScaleTypes.MAJOR_SCALE, tuning_name="e_standard")))
+
+            print(demo_catalogue.row(scale_key="G", scale_type=ScaleTypes.MAJOR_SCALE, tuning_name="e_standard", string_index=0, chord_type=ChordTypes.SEVENTH, chord_degree=4).tolist())
+
+            print(demo_catalogue.fretboard(scale_key="G", scale_type=ScaleTypes.MAJOR_SCALE, tuning_name="e_standard", chord_type=ChordTypes.SEVENTH, chord_degree=4).strings()[0])
+
+    print("--------------------")
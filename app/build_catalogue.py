@@ -0,0 +1,143 @@
+import argparse
+import json
+import os
+import time
+from typing import List, Dict, Tuple, Any, Optional, Sequence
+
+from config.config import FRETBOARD_LEN
+from app.library.tunings import tunings
+from app.library.enums import ScaleTypes, ChordTypes
+from app.persistent_cache import library_fingerprint
+from app.scale_generator import ScaleGenerator
+from app.chord_generator import ChordGenerator
+from app.fretboard import Fretboard, get_or_generate_fretboard
+from app.binary_catalogue import CATALOGUE_MAGIC, CATALOGUE_FORMAT_VERSION, HEADER, RECORD_HEADER, RECORDS_ALIGNMENT, catalogue_axes
+from app.export_catalogue import load_tunings
+from app.utils import notes_to_mask
+
+def build_catalogue(path: str,
+                    catalogue_tunings: Dict[str, Tuple[str, ...]] = tunings,
+                    fretboard_len: int = FRETBOARD_LEN
+                    ) -> int:
+
+    """
+    A function to write the pitch class mask and fretboard rows of every key, scale type, chord type, chord degree and tuning to a binary catalogue.
+    Records have a fixed size and a fixed place in the grid, so a reader finds any record by arithmetic on its names, and slots of chord degrees a scale does not have are left unused.
+    The file is written beside its final path and renamed once complete.
+
+    Args:
+
+        path: The path of the catalogue file.
+        catalogue_tunings: A dictionary containing tuning names as keys and tuples of open string notes as values.
+        fretboard_len: The number of frets of each row.
+
+    Return:
+
+        The number of records in use.
+
+    """
+
+    axes: Dict[str, Any] = catalogue_axes(catalogue_tunings=catalogue_tunings)
+
+    names: bytes = json.dumps(axes).encode()
+
+    num_strings: int = max(len(tuning) for tuning in catalogue_tunings.values())
+
+    record_size: int = RECORD_HEADER.size + num_strings * fretboard_len
+
+    num_records: int = len(axes["tunings"]) * len(axes["keys"]) * len(axes["scale_types"]) * len(axes["chord_types"]) * axes["num_degrees"]
+
+    names_offset: int = HEADER.size
+
+    records_offset: int = -(-(names_offset + len(names)) // RECORDS_ALIGNMENT) * RECORDS_ALIGNMENT
+
+    scale_generator: ScaleGenerator = ScaleGenerator()
+    chord_generator: ChordGenerator = ChordGenerator()
+
+    records: bytearray = bytearray(num_records * record_size)
+
+    used: int = 0
+
+    record_index: int = 0
+
+    for tuning in catalogue_tunings.values():
+
+        for scale_key in axes["keys"]:
+
+            for scale_type_value in axes["scale_types"]:
+
+                scale_type: ScaleTypes = ScaleTypes(scale_type_value)
+
+                scale_notes: Sequence[str] = scale_generator.get_or_generate_scale(scale_key=scale_key, scale_type=scale_type)
+
+                for chord_type_value in axes["chord_types"]:
+
+                    # The scale itself takes the first degree slot of its row
+                    if chord_type_value is None:
+
+                        degree_notes: List[Sequence[str]] = [scale_notes]
+
+                    else:
+
+                        degree_notes = list(chord_generator.get_or_generate_chord(scale_notes=scale_notes, scale_type=scale_type, chord_type=ChordTypes(chord_type_value)).values())
+
+                    for degree_index in range(axes["num_degrees"]):
+
+                        if degree_index < len(degree_notes):
+
+                            offset: int = record_index * record_size
+
+                            fretboard: Fretboard = get_or_generate_fretboard(mask=notes_to_mask(notes=degree_notes[degree_index]), tuning=tuning, num_frets=fretboard_len)
+
+                            RECORD_HEADER.pack_into(records, offset, fretboard.mask, 1, len(tuning))
+
+                            for string_index in range(len(tuning)):
+
+                                row_offset: int = offset + RECORD_HEADER.size + string_index * fretboard_len
+
+                                # Signed bytes keep BLANK as -1, as in the fret cycles of Fretboard
+                                records[row_offset:row_offset + fretboard_len] = bytes(pitch_class & 0xFF for pitch_class in fretboard.row(string_index=string_index))
+
+                            used += 1
+
+                        record_index += 1
+
+    temporary_path: str = f"{path}.{os.getpid()}.tmp"
+
+    with open(temporary_path, "wb") as catalogue_file:
+
+        catalogue_file.write(HEADER.pack(CATALOGUE_MAGIC, CATALOGUE_FORMAT_VERSION, fretboard_len, bytes.fromhex(library_fingerprint()), record_size, num_strings, num_records, names_offset, len(names), records_offset))
+
+        catalogue_file.write(names)
+
+        catalogue_file.write(bytes(records_offset - names_offset - len(names)))
+
+        catalogue_file.write(records)
+
+    os.replace(temporary_path, path)
+
+    return used
+
+def main(argv: Optional[List[str]] = None) -> None:
+
+    """
+    A function to build a binary catalogue from the command line.
+
+    """
+
+    parser = argparse.ArgumentParser(description="Build a memory mappable binary catalogue of every scale and chord fretboard")
+    parser.add_argument("path", help="Catalogue file to write")
+    parser.add_argument("--tuning-file", action="append", default=[], help="JSON file of extra tunings, may be repeated")
+    args = parser.parse_args(argv)
+
+    start: float = time.perf_counter()
+
+    records: int = build_catalogue(path=args.path, catalogue_tunings=load_tunings(tuning_files=args.tuning_file))
+
+    print(json.dumps({"path": args.path, "records": records, "bytes": os.path.getsize(args.path), "seconds": time.perf_counter() - start}))
+
+
+
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,804 @@
+import sys
+from collections import OrderedDict
+from collections.abc import Mapping
+from threading import Lock, Event
+from typing import Dict, Tuple, Any, Optional, Union, NamedTuple, List, Iterable, Iterator, Callable
+
+from config.config import CACHE_MAX_ENTRIES, CACHE_MAX_BYTES, CACHE_PATH, CATALOGUE_PATH
+
+# Sentinel returned by cache backends when a cache key is not present
+MISSING: Any = object()
+
+class CacheInfo(NamedTuple):
+
+    """
+    Cache statistics, in the style of functools.lru_cache.
+
+    Attributes:
+
+        hits: The number of lookups that found a cached value.
+        misses: The number of lookups that did not find a cached value.
+        maxsize: The maximum number of entries, or None if unbounded.
+        currsize: The current number of entries.
+        nbytes: The estimated size of the current entries in bytes.
+
+    """
+
+    hits: int
+    misses: int
+    maxsize: Optional[int]
+    currsize: int
+    nbytes: int
+
+class CacheBackend:
+
+    """
+    The interface shared by pluggable cache backends for get_or_generate.
+    Cache keys are tuples whose first element is the namespace, as built by generate_cache_key.
+
+    """
+
+    def get(self,
+            cache_key: Tuple[Any, ...],
+            default: Any = MISSING
+            ) -> Any:
+
+        """
+        Retrieves a value from the cache.
+
+        Args:
+
+            cache_key: A unique tuple.
+            default: The value returned if the cache key is not present.
+
+        Returns:
+
+            The cached value, or the default.
+
+        """
+
+        raise NotImplementedError
+
+    def set(self,
+            cache_key: Tuple[Any, ...],
+            value: Any
+            ) -> None:
+
+        """
+        Stores a value in the cache.
+
+        Args:
+
+            cache_key: A unique tuple.
+            value: The value to be stored.
+
+        """
+
+        raise NotImplementedError
+
+    def clear(self) -> None:
+
+        """
+        Removes every entry and resets the statistics.
+
+        """
+
+        raise NotImplementedError
+
+    def cache_info(self,
+                   namespace: Optional[str] = None
+                   ) -> CacheInfo:
+
+        """
+        Reports cache statistics for a namespace, or for the whole cache.
+
+        Args:
+
+            namespace: The class name prefix of the cache keys, or None for every namespace.
+
+        Returns:
+
+            A CacheInfo tuple.
+
+        """
+
+        raise NotImplementedError
+
+    def get_or_compute(self,
+                       cache_key: Tuple[Any, ...],
+                       generate_function: Callable[[], Any]
+                       ) -> Any:
+
+        """
+        Retrieves a value from the cache, or generates and stores it if not present.
+        Backends may override this to coordinate concurrent callers, as SingleFlightCache does.
+
+        Args:
+
+            cache_key: A unique tuple.
+            generate_function: A function to generate the value, if not present in the cache.
+
+        Returns:
+
+            The cached or generated value.
+
+        """
+
+        value: Any = self.get(cache_key, MISSING)
+
+        if value is MISSING:
+
+            value = generate_function()
+
+            self.set(cache_key, value)
+
+        return value
+
+Cache = Union[Dict[Tuple[Any, ...], Any], CacheBackend]
+
+def estimate_size(value: Any) -> int:
+
+    """
+    A function to estimate the memory footprint of a cached value, following nested containers.
+
+    Args:
+
+        value: The value to be measured.
+
+    Return:
+
+        size: The estimated size in bytes.
+
+    """
+
+    size: int = sys.getsizeof(value)
+
+    if isinstance(value, Mapping):
+
+        size += sum(estimate_size(key) + estimate_size(item) for key, item in value.items())
+
+    elif isinstance(value, (list, tuple, set, frozenset)):
+
+        size += sum(estimate_size(item) for item in value)
+
+    return size
+
+class LRUCache(CacheBackend):
+
+    """
+    A thread-safe, least recently used cache bounded by entry count and/or estimated byte size.
+
+    Attributes:
+
+        _max_entries: The maximum number of entries, or None if unbounded.
+        _max_bytes: The maximum estimated size in bytes, or None if unbounded.
+        _entries: An ordered dictionary, keyed by cache key, containing a tuple of the value and its estimated size, least recently used first.
+        _nbytes: The estimated size of all entries in bytes.
+        _stats: A dictionary, keyed by namespace, containing a list of hits, misses, entry count and estimated size in bytes.
+        _lock: A lock guarding the entries and statistics.
+
+    """
+
+    def __init__(self,
+                 max_entries: Optional[int] = CACHE_MAX_ENTRIES,
+                 max_bytes: Optional[int] = CACHE_MAX_BYTES
+                 ) -> None:
+
+        self._max_entries: Optional[int] = max_entries
+        self._max_bytes: Optional[int] = max_bytes
+        self._entries: "OrderedDict[Tuple[Any, ...], Tuple[Any, int]]" = OrderedDict()
+        self._nbytes: int = 0
+        self._stats: Dict[str, List[int]] = {}
+        self._lock: Lock = Lock()
+
+    def get(self,
+            cache_key: Tuple[Any, ...],
+            default: Any = MISSING
+            ) -> Any:
+
+        with self._lock:
+
+            stats: List[int] = self._namespace_stats(cache_key[0])
+
+            entry: Optional[Tuple[Any, int]] = self._entries.get(cache_key)
+
+            if entry is None:
+
+                stats[1] += 1
+
+                return default
+
+            stats[0] += 1
+
+            self._entries.move_to_end(cache_key)
+
+            return entry[0]
+
+    def set(self,
+            cache_key: Tuple[Any, ...],
+            value: Any
+            ) -> None:
+
+        size: int = estimate_size(value) if self._max_bytes is not None else 0
+
+        with self._lock:
+
+            if cache_key in self._entries:
+
+                self._remove(cache_key)
+
+            self._entries[cache_key] = (value, size)
+
+            self._nbytes += size
+
+            stats: List[int] = self._namespace_stats(cache_key[0])
+
+            stats[2] += 1
+
+            stats[3] += size
+
+            self._evict()
+
+    def clear(self) -> None:
+
+        with self._lock:
+
+            self._entries.clear()
+
+            self._nbytes = 0
+
+            self._stats.clear()
+
+    def cache_info(self,
+                   namespace: Optional[str] = None
+                   ) -> CacheInfo:
+
+        with self._lock:
+
+            if namespace is not None:
+
+                hits, misses, currsize, nbytes = self._stats.get(namespace, [0, 0, 0, 0])
+
+                return CacheInfo(hits, misses, self._max_entries, currsize, nbytes)
+
+            return CacheInfo(sum(stats[0] for stats in self._stats.values()),
+                             sum(stats[1] for stats in self._stats.values()),
+                             self._max_entries,
+                             len(self._entries),
+                             self._nbytes)
+
+    def namespaces(self) -> List[str]:
+
+        """
+        Lists every namespace that has been looked up or stored.
+
+        Returns:
+
+            A list of namespaces.
+
+        """
+
+        with self._lock:
+
+            return list(self._stats)
+
+    def configure(self,
+                  max_entries: Optional[int] = CACHE_MAX_ENTRIES,
+                  max_bytes: Optional[int] = CACHE_MAX_BYTES
+                  ) -> None:
+
+        """
+        Changes the budget of the cache, evicting entries until it is met.
+
+        Args:
+
+            max_entries: The maximum number of entries, or None if unbounded.
+            max_bytes: The maximum estimated size in bytes, or None if unbounded.
+
+        """
+
+        with self._lock:
+
+            # Sizes are only estimated while a byte budget is set, so they are recomputed when one is introduced
+            if max_bytes is not None and self._max_bytes is None:
+
+                for cache_key, (value, _) in list(self._entries.items()):
+
+                    size: int = estimate_size(value)
+
+                    self._entries[cache_key] = (value, size)
+
+                    self._nbytes += size
+
+                    self._namespace_stats(cache_key[0])[3] += size
+
+            self._max_entries = max_entries
+
+            self._max_bytes = max_bytes
+
+            self._evict()
+
+    def _namespace_stats(self,
+                         namespace: str
+                         ) -> List[int]:
+
+        """
+        Retrieves the statistics of a namespace, creating them on first use. Must be called with the lock held.
+
+        """
+
+        stats: Optional[List[int]] = self._stats.get(namespace)
+
+        if stats is None:
+
+            stats = self._stats[namespace] = [0, 0, 0, 0]
+
+        return stats
+
+    def _remove(self,
+                cache_key: Tuple[Any, ...]
+                ) -> None:
+
+        """
+        Removes a single entry. Must be called with the lock held.
+
+        """
+
+        _, size = self._entries.pop(cache_key)
+
+        self._nbytes -= size
+
+        stats: List[int] = self._namespace_stats(cache_key[0])
+
+        stats[2] -= 1
+
+        stats[3] -= size
+
+    def _evict(self) -> None:
+
+        """
+        Removes least recently used entries until the budget is met. Must be called with the lock held.
+
+        """
+
+        while self._entries and ((self._max_entries is not None and len(self._entries) > self._max_entries) or (self._max_bytes is not None and self._nbytes > self._max_bytes)):
+
+            self._remove(next(iter(self._entries)))
+
+# The process-wide cache shared by every generator instance that is not given its own, built on first use
+_default_cache: Optional[CacheBackend] = None
+
+_default_cache_lock: Lock = Lock()
+
+def _build_default_cache() -> CacheBackend:
+
+    """
+    A function to build the process-wide cache backend from the environment.
+    The persistent and catalogue backends import the generators' library tables, so they are imported here rather than with this module, which every generator imports.
+
+    Return:
+
+        The default cache backend.
+
+    """
+
+    cache: CacheBackend = LRUCache()
+
+    # Setting FRETBOARD_CACHE_PATH makes the process-wide cache persistent, so every process sharing the path starts warm
+    if CACHE_PATH is not None:
+
+        from app.persistent_cache import SQLiteCache
+
+        cache = SQLiteCache(path=CACHE_PATH)
+
+    # Setting FRETBOARD_CATALOGUE_PATH answers string lookups from a shared, memory mapped catalogue, in front of the cache above
+    if CATALOGUE_PATH is not None:
+
+        from app.binary_catalogue import BinaryCatalogueCache
+
+        cache = BinaryCatalogueCache(path=CATALOGUE_PATH, fallback=cache)
+
+    return cache
+
+def get_default_cache() -> CacheBackend:
+
+    """
+    A function to retrieve the process-wide cache backend, building it on first use.
+
+    Return:
+
+        The default cache backend.
+
+    """
+
+    global _default_cache
+
+    if _default_cache is None:
+
+        with _default_cache_lock:
+
+            if _default_cache is None:
+
+                _default_cache = _build_default_cache()
+
+    return _default_cache
+
+def set_default_cache(cache: CacheBackend) -> None:
+
+    """
+    A function to replace the process-wide cache backend. Only instances created afterwards use the new backend.
+
+    Args:
+
+        cache: The new default cache backend.
+
+    """
+
+    global _default_cache
+
+    _default_cache = cache
+
+def cache_info(namespace: Optional[str] = None) -> CacheInfo:
+
+    """
+    A function to report statistics of the process-wide cache backend.
+
+    Args:
+
+        namespace: The class name prefix of the cache keys, or None for every namespace.
+
+    Return:
+
+        A CacheInfo tuple.
+
+    """
+
+    return get_default_cache().cache_info(namespace=namespace)
+
+class _Flight:
+
+    """
+    A computation in progress, which callers of the same cache key wait on rather than repeating.
+
+    """
+
+    __slots__ = ("done", "value", "error", "waiters")
+
+    def __init__(self) -> None:
+
+        self.done: Event = Event()
+        self.value: Any = MISSING
+        self.error: Optional[BaseException] = None
+        self.waiters: int = 0
+
+class SingleFlightCache(CacheBackend):
+
+    """
+    A thread-safe cache in front of another backend, where concurrent misses on the same cache key share a single computation.
+    Completed entries are kept in a plain dictionary, so reading a cached value takes no lock; the lock is only taken on a miss.
+    Once the entry count exceeds its budget, the oldest entries are dropped from the dictionary, remaining available from the backend.
+
+    Attributes:
+
+        _backend: The cache backend that generated values are also stored in, such as the process-wide LRU or SQLite cache.
+        _max_entries: The maximum number of entries kept in the dictionary, or None if unbounded.
+        _entries: A dictionary, keyed by cache key, containing cached values, oldest first.
+        _flights: A dictionary, keyed by cache key, containing the computations in progress.
+        _hits: The number of lookups answered from the dictionary, counted without the lock and so approximate under contention.
+        _misses: The number of lookups that were not in the dictionary.
+        _shared: The number of lookups that waited on another caller's computation instead of computing.
+        _lock: A lock guarding the computations in progress, the miss counts and changes to the dictionary.
+
+    """
+
+    def __init__(self,
+                 backend: Optional[CacheBackend] = None,
+                 max_entries: Optional[int] = CACHE_MAX_ENTRIES
+                 ) -> None:
+
+        self._backend: CacheBackend = backend if backend is not None else get_default_cache()
+        self._max_entries: Optional[int] = max_entries
+        self._entries: Dict[Tuple[Any, ...], Any] = {}
+        self._flights: Dict[Tuple[Any, ...], _Flight] = {}
+        self._hits: int = 0
+        self._misses: int = 0
+        self._shared: int = 0
+        self._lock: Lock = Lock()
+
+    def get(self,
+            cache_key: Tuple[Any, ...],
+            default: Any = MISSING
+            ) -> Any:
+
+        value: Any = self._entries.get(cache_key, MISSING)
+
+        if value is not MISSING:
+
+            self._hits += 1
+
+            return value
+
+        value = self._backend.get(cache_key, MISSING)
+
+        if value is MISSING:
+
+            with self._lock:
+
+                self._misses += 1
+
+            return default
+
+        self._publish(cache_key=cache_key, value=value)
+
+        return value
+
+    def set(self,
+            cache_key: Tuple[Any, ...],
+            value: Any
+            ) -> None:
+
+        self._backend.set(cache_key, value)
+
+        self._publish(cache_key=cache_key, value=value)
+
+    def get_or_compute(self,
+                       cache_key: Tuple[Any, ...],
+                       generate_function: Callable[[], Any]
+                       ) -> Any:
+
+        # Cached values are read without the lock
+        value: Any = self._entries.get(cache_key, MISSING)
+
+        if value is not MISSING:
+
+            self._hits += 1
+
+            return value
+
+        with self._lock:
+
+            # Checked again, as another caller may have finished while the lock was awaited
+            value = self._entries.get(cache_key, MISSING)
+
+            if value is not MISSING:
+
+                self._hits += 1
+
+                return value
+
+            flight: Optional[_Flight] = self._flights.get(cache_key)
+
+            leader: bool = flight is None
+
+            if leader:
+
+                flight = self._flights[cache_key] = _Flight()
+
+                self._misses += 1
+
+            else:
+
+                flight.waiters += 1
+
+                self._shared += 1
+
+        if not leader:
+
+            flight.done.wait()
+
+            # Every caller of a failed computation sees the same error, rather than repeating it
+            if flight.error is not None:
+
+                raise flight.error
+
+            return flight.value
+
+        try:
+
+            value = self._backend.get(cache_key, MISSING)
+
+            if value is MISSING:
+
+                value = generate_function()
+
+                self._backend.set(cache_key, value)
+
+            flight.value = value
+
+        except BaseException as error:
+
+            flight.error = error
+
+            raise
+
+        finally:
+
+            with self._lock:
+
+                if flight.error is None:
+
+                    self._store(cache_key=cache_key, value=value)
+
+                del self._flights[cache_key]
+
+            flight.done.set()
+
+        return value
+
+    def clear(self) -> None:
+
+        with self._lock:
+
+            self._entries = {}
+
+            self._hits = 0
+
+            self._misses = 0
+
+            self._shared = 0
+
+    def cache_info(self,
+                   namespace: Optional[str] = None
+                   ) -> CacheInfo:
+
+        """
+        Reports the statistics of the dictionary, or those of the backend for a namespace.
+
+        Args:
+
+            namespace: The class name prefix of the cache keys, or None for the dictionary as a whole.
+
+        Returns:
+
+            A CacheInfo tuple.
+
+        """
+
+        if namespace is not None:
+
+            return self._backend.cache_info(namespace=namespace)
+
+        with self._lock:
+
+            return CacheInfo(self._hits, self._misses, self._max_entries, len(self._entries), 0)
+
+    @property
+    def shared(self) -> int:
+
+        """
+        The number of lookups that waited on another caller's computation instead of computing.
+
+        """
+
+        return self._shared
+
+    def _publish(self,
+                 cache_key: Tuple[Any, ...],
+                 value: Any
+                 ) -> None:
+
+        """
+        Stores a value in the dictionary, taking the lock.
+
+        """
+
+        with self._lock:
+
+            self._store(cache_key=cache_key, value=value)
+
+    def _store(self,
+               cache_key: Tuple[Any, ...],
+               value: Any
+               ) -> None:
+
+        """
+        Stores a value in the dictionary, dropping the oldest entries beyond the budget. Must be called with the lock held.
+
+        """
+
+        self._entries[cache_key] = value
+
+        if self._max_entries is not None:
+
+            while len(self._entries) > self._max_entries:
+
+                del self._entries[next(iter(self._entries))]
+
+class LazySequence:
+
+    """
+    A sequence that pulls items from an iterator only as they are first requested, and remembers them for later iterations.
+    Caching one in place of a list lets a search stream its results while still being computed at most once.
+
+    Attributes:
+
+        _iterator: The source iterator, or None once exhausted.
+        _items: The items pulled from the iterator so far.
+        _lock: A lock guarding the iterator, so concurrent readers never pull the same item twice.
+
+    """
+
+    def __init__(self,
+                 iterable: Iterable[Any]
+                 ) -> None:
+
+        self._iterator: Optional[Iterator[Any]] = iter(iterable)
+        self._items: List[Any] = []
+        self._lock: Lock = Lock()
+
+    def _pull(self,
+              index: int
+              ) -> bool:
+
+        """
+        Pulls items from the iterator until the index is available.
+
+        Args:
+
+            index: The index that is required.
+
+        Returns:
+
+            True if the index is available, False if the iterator was exhausted first.
+
+        """
+
+        with self._lock:
+
+            while len(self._items) <= index:
+
+                if self._iterator is None:
+
+                    return False
+
+                try:
+
+                    self._items.append(next(self._iterator))
+
+                except StopIteration:
+
+                    self._iterator = None
+
+                    return False
+
+            return True
+
+    def __iter__(self) -> Iterator[Any]:
+
+        index: int = 0
+
+        while index < len(self._items) or self._pull(index):
+
+            yield self._items[index]
+
+            index += 1
+
+    def __getitem__(self,
+                    index: int
+                    ) -> Any:
+
+        if index < 0:
+
+            self._pull(sys.maxsize)
+
+        elif not self._pull(index):
+
+            raise IndexError(index)
+
+        return self._items[index]
+
+    def __len__(self) -> int:
+
+        self._pull(sys.maxsize)
+
+        return len(self._items)
+
+    @property
+    def exhausted(self) -> bool:
+
+        """
+        Whether every item has been pulled from the iterator.
+
+        """
+
+        return self._iterator is None
@@ -1,12 +1,16 @@
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional, Sequence, Mapping
 
-from config.config import CHROMATIC_SCALE, FRETBOARD_LEN
+from config.config import CHROMATIC_SCALE, PITCH_CLASSES, FRETBOARD_LEN
 from app.library.degrees import chord_degrees
 from app.library.tunings import tunings
 from app.library.enums import ScaleTypes, ChordTypes
 from app.scale_generator import ScaleGenerator
 from app.chord_generator import ChordGenerator
-from app.utils import generate_string, generate_cache_key, get_or_generate
+from app.cache import CacheBackend, get_default_cache, cache_info
+from app.values import ChordSet, FretboardStrings
+from app.fretboard import Fretboard, get_or_generate_fretboard
+from app.spelling import spelled_chromatic_scale
+from app.utils import generate_string, generate_cache_key, get_or_generate, notes_to_mask
 
 class ChordFretboard:
 
@@ -18,32 +22,35 @@ class ChordFretboard:
         _fretboard_len: The length of the fretboard.
         _frets: A range object, representing the fret positions on the fretboard.
         _chromatic_scale: The twelve note chromatic scale.
-        _chord_string_cache: A dictionary, keyed by a tuple of scale key, scale type, chord type and tuning, containing a nested dictionary, keyed by chord degree, containing another nested dictionary with root notes as keys and chord note string representations as values.
+        _chord_string_cache: A cache backend, shared process-wide unless one is supplied, keyed by a tuple of chord set and tuning, containing immutable fretboard strings, keyed by chord degree, containing nested fretboard strings with root notes as keys and chord note string representations as values.
+                             The nested fretboard strings are themselves cached by spelled chord notes and tuning, so each distinct chord is only computed once per tuning.
     
     """
 
-    def __init__(self):
+    def __init__(self,
+                 cache: Optional[CacheBackend] = None
+                 ) -> None:
 
         self._fretboard_len: int = FRETBOARD_LEN
         self._frets: range = range(FRETBOARD_LEN)
         self._chromatic_scale: List[str] = CHROMATIC_SCALE
-        self._chord_string_cache: Dict[Tuple[str, str, str, str, Tuple[str, ...]], Dict[str, Dict[str, List[str]]]] = {}
+        self._chord_string_cache: CacheBackend = cache if cache is not None else get_default_cache()
 
     def get_or_generate_chord_strings(self,
-                                      scale_notes: List[str],
+                                      scale_notes: Sequence[str],
                                       scale_type: ScaleTypes,
-                                      chord_notes: Dict[str, List[str]],
+                                      chord_notes: Mapping[str, Sequence[str]],
                                       chord_type: ChordTypes,
                                       tuning: List[str]
-                                      ) -> Dict[str, Dict[str, List[str]]]:
+                                      ) -> FretboardStrings:
         
         """
-        Retrieves chord note strings from the cache, based on the scale notes, scale type, chord notes, chord type and tuning.
+        Retrieves chord note strings from the cache, based on the chord notes of each chord degree and the tuning.
         If unavailable, generates chord note strings and stores them in the cache.
         
         Args:
 
-            scale_notes: A list containing the scale notes.
+            scale_notes: A sequence containing the scale notes.
             scale_type: The name of the scale type.
             chord_notes: A dictionary containing chord degrees as keys and chord notes as values.
             chord_type: The name of the chord type.
@@ -51,27 +58,70 @@ class ChordFretboard:
 
         Returns:
 
-            chord_strings: A dictionary, keyed by chord degrees, containing a nested dictionary with root notes as keys and chord note strings as values.
+            chord_strings: Immutable fretboard strings, keyed by chord degrees, containing nested fretboard strings with root notes as keys and tuples of formatted chord notes as values, shared with every caller.
         
         """
 
-        cache_key: Tuple[str, str, str, str, Tuple[str, ...]] = generate_cache_key("ChordFretboard", scale_notes[0], scale_type.value, chord_type.value, tuning)
+        cache_key: Tuple[str, ChordSet, Tuple[str, ...]] = generate_cache_key("ChordFretboard", chord_notes if isinstance(chord_notes, ChordSet) else ChordSet(chord_notes), tuple(tuning))
 
-        chord_strings: Dict[str, Dict[str, List[str]]] = get_or_generate(cache=self._chord_string_cache, 
-                                                                         cache_key=cache_key, 
-                                                                         generate_function=lambda: self._compute_chord_strings(chord_notes=chord_notes, 
-                                                                                                                               scale_type=scale_type, 
-                                                                                                                               chord_type=chord_type, 
-                                                                                                                               tuning=tuning))
+        chord_strings: FretboardStrings = get_or_generate(cache=self._chord_string_cache, 
+                                                          cache_key=cache_key, 
+                                                          generate_function=lambda: self._compute_chord_strings(chord_notes=chord_notes, 
+                                                                                                                scale_type=scale_type, 
+                                                                                                                chord_type=chord_type, 
+                                                                                                                tuning=tuning),
+                                                          pattern=(scale_type, chord_type))
 
         return chord_strings
 
+    def get_or_generate_chord_fretboards(self,
+                                         scale_notes: Sequence[str],
+                                         scale_type: ScaleTypes,
+                                         chord_notes: Mapping[str, Sequence[str]],
+                                         chord_type: ChordTypes,
+                                         tuning: List[str],
+                                         num_frets: Optional[int] = None,
+                                         capo: int = 0
+                                         ) -> Dict[str, Fretboard]:
+        
+        """
+        Retrieves string indexed chord fretboards from the cache, based on the chord notes of each chord degree, tuning, number of frets and capo.
+        If unavailable, retrieves a fretboard for each chord degree, shared with every scale or chord of the same pitch classes, and stores them in the cache.
+        
+        Args:
+
+            scale_notes: A sequence containing the scale notes.
+            scale_type: The name of the scale type.
+            chord_notes: A dictionary containing chord degrees as keys and chord notes as values.
+            chord_type: The name of the chord type.
+            tuning: A list containing the root note of each open string.
+            num_frets: The number of frets per string, defaulting to the fretboard length.
+            capo: The fret the capo is placed on, 0 for none.
+
+        Returns:
+
+            chord_fretboards: A dictionary containing chord degrees as keys and fretboards indexed by string number as values.
+        
+        """
+
+        num_frets = num_frets if num_frets is not None else self._fretboard_len
+
+        cache_key: Tuple[str, ChordSet, Tuple[str, ...], int, int] = generate_cache_key("ChordFretboard", chord_notes if isinstance(chord_notes, ChordSet) else ChordSet(chord_notes), tuple(tuning), num_frets, capo)
+
+        chord_fretboards: Dict[str, Fretboard] = get_or_generate(cache=self._chord_string_cache, 
+                                                                 cache_key=cache_key, 
+                                                                 generate_function=lambda: {chord_degree: get_or_generate_fretboard(mask=notes_to_mask(notes=chord_notes_list), tuning=tuning, num_frets=num_frets, capo=capo, cache=self._chord_string_cache)
+                                                                                            for chord_degree, chord_notes_list in chord_notes.items()},
+                                                                 pattern=(scale_type, chord_type))
+
+        return chord_fretboards
+
     def _compute_chord_strings(self,
-                               chord_notes: Dict[str, List[str]],
+                               chord_notes: Mapping[str, Sequence[str]],
                                scale_type: ScaleTypes,
                                chord_type: ChordTypes,
                                tuning: List[str]
-                               ) -> Dict[str, Dict[str, List[str]]]:
+                               ) -> FretboardStrings:
         
         """
         Computes a guitar string representation containing chord notes and blank spaces for notes that do not exist in the chord.
@@ -85,12 +135,12 @@ class ChordFretboard:
 
         Returns:
 
-            chord_degree_dict: A dictionary containing chord degrees as keys and a nested dictionary of root notes as keys and chord note strings as values.
+            Immutable fretboard strings containing chord degrees as keys and nested fretboard strings of root notes as keys and chord note strings as values.
         
         """
 
         # Defines the dictionary to be returned
-        chord_degree_dict: Dict[str, Dict[str, List[str]]] = {}
+        chord_degree_dict: Dict[str, FretboardStrings] = {}
 
         # Accesses chord notes for each degree in the scale
         for chord_notes_index, chord_notes_list in enumerate(chord_notes.values()):
@@ -98,28 +148,65 @@ class ChordFretboard:
             # Defines the chord degree cache key
             chord_degree_key = chord_degrees[chord_type.value][scale_type.value][chord_notes_index]
 
-            # Defines the nested dictionary to store the chord note strings for each root note in the tuning
-            chord_string_dict: Dict[str, List[str]] = {}
+            # Sorts the chord notes by pitch class, so inversions of the same spelled chord share one key
+            sorted_chord_notes: Tuple[str, ...] = tuple(sorted(chord_notes_list, key=PITCH_CLASSES.__getitem__))
+
+            # The same chord appears under different degrees of different keys, so its strings are keyed by content
+            chord_string_cache_key: Tuple[str, Tuple[str, ...], Tuple[str, ...]] = generate_cache_key("ChordStrings", sorted_chord_notes, tuple(tuning))
+
+            # Stores the nested dictionary of chord note strings for each root note inside the dictionary to be returned
+            chord_degree_dict[chord_degree_key] = get_or_generate(cache=self._chord_string_cache, 
+                                                                  cache_key=chord_string_cache_key, 
+                                                                  generate_function=lambda: self._compute_chord_note_strings(chord_notes=sorted_chord_notes, 
+                                                                                                                             tuning=tuning),
+                                                                  pattern=(scale_type, chord_type))
+
+        return FretboardStrings(chord_degree_dict)
+
+    def _compute_chord_note_strings(self,
+                                    chord_notes: Sequence[str],
+                                    tuning: List[str]
+                                    ) -> FretboardStrings:
         
-            # Generates a chord note string for each root note in the tuning
-            for root_note in tuning:
-            
-                # String root note index position in the chromatic scale
-                root_index: int = self._chromatic_scale.index(root_note)
+        """
+        Computes the chord note strings of a single chord for each root note in the tuning, with notes spelled as they are in the chord.
 
-                # Computes chord note string from the chromatic scale starting at the root index
-                chord_string: List[str] = generate_string(start_position=root_index, 
-                                                          note_sequence=self._chromatic_scale, 
-                                                          scale_or_chord=chord_notes_list, 
-                                                          frets=self._frets)
+        Args:
+
+            chord_notes: A sequence containing the chord notes.
+            tuning: A list containing the root note of each open string.
+
+        Returns:
+
+            Immutable fretboard strings containing root notes as keys and chord note strings as values.
+        
+        """
+
+        # Defines the dictionary to be returned
+        chord_string_dict: Dict[str, List[str]] = {}
+
+        # Reduces the chord notes to a pitch class mask
+        chord_mask: int = notes_to_mask(notes=chord_notes)
+
+        # Respells the chromatic scale with the chord notes
+        note_sequence: List[str] = spelled_chromatic_scale(notes=chord_notes)
+
+        # Generates a chord note string for each root note in the tuning
+        for root_note in tuning:
+        
+            # String root note pitch class
+            root_index: int = PITCH_CLASSES[root_note]
 
-                # Stores chord note string in the nested dictionary
-                chord_string_dict[root_note] = chord_string
+            # Computes chord note string from the chromatic scale starting at the root index
+            chord_string: List[str] = generate_string(start_position=root_index, 
+                                                      note_sequence=note_sequence, 
+                                                      scale_or_chord=chord_mask, 
+                                                      frets=self._frets)
 
-            # Stores the nested dictionary inside the dictionary to be returned
-            chord_degree_dict[chord_degree_key] = chord_string_dict
+            # Stores chord note string in the dictionary to be returned
+            chord_string_dict[root_note] = chord_string
 
-        return chord_degree_dict
+        return FretboardStrings(chord_string_dict)
 
 
 
@@ -143,7 +230,7 @@ if __name__ == "__main__":
 
     print("--------------------")
 
-    print(demo_chord_generator._chord_notes_cache)
+    print(cache_info("ChordGenerator"))
 
     print("--------------------")
 
@@ -155,6 +242,6 @@ if __name__ == "__main__":
 
     print("--------------------")
 
-    print(demo_chord_fretboard._chord_string_cache)
+    print(cache_info("ChordFretboard"))
 
     print("--------------------")
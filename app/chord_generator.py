@@ -1,10 +1,13 @@
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional, Sequence
 
+from config.config import CHROMATIC_SCALE, PITCH_CLASSES
 from app.library.intervals import chord_intervals
 from app.library.degrees import chord_degrees
 from app.library.enums import ScaleTypes, ChordTypes
 from app.scale_generator import ScaleGenerator
-from app.utils import generate_sequence_from_intervals, generate_cache_key, get_or_generate
+from app.cache import CacheBackend, LRUCache, get_default_cache, cache_info
+from app.utils import generate_sequence_from_intervals, generate_cache_key, get_or_generate, notes_to_mask, mask_to_pitch_classes
+from app.values import Chord, ChordSet
 
 class ChordGenerator:
 
@@ -13,89 +16,111 @@ class ChordGenerator:
 
     Attributes:
 
-        _chord_notes_cache: A dictionary, keyed by a tuple of scale key, scale type and chord type, containing a nested dictionary with chord degrees as keys and chord notes as values.
+        _chromatic_scale: The twelve note chromatic scale the scale notes are named by.
+        _pitch_classes: A dictionary containing every spelling of the notes of the chromatic scale as keys and their pitch classes as values.
+        _chord_notes_cache: A cache backend, shared process-wide unless one is supplied, keyed by a tuple of scale notes, chord type and chord degrees, containing a chord set with chord degrees as keys and chord notes as values.
 
     """
 
     def __init__(self,
+                 chromatic_scale: List[str] = CHROMATIC_SCALE,
+                 cache: Optional[CacheBackend] = None
                  ) -> None:
-        
-        self._chord_notes_cache: Dict[Tuple[str, str, str], Dict[str, List[str]]] = {}
+
+        self._chromatic_scale: List[str] = chromatic_scale
+
+        # Spelled scales take every enharmonic spelling, while a custom chromatic scale names each pitch class once
+        self._pitch_classes: Dict[str, int] = PITCH_CLASSES if chromatic_scale is CHROMATIC_SCALE else {note: index for index, note in enumerate(chromatic_scale)}
+
+        # A custom chromatic scale names notes differently, so it cannot share the process-wide cache
+        if cache is None:
+
+            cache = get_default_cache() if chromatic_scale is CHROMATIC_SCALE else LRUCache()
+
+        self._chord_notes_cache: CacheBackend = cache
 
     def get_or_generate_chord(self, 
-                              scale_notes: List[str],
+                              scale_notes: Sequence[str],
                               scale_type: ScaleTypes,
                               chord_type: ChordTypes
-                              ) -> Dict[str, List[str]]:
+                              ) -> ChordSet:
         
         """
-        Retrieves chord notes from the cache, based on their key, scale type and chord type.
-        If unavailable, generates chord notes and stores them in the cache.
+        Retrieves chord notes from the cache, based on the spelled scale notes, chord type and the chord degrees of the scale type.
+        If unavailable, generates chord notes and stores them in the cache, so scale types with the same notes and chord degrees share one entry.
 
         Args:
 
-            scale_notes: A list containing the scale notes.
+            scale_notes: A sequence containing the scale notes.
             scale_type: The name of the scale type.
             chord_type: The name of the chord type.
 
         Returns:
 
-            chord_notes: A dictionary containing chord degrees as keys and chord notes as values.
+            chord_notes: An immutable chord set containing chord degrees as keys and chords as values.
         
         """
 
-        cache_key: Tuple[str, str, str, str] = generate_cache_key("ChordGenerator", scale_notes[0], scale_type.value, chord_type.value)
+        cache_key: Tuple[str, Tuple[str, ...], str, Tuple[str, ...]] = generate_cache_key("ChordGenerator", tuple(scale_notes), chord_type.value, chord_degrees[chord_type.value][scale_type.value])
 
-        chord_notes: Dict[str, List[str]] = get_or_generate(cache=self._chord_notes_cache, 
-                                                            cache_key=cache_key, 
-                                                            generate_function=lambda: self._compute_chord_notes(scale_notes=scale_notes, 
-                                                                                                                scale_type=scale_type, 
-                                                                                                                chord_type=chord_type))
+        chord_notes: ChordSet = get_or_generate(cache=self._chord_notes_cache, 
+                                                cache_key=cache_key, 
+                                                generate_function=lambda: self._compute_chord_notes(scale_notes=scale_notes, 
+                                                                                                    scale_type=scale_type, 
+                                                                                                    chord_type=chord_type),
+                                                pattern=(scale_type, chord_type))
         
         return chord_notes
 
     def _compute_chord_notes(self, 
-                             scale_notes: List[str],
+                             scale_notes: Sequence[str],
                              scale_type: ScaleTypes,
                              chord_type: ChordTypes
-                             ) -> Dict[str, List[str]]:
+                             ) -> ChordSet:
         
         """
-        Computes chords notes from chord intervals, based on their scale notes, scale type and chord type.
+        Computes chords notes from chord intervals over the scale pitch classes, based on their scale notes, scale type and chord type.
 
         Args:
 
-            scale_notes: A list containing the scale notes.
+            scale_notes: A sequence containing the scale notes.
             scale_type: The name of the scale type.
             chord_type: The name of the chord type.
 
         Returns:
 
-            chord_notes_dict: A dictionary containing chord degrees as keys and chord notes as values.
+            An immutable chord set containing chord degrees as keys and chords as values.
         
         """
         
-        # Defines the dictionary to be returned
-        chord_notes_dict: Dict[str, List[str]] = {}
+        # Defines the dictionary the chord set is built from
+        chord_notes_dict: Dict[str, Chord] = {}
 
         # Accesses chord intervals dictionary
         intervals: List[int] = chord_intervals[chord_type.value]
 
+        # Reduces the scale notes to ascending pitch classes, beginning at the scale key
+        scale_pitch_classes: List[int] = mask_to_pitch_classes(mask=notes_to_mask(notes=scale_notes, note_sequence=self._chromatic_scale), 
+                                                               start_position=self._pitch_classes[scale_notes[0]])
+
+        # Chord notes are spelled as they are in the scale
+        scale_spelling: Dict[int, str] = {self._pitch_classes[note]: note for note in scale_notes}
+
         # Generates chord notes for each degree in the scale
         for chord_degree in range(len(chord_degrees[chord_type.value][scale_type.value])):
 
             # Defines the chord notes cache key
             chord_cache_key: str = (chord_degrees[chord_type.value][scale_type.value][chord_degree])
 
-            # Computes chord notes from the chord intervals via the scale notes
-            chord_notes: List[str] = generate_sequence_from_intervals(start_position=chord_degree, 
-                                                                      note_sequence=scale_notes, 
-                                                                      intervals=intervals)
+            # Computes chord pitch classes from the chord intervals via the scale pitch classes
+            chord_pitch_classes: List[int] = generate_sequence_from_intervals(start_position=chord_degree, 
+                                                                              note_sequence=scale_pitch_classes, 
+                                                                              intervals=intervals)
 
-            # Stores chord notes in the dictionary to be returned
-            chord_notes_dict[chord_cache_key] = chord_notes
+            # Renders chord notes and stores them in the dictionary
+            chord_notes_dict[chord_cache_key] = Chord(scale_spelling[pitch_class] for pitch_class in chord_pitch_classes)
 
-        return chord_notes_dict
+        return ChordSet(chord_notes_dict)
 
 
 
@@ -119,6 +144,6 @@ if __name__ == "__main__":
 
     print("--------------------")
 
-    print(demo_chord_generator._chord_notes_cache)
+    print(cache_info("ChordGenerator"))
 
     print("--------------------")
@@ -0,0 +1,364 @@
+import json
+from typing import List, Dict, Tuple, Optional, NamedTuple, Iterable, Iterator
+
+from config.config import CHROMATIC_SCALE, NUM_PITCH_CLASSES, NUM_MASKS, NATURAL_PITCH_CLASSES, ACCIDENTALS
+from app.library.intervals import scale_intervals, chord_symbols
+from app.utils import intervals_to_mask, get_or_build_table
+
+# Number of MIDI note numbers
+NUM_MIDI_NOTES: int = 128
+
+# A candidate holds the number of missing notes, the pattern rank, the pattern name, whether it is a chord and the missing notes as a pitch class mask
+Candidate = Tuple[int, int, str, bool, int]
+
+class NoteEvent(NamedTuple):
+
+    """
+    A note being pressed or released.
+
+    Attributes:
+
+        time: The time of the event in seconds.
+        note: The MIDI note number.
+        on: True for a note on, False for a note off.
+
+    """
+
+    time: float
+    note: int
+    on: bool
+
+class Match(NamedTuple):
+
+    """
+    The chord or scale best matching the notes currently held.
+
+    Attributes:
+
+        root: The root note.
+        pattern_type: The chord symbol suffix, such as "m7", or the scale type.
+        is_chord: True for a chord, False for a scale.
+        bass: The lowest note held.
+        inversion: The chord tone index of the bass, 0 for root position, or None if the bass is not a chord tone or the match is a scale.
+        missing: The notes of the chord or scale that are not held, empty for a complete match.
+
+    """
+
+    root: str
+    pattern_type: str
+    is_chord: bool
+    bass: str
+    inversion: Optional[int]
+    missing: Tuple[str, ...]
+
+def build_recognition_table(chord_sequence: Dict[Tuple[int, ...], str],
+                            scale_sequence: Dict[str, Tuple[int, ...]]
+                            ) -> List[Optional[Dict[int, Candidate]]]:
+
+    """
+    A function to precompute, for every pitch class mask, the best chord or scale containing it on each root.
+    Every subset of every chord and scale in every key is enumerated once, so partial matches are found by the same single lookup as complete ones.
+    Chords rank ahead of scales, and earlier entries of each dictionary ahead of later ones, when the same number of notes is missing.
+
+    Args:
+
+        chord_sequence: The dictionary containing chord symbol suffixes keyed by chord intervals in semitones.
+        scale_sequence: The dictionary containing scale intervals.
+
+    Return:
+
+        recognition_table: A list, indexed by pitch class mask, containing a dictionary with root pitch classes as keys and candidates as values, or None where nothing matches.
+
+    """
+
+    recognition_table: List[Optional[Dict[int, Candidate]]] = [None] * NUM_MASKS
+
+    patterns: List[Tuple[str, bool, Tuple[int, ...]]] = [*((symbol, True, intervals) for intervals, symbol in chord_sequence.items()),
+                                                         *((scale_type, False, intervals) for scale_type, intervals in scale_sequence.items())]
+
+    for rank, (pattern_type, is_chord, intervals) in enumerate(patterns):
+
+        for root in range(NUM_PITCH_CLASSES):
+
+            pattern_mask: int = intervals_to_mask(intervals=intervals, start_position=root)
+
+            # Walks every non empty subset of the pattern mask
+            subset: int = pattern_mask
+
+            while subset:
+
+                candidate: Candidate = (bin(pattern_mask & ~subset).count("1"), rank, pattern_type, is_chord, pattern_mask & ~subset)
+
+                candidates: Optional[Dict[int, Candidate]] = recognition_table[subset]
+
+                if candidates is None:
+
+                    candidates = recognition_table[subset] = {}
+
+                if root not in candidates or candidate < candidates[root]:
+
+                    candidates[root] = candidate
+
+                subset = (subset - 1) & pattern_mask
+
+    return recognition_table
+
+def get_recognition_table(chord_sequence: Dict[Tuple[int, ...], str] = chord_symbols,
+                          scale_sequence: Dict[str, Tuple[int, ...]] = scale_intervals
+                          ) -> List[Optional[Dict[int, Candidate]]]:
+
+    """
+    A function to retrieve the recognition table for a chord and scale dictionary, building it on first use.
+
+    Args:
+
+        chord_sequence: The dictionary containing chord symbol suffixes keyed by chord intervals in semitones.
+        scale_sequence: The dictionary containing scale intervals.
+
+    Return:
+
+        recognition_table: A list, indexed by pitch class mask, containing a dictionary with root pitch classes as keys and candidates as values, or None where nothing matches.
+
+    """
+
+    recognition_table: List[Optional[Dict[int, Candidate]]] = get_or_build_table(build_recognition_table, chord_sequence, scale_sequence)
+
+    return recognition_table
+
+class ChordRecogniser:
+
+    """
+    A class to recognise chords and scales from a stream of note events, reporting the best match after every event.
+    Each event updates a count of held notes per pitch class and a pitch class mask, and the match is a lookup in a precomputed table, so the work per event does not depend on how many notes are held.
+    Where several roots match equally well, the root in the bass wins, so inversions are reported against the intended chord.
+
+    Attributes:
+
+        _recognition_table: A list, indexed by pitch class mask, containing the candidates on each root.
+        _chord_sequence: The dictionary containing chord symbol suffixes keyed by chord intervals in semitones.
+        _scale_sequence: The dictionary containing scale intervals.
+        _matches: A dictionary, keyed by a tuple of pitch class mask and bass pitch class, containing matches already chosen.
+        _counts: A list, indexed by pitch class, containing the number of held notes of that pitch class.
+        _held: An integer with one bit set per held MIDI note.
+        _mask: The pitch class mask of the held notes.
+
+    """
+
+    def __init__(self,
+                 chord_sequence: Dict[Tuple[int, ...], str] = chord_symbols,
+                 scale_sequence: Dict[str, Tuple[int, ...]] = scale_intervals
+                 ) -> None:
+
+        self._recognition_table: List[Optional[Dict[int, Candidate]]] = get_recognition_table(chord_sequence=chord_sequence, scale_sequence=scale_sequence)
+        self._chord_sequence: Dict[Tuple[int, ...], str] = chord_sequence
+        self._scale_sequence: Dict[str, Tuple[int, ...]] = scale_sequence
+        self._matches: Dict[Tuple[int, int], Optional[Match]] = {}
+        self._counts: List[int] = [0] * NUM_PITCH_CLASSES
+        self._held: int = 0
+        self._mask: int = 0
+
+    @property
+    def mask(self) -> int:
+
+        return self._mask
+
+    def feed(self,
+             event: NoteEvent
+             ) -> Optional[Match]:
+
+        """
+        Applies a note event and reports the best match for the notes now held.
+        Repeated note ons and note offs for a note that is not held are ignored, as live input often contains them.
+
+        Args:
+
+            event: The note event.
+
+        Returns:
+
+            The best match, or None if no notes are held or nothing matches.
+
+        """
+
+        bit: int = 1 << event.note
+
+        pitch_class: int = event.note % NUM_PITCH_CLASSES
+
+        if event.on and not self._held & bit:
+
+            self._held |= bit
+
+            self._counts[pitch_class] += 1
+
+            self._mask |= 1 << pitch_class
+
+        elif not event.on and self._held & bit:
+
+            self._held &= ~bit
+
+            self._counts[pitch_class] -= 1
+
+            if not self._counts[pitch_class]:
+
+                self._mask &= ~(1 << pitch_class)
+
+        return self.current_match()
+
+    def current_match(self) -> Optional[Match]:
+
+        """
+        Reports the best match for the notes currently held.
+
+        Returns:
+
+            The best match, or None if no notes are held or nothing matches.
+
+        """
+
+        if not self._held:
+
+            return None
+
+        # The lowest set bit is the lowest held note
+        bass: int = ((self._held & -self._held).bit_length() - 1) % NUM_PITCH_CLASSES
+
+        match_key: Tuple[int, int] = (self._mask, bass)
+
+        if match_key not in self._matches:
+
+            self._matches[match_key] = self._choose_match(mask=self._mask, bass=bass)
+
+        return self._matches[match_key]
+
+    def recognise(self,
+                  events: Iterable[NoteEvent]
+                  ) -> Iterator[Tuple[NoteEvent, Optional[Match]]]:
+
+        """
+        Applies each note event in turn, as they arrive.
+
+        Args:
+
+            events: An iterable of note events, such as a live input iterator or read_events.
+
+        Returns:
+
+            An iterator of tuples of note event and the best match after it.
+
+        """
+
+        for event in events:
+
+            yield event, self.feed(event=event)
+
+    def reset(self) -> None:
+
+        """
+        Releases every held note, keeping the matches already chosen.
+
+        """
+
+        self._counts = [0] * NUM_PITCH_CLASSES
+        self._held = 0
+        self._mask = 0
+
+    def _choose_match(self,
+                      mask: int,
+                      bass: int
+                      ) -> Optional[Match]:
+
+        """
+        Chooses the best candidate of a mask for a bass note, preferring fewer missing notes, then chords over scales, then a root in the bass.
+
+        Args:
+
+            mask: The pitch class mask of the held notes.
+            bass: The pitch class of the lowest held note.
+
+        Returns:
+
+            The best match, or None if nothing matches.
+
+        """
+
+        candidates: Optional[Dict[int, Candidate]] = self._recognition_table[mask]
+
+        if not candidates:
+
+            return None
+
+        root, (missing_count, rank, pattern_type, is_chord, missing_mask) = min(candidates.items(), key=lambda item: (item[1][0], not item[1][3], item[0] != bass, item[1][1]))
+
+        inversion: Optional[int] = None
+
+        if is_chord:
+
+            chord_tones: List[int] = [(root + interval) % NUM_PITCH_CLASSES for intervals, symbol in self._chord_sequence.items() if symbol == pattern_type for interval in intervals]
+
+            inversion = chord_tones.index(bass) if bass in chord_tones else None
+
+        return Match(root=CHROMATIC_SCALE[root],
+                     pattern_type=pattern_type,
+                     is_chord=is_chord,
+                     bass=CHROMATIC_SCALE[bass],
+                     inversion=inversion,
+                     missing=tuple(CHROMATIC_SCALE[(root + offset) % NUM_PITCH_CLASSES] for offset in range(NUM_PITCH_CLASSES) if missing_mask >> ((root + offset) % NUM_PITCH_CLASSES) & 1))
+
+def read_events(path: str) -> Iterator[NoteEvent]:
+
+    """
+    A function to read recorded note events from a JSON Lines file, one event per line, streaming rather than loading the file.
+    Each line holds a time in seconds, a note as a MIDI note number or a note name with an octave such as "C#4", and whether it is a note on.
+    Note ons with a velocity of 0 are note offs, as in MIDI.
+
+    Args:
+
+        path: The path of the event file.
+
+    Return:
+
+        An iterator of note events.
+
+    """
+
+    with open(path) as event_file:
+
+        for line in event_file:
+
+            if not line.strip():
+
+                continue
+
+            record: Dict = json.loads(line)
+
+            note = record["note"]
+
+            if isinstance(note, str):
+
+                # The octave follows the note name, MIDI note 60 being C4, and belongs to the letter, so Cb4 is below C4 and B#3 is C4
+                name: str = note.rstrip("-0123456789")
+
+                note = NATURAL_PITCH_CLASSES[name[0]] + ACCIDENTALS[name[1:]] + (int(note[len(name):]) + 1) * NUM_PITCH_CLASSES
+
+            yield NoteEvent(time=float(record["time"]), note=note, on=bool(record["on"]) and record.get("velocity", 1) != 0)
+
+
+
+if __name__ == "__main__":
+
+    print("--------------------")
+
+    demo_recogniser = ChordRecogniser()
+
+    # A first inversion C major chord, arpeggiated upwards, then extended to a seventh and released from the bass
+    demo_events = [NoteEvent(time=0.00, note=64, on=True),
+                   NoteEvent(time=0.05, note=67, on=True),
+                   NoteEvent(time=0.10, note=72, on=True),
+                   NoteEvent(time=0.15, note=71, on=True),
+                   NoteEvent(time=0.60, note=64, on=False)]
+
+    for demo_event, demo_match in demo_recogniser.recognise(events=demo_events):
+
+        print(demo_event, demo_match)
+
+    print("--------------------")
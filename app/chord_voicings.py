@@ -0,0 +1,227 @@
+from typing import List, Tuple, Optional, Sequence, Iterator
+
+from config.config import PITCH_CLASSES, FRETBOARD_LEN, NUM_PITCH_CLASSES
+from app.library.tunings import tunings
+from app.library.enums import ScaleTypes, ChordTypes
+from app.scale_generator import ScaleGenerator
+from app.chord_generator import ChordGenerator
+from app.cache import CacheBackend, LazySequence, get_default_cache
+from app.utils import generate_cache_key, get_or_generate, notes_to_mask
+
+# A voicing holds one fret per string, or None where the string is muted
+Voicing = Tuple[Optional[int], ...]
+
+class ChordVoicings:
+
+    """
+    A class to generate playable chord voicings, with one fret or mute per string, from chord notes.
+
+    Attributes:
+
+        _num_frets: The number of frets, including the open string, available to voicings.
+        _voicing_cache: A cache backend, shared process-wide unless one is supplied, keyed by a tuple of chord mask, bass pitch class, tuning and constraints, containing lazily generated voicings.
+
+    """
+
+    def __init__(self,
+                 num_frets: int = FRETBOARD_LEN,
+                 cache: Optional[CacheBackend] = None
+                 ) -> None:
+
+        self._num_frets: int = num_frets
+        self._voicing_cache: CacheBackend = cache if cache is not None else get_default_cache()
+
+    def get_or_generate_voicings(self,
+                                 chord_notes: List[str],
+                                 tuning: Sequence[str],
+                                 max_span: int = 3,
+                                 max_fingers: int = 4,
+                                 root_in_bass: bool = True,
+                                 bass_note: Optional[str] = None,
+                                 strings: Optional[Sequence[int]] = None
+                                 ) -> LazySequence:
+
+        """
+        Retrieves chord voicings from the cache, based on the chord notes, tuning and constraints.
+        If unavailable, starts a lazy search whose voicings are generated as they are read, and stores it in the cache.
+
+        Args:
+
+            chord_notes: A list containing the chord notes, root first.
+            tuning: A sequence containing the root note of each open string.
+            max_span: The largest distance in frets between fretted notes, open strings excluded.
+            max_fingers: The largest number of fretting fingers, with notes on the lowest fret counted as one barre.
+            root_in_bass: Whether the lowest sounding string must play the chord root.
+            bass_note: A note the lowest sounding string must play, overriding root_in_bass.
+            strings: The string indices that may sound, or None for every string.
+
+        Returns:
+
+            voicings: A lazy sequence of voicings, each a tuple with one fret or None per string.
+
+        """
+
+        chord_mask: int = notes_to_mask(notes=chord_notes)
+
+        if bass_note is not None:
+
+            bass_pitch_class: Optional[int] = PITCH_CLASSES[bass_note]
+
+        elif root_in_bass:
+
+            bass_pitch_class = PITCH_CLASSES[chord_notes[0]]
+
+        else:
+
+            bass_pitch_class = None
+
+        string_set: Tuple[int, ...] = tuple(strings) if strings is not None else tuple(range(len(tuning)))
+
+        cache_key: Tuple = generate_cache_key("ChordVoicings", chord_mask, bass_pitch_class, tuple(tuning), string_set, max_span, max_fingers, self._num_frets)
+
+        voicings: LazySequence = get_or_generate(cache=self._voicing_cache,
+                                                 cache_key=cache_key,
+                                                 generate_function=lambda: LazySequence(self._compute_voicings(chord_mask=chord_mask,
+                                                                                                               bass_pitch_class=bass_pitch_class,
+                                                                                                               tuning=tuning,
+                                                                                                               string_set=string_set,
+                                                                                                               max_span=max_span,
+                                                                                                               max_fingers=max_fingers)))
+
+        return voicings
+
+    def _compute_voicings(self,
+                          chord_mask: int,
+                          bass_pitch_class: Optional[int],
+                          tuning: Sequence[str],
+                          string_set: Tuple[int, ...],
+                          max_span: int,
+                          max_fingers: int
+                          ) -> Iterator[Voicing]:
+
+        """
+        Searches depth first across the strings, from the first note of the tuning upwards, pruning any partial voicing that can no longer be completed.
+        A partial voicing is pruned when its fretted notes exceed the span or need too many fingers, when its lowest sounding note is not the bass, or when too few strings remain to supply the missing chord tones.
+        Adding a note never lowers the finger count, since a lower fret moves the barre and frees no finger, so the count of a partial voicing bounds every voicing completed from it.
+
+        Args:
+
+            chord_mask: The pitch class mask of the chord.
+            bass_pitch_class: The pitch class the lowest sounding string must play, or None.
+            tuning: A sequence containing the root note of each open string.
+            string_set: The string indices that may sound.
+            max_span: The largest distance in frets between fretted notes, open strings excluded.
+            max_fingers: The largest number of fretting fingers.
+
+        Returns:
+
+            An iterator of voicings.
+
+        """
+
+        num_strings: int = len(tuning)
+
+        open_pitch_classes: List[int] = [PITCH_CLASSES[root_note] for root_note in tuning]
+
+        # Candidate frets for each string, muted strings having none
+        candidates: List[List[int]] = [[fret for fret in range(self._num_frets) if chord_mask >> ((open_pitch_classes[string_index] + fret) % NUM_PITCH_CLASSES) & 1]
+                                       if string_index in string_set else [] for string_index in range(num_strings)]
+
+        # Number of strings that may still sound from each string index upwards
+        remaining_strings: List[int] = [sum(1 for index in range(string_index, num_strings) if candidates[index]) for string_index in range(num_strings + 1)]
+
+        voicing: List[Optional[int]] = [None] * num_strings
+
+        def search(string_index: int,
+                   covered_mask: int,
+                   low_fret: int,
+                   high_fret: int,
+                   sounding: bool,
+                   fretted: int,
+                   barred: int
+                   ) -> Iterator[Voicing]:
+
+            if string_index == num_strings:
+
+                if covered_mask == chord_mask:
+
+                    yield tuple(voicing)
+
+                return
+
+            # Prunes when the remaining strings cannot supply every missing chord tone
+            if remaining_strings[string_index] < bin(chord_mask & ~covered_mask).count("1"):
+
+                return
+
+            # Muting the string
+            yield from search(string_index + 1, covered_mask, low_fret, high_fret, sounding, fretted, barred)
+
+            for fret in candidates[string_index]:
+
+                pitch_class: int = (open_pitch_classes[string_index] + fret) % NUM_PITCH_CLASSES
+
+                # The first sounding string is the bass
+                if not sounding and bass_pitch_class is not None and pitch_class != bass_pitch_class:
+
+                    continue
+
+                if fret > 0:
+
+                    new_low: int = min(low_fret, fret)
+
+                    new_high: int = max(high_fret, fret)
+
+                    # Notes on the lowest fret share one barre, which a lower fret takes over
+                    new_barred: int = 1 if fret < low_fret else barred + 1 if fret == low_fret else barred
+
+                    new_fretted: int = fretted + 1
+
+                    # Candidates are ascending, so every later fret also exceeds the span, or needs a finger of its own
+                    if new_high - new_low > max_span or new_fretted - new_barred + 1 > max_fingers:
+
+                        if fret > low_fret:
+
+                            break
+
+                        continue
+
+                else:
+
+                    new_low, new_high, new_fretted, new_barred = low_fret, high_fret, fretted, barred
+
+                voicing[string_index] = fret
+
+                yield from search(string_index + 1, covered_mask | (1 << pitch_class), new_low, new_high, True, new_fretted, new_barred)
+
+                voicing[string_index] = None
+
+        return search(0, 0, self._num_frets, -1, False, 0, 0)
+
+
+
+if __name__ == "__main__":
+
+    print("--------------------")
+
+    demo_scale_generator = ScaleGenerator()
+
+    demo_scale_notes = demo_scale_generator.get_or_generate_scale(scale_key="C", scale_type=ScaleTypes.MAJOR_SCALE)
+
+    demo_chord_generator = ChordGenerator()
+
+    demo_chord_notes = demo_chord_generator.get_or_generate_chord(scale_notes=demo_scale_notes, scale_type=ScaleTypes.MAJOR_SCALE, chord_type=ChordTypes.TRIAD)
+
+    print(demo_chord_notes["I"])
+
+    print("--------------------")
+
+    demo_chord_voicings = ChordVoicings()
+
+    demo_voicings = demo_chord_voicings.get_or_generate_voicings(chord_notes=demo_chord_notes["I"], tuning=tunings["e_standard"])
+
+    for demo_index, demo_voicing in zip(range(10), demo_voicings):
+
+        print(demo_voicing)
+
+    print("--------------------")
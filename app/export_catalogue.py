@@ -0,0 +1,373 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Tuple, Any, Optional, Iterator
+
+from config.config import CHROMATIC_SCALE
+from app.library.degrees import chord_degrees
+from app.library.tunings import tunings
+from app.library.enums import ScaleTypes, ChordTypes
+from app.scale_generator import ScaleGenerator
+from app.chord_generator import ChordGenerator
+from app.scale_fretboard import ScaleFretboard
+from app.chord_fretboard import ChordFretboard
+from app.values import Scale, ChordSet, FretboardStrings
+from app.exporters import FretboardRecord, EXPORTERS, export_records
+from app.persistent_cache import library_fingerprint
+
+# A shard holds every tuning and chord type for one scale key and scale type, so its scale notes are computed once
+Shard = Tuple[str, str]
+
+# Generator instances of the current worker process, shared by every shard it exports and created by its first shard
+_worker_generators: Optional[Dict[str, Any]] = None
+
+def worker_generators() -> Dict[str, Any]:
+
+    """
+    A function to retrieve the generator instances of the current worker process, creating them on first use rather than when the module is imported.
+
+    Return:
+
+        A dictionary containing generator names as keys and generator instances as values.
+
+    """
+
+    global _worker_generators
+
+    if _worker_generators is None:
+
+        _worker_generators = {
+
+            "scale_generator": ScaleGenerator(),
+            "chord_generator": ChordGenerator(),
+            "scale_fretboard": ScaleFretboard(),
+            "chord_fretboard": ChordFretboard()
+
+        }
+
+    return _worker_generators
+
+def load_tunings(tuning_files: List[str]) -> Dict[str, Tuple[str, ...]]:
+
+    """
+    A function to merge the library tunings with user supplied tuning files.
+
+    Args:
+
+        tuning_files: Paths to JSON files, each containing tuning names as keys and lists of open string notes as values.
+
+    Return:
+
+        A dictionary containing tuning names as keys and tuples of open string notes as values.
+
+    """
+
+    all_tunings: Dict[str, Tuple[str, ...]] = dict(tunings)
+
+    for tuning_file in tuning_files:
+
+        with open(tuning_file) as file:
+
+            for tuning_name, tuning in json.load(file).items():
+
+                all_tunings[tuning_name] = tuple(tuning)
+
+    return all_tunings
+
+def shard_path(output_dir: str,
+               shard: Shard,
+               export_format: str = "jsonl"
+               ) -> str:
+
+    """
+    A function to name the output file of a shard.
+
+    Args:
+
+        output_dir: The catalogue directory.
+        shard: A tuple of scale key and scale type.
+        export_format: The format name, which sets the file extension.
+
+    Return:
+
+        The path of the shard's file.
+
+    """
+
+    scale_key, scale_type = shard
+
+    return os.path.join(output_dir, f"{scale_key.replace('#', 'sharp')}_{scale_type}.{EXPORTERS[export_format].file_extension}")
+
+def manifest_path(output_dir: str,
+                  export_format: str = "jsonl"
+                  ) -> str:
+
+    """
+    A function to name the manifest file of the shards of one format.
+
+    Args:
+
+        output_dir: The catalogue directory.
+        export_format: The format name.
+
+    Return:
+
+        The path of the manifest file.
+
+    """
+
+    return os.path.join(output_dir, f"manifest.{export_format}.json")
+
+def catalogue_manifest(catalogue_tunings: Dict[str, Tuple[str, ...]],
+                       export_format: str = "jsonl"
+                       ) -> Dict[str, Any]:
+
+    """
+    A function to describe everything the shards of an export depend on, so that a later run can tell whether they are still valid.
+
+    Args:
+
+        catalogue_tunings: A dictionary containing tuning names as keys and tuples of open string notes as values.
+        export_format: The format name.
+
+    Return:
+
+        A JSON serialisable dictionary of the format, the tunings and the library fingerprint.
+
+    """
+
+    return {"format": export_format, "tunings": {tuning_name: list(tuning) for tuning_name, tuning in catalogue_tunings.items()}, "fingerprint": library_fingerprint()}
+
+def prepare_output_dir(output_dir: str,
+                       shards: List[Shard],
+                       catalogue_tunings: Dict[str, Tuple[str, ...]],
+                       export_format: str = "jsonl"
+                       ) -> int:
+
+    """
+    A function to make a catalogue directory safe to resume into, removing the temporary files of killed workers and any shards written for other tunings or library tables.
+    Stale shards are removed before the new manifest is written, so an interrupted run never leaves stale shards under a matching manifest.
+
+    Args:
+
+        output_dir: The catalogue directory.
+        shards: Every shard of the export.
+        catalogue_tunings: A dictionary containing tuning names as keys and tuples of open string notes as values.
+        export_format: The format name.
+
+    Return:
+
+        The number of stale shards removed.
+
+    """
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Temporary files are named after the final path and the worker's process id, and are never renamed once their worker is gone
+    for temporary_path in glob.glob(os.path.join(glob.escape(output_dir), f"*.{EXPORTERS[export_format].file_extension}.*.tmp")):
+
+        os.remove(temporary_path)
+
+    manifest: Dict[str, Any] = catalogue_manifest(catalogue_tunings=catalogue_tunings, export_format=export_format)
+
+    path: str = manifest_path(output_dir=output_dir, export_format=export_format)
+
+    try:
+
+        with open(path) as file:
+
+            previous_manifest: Optional[Dict[str, Any]] = json.load(file)
+
+    except (OSError, ValueError):
+
+        previous_manifest = None
+
+    if previous_manifest == manifest:
+
+        return 0
+
+    # Shards without a matching manifest cannot be trusted, including those of exports that predate manifests
+    stale_paths: List[str] = [shard_path(output_dir=output_dir, shard=shard, export_format=export_format) for shard in shards]
+
+    stale_paths = [stale_path for stale_path in stale_paths if os.path.exists(stale_path)]
+
+    for stale_path in stale_paths:
+
+        os.remove(stale_path)
+
+    with open(f"{path}.tmp", "w") as file:
+
+        json.dump(manifest, file, indent=2)
+
+    os.replace(f"{path}.tmp", path)
+
+    return len(stale_paths)
+
+def shard_records(shard: Shard,
+                  catalogue_tunings: Dict[str, Tuple[str, ...]]
+                  ) -> Iterator[FretboardRecord]:
+
+    """
+    A function to generate every scale fretboard and chord fretboard record of one shard, one at a time.
+
+    Args:
+
+        shard: A tuple of scale key and scale type.
+        catalogue_tunings: A dictionary containing tuning names as keys and tuples of open string notes as values.
+
+    Return:
+
+        An iterator of fretboard records.
+
+    """
+
+    scale_key, scale_type_value = shard
+
+    scale_type: ScaleTypes = ScaleTypes(scale_type_value)
+
+    generators: Dict[str, Any] = worker_generators()
+
+    scale_notes: Scale = generators["scale_generator"].get_or_generate_scale(scale_key=scale_key, scale_type=scale_type)
+
+    for tuning_name, tuning in catalogue_tunings.items():
+
+        scale_strings: FretboardStrings = generators["scale_fretboard"].get_or_generate_scale_strings(scale_notes=scale_notes, scale_type=scale_type, tuning=tuning)
+
+        yield FretboardRecord(scale_key=scale_key, scale_type=scale_type.value, tuning_name=tuning_name, tuning=tuning,
+                              chord_type=None, chord_degree=None, notes=scale_notes,
+                              strings=[scale_strings[root_note] for root_note in tuning])
+
+        for chord_type in ChordTypes:
+
+            chord_notes: ChordSet = generators["chord_generator"].get_or_generate_chord(scale_notes=scale_notes, scale_type=scale_type, chord_type=chord_type)
+
+            chord_strings: FretboardStrings = generators["chord_fretboard"].get_or_generate_chord_strings(scale_notes=scale_notes, scale_type=scale_type, chord_notes=chord_notes, chord_type=chord_type, tuning=tuning)
+
+            for chord_degree in chord_degrees[chord_type.value][scale_type.value]:
+
+                yield FretboardRecord(scale_key=scale_key, scale_type=scale_type.value, tuning_name=tuning_name, tuning=tuning,
+                                      chord_type=chord_type.value, chord_degree=chord_degree, notes=chord_notes[chord_degree],
+                                      strings=[chord_strings[chord_degree][root_note] for root_note in tuning])
+
+def export_shard(output_dir: str,
+                 shard: Shard,
+                 catalogue_tunings: Dict[str, Tuple[str, ...]],
+                 export_format: str = "jsonl"
+                 ) -> Tuple[Shard, int]:
+
+    """
+    A function to write every scale fretboard and chord fretboard of one shard, streaming records through an exporter to a temporary file that is renamed once complete.
+    Runs in a worker process, reusing that process's generator instances and caches across shards.
+
+    Args:
+
+        output_dir: The catalogue directory.
+        shard: A tuple of scale key and scale type.
+        catalogue_tunings: A dictionary containing tuning names as keys and tuples of open string notes as values.
+        export_format: The format name.
+
+    Return:
+
+        A tuple of the shard and the number of records written.
+
+    """
+
+    final_path: str = shard_path(output_dir=output_dir, shard=shard, export_format=export_format)
+
+    temporary_path: str = f"{final_path}.{os.getpid()}.tmp"
+
+    # One scale fretboard and one fretboard per chord degree for each tuning
+    num_records: int = len(catalogue_tunings) * (1 + sum(len(chord_degrees[chord_type.value][shard[1]]) for chord_type in ChordTypes))
+
+    with open(temporary_path, "w", newline="") as output_file:
+
+        records: int = export_records(records=shard_records(shard=shard, catalogue_tunings=catalogue_tunings), stream=output_file, export_format=export_format, num_records=num_records)
+
+    # The rename is atomic, so a shard file only ever exists once it is complete
+    os.replace(temporary_path, final_path)
+
+    return shard, records
+
+def export_catalogue(output_dir: str,
+                     catalogue_tunings: Dict[str, Tuple[str, ...]],
+                     workers: Optional[int] = None,
+                     export_format: str = "jsonl"
+                     ) -> Dict[str, Any]:
+
+    """
+    A function to export every key, scale type, chord type and tuning across a process pool, skipping shards that were completed by an earlier run with the same tunings, format and library tables.
+
+    Args:
+
+        output_dir: The catalogue directory.
+        catalogue_tunings: A dictionary containing tuning names as keys and tuples of open string notes as values.
+        workers: The number of worker processes, defaulting to the CPU count.
+        export_format: The format name.
+
+    Return:
+
+        A dictionary summarising the run.
+
+    """
+
+    shards: List[Shard] = [(scale_key, scale_type.value) for scale_key in CHROMATIC_SCALE for scale_type in ScaleTypes]
+
+    stale: int = prepare_output_dir(output_dir=output_dir, shards=shards, catalogue_tunings=catalogue_tunings, export_format=export_format)
+
+    if stale:
+
+        print(f"Removed {stale} shards exported with other tunings or library tables", file=sys.stderr)
+
+    pending: List[Shard] = [shard for shard in shards if not os.path.exists(shard_path(output_dir=output_dir, shard=shard, export_format=export_format))]
+
+    print(f"{len(shards) - len(pending)} of {len(shards)} shards already complete, exporting {len(pending)}", file=sys.stderr)
+
+    start: float = time.perf_counter()
+
+    total_records: int = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+
+        futures = [executor.submit(export_shard, output_dir, shard, catalogue_tunings, export_format) for shard in pending]
+
+        for completed, future in enumerate(as_completed(futures), start=1):
+
+            shard, records = future.result()
+
+            total_records += records
+
+            elapsed: float = time.perf_counter() - start
+
+            print(f"[{completed}/{len(pending)}] {shard[0]} {shard[1]}: {records} records, {total_records / elapsed:.0f} records/s", file=sys.stderr)
+
+    elapsed = time.perf_counter() - start
+
+    return {"shards": len(pending), "skipped": len(shards) - len(pending), "stale": stale, "records": total_records, "seconds": elapsed, "records_per_s": total_records / elapsed if elapsed else 0.0}
+
+def main(argv: Optional[List[str]] = None) -> None:
+
+    """
+    A function to run the catalogue export from the command line.
+
+    """
+
+    parser = argparse.ArgumentParser(description="Export every scale and chord fretboard as shards, one file per key and scale type")
+    parser.add_argument("output_dir", help="Catalogue directory, reused to resume an interrupted export")
+    parser.add_argument("--tuning-file", action="append", default=[], help="JSON file of extra tunings, may be repeated")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes, defaulting to the CPU count")
+    parser.add_argument("--format", dest="export_format", choices=sorted(EXPORTERS), default="jsonl", help="Output format of the shards")
+    args = parser.parse_args(argv)
+
+    summary: Dict[str, Any] = export_catalogue(output_dir=args.output_dir, catalogue_tunings=load_tunings(tuning_files=args.tuning_file), workers=args.workers, export_format=args.export_format)
+
+    print(json.dumps(summary))
+
+
+
+if __name__ == "__main__":
+
+    main()
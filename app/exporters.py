@@ -0,0 +1,441 @@
+import csv
+import json
+from functools import lru_cache
+from typing import List, Dict, Tuple, Optional, NamedTuple, Iterable, TextIO, Type
+from xml.sax.saxutils import escape
+
+from config.config import FRETBOARD_LEN
+from app.library.tunings import tunings
+from app.library.enums import ScaleTypes
+from app.scale_generator import ScaleGenerator
+from app.scale_fretboard import ScaleFretboard
+from app.values import to_json
+from app.print_fretboard import render_fretboard
+
+# SVG geometry in pixels, shared by every fretboard
+SVG_FRET_WIDTH: int = 40
+SVG_STRING_SPACING: int = 20
+SVG_MARGIN: int = 30
+SVG_TITLE_HEIGHT: int = 20
+SVG_NOTE_RADIUS: int = 8
+
+# Frets carrying an inlay, twelve repeating every octave with a double inlay
+SVG_INLAY_FRETS: Tuple[int, ...] = (3, 5, 7, 9, 15, 17, 19, 21)
+SVG_DOUBLE_INLAY_FRETS: Tuple[int, ...] = (12, 24)
+
+# Styles written once per SVG document, so each note marker carries no presentation attributes
+_SVG_STYLE: str = ("<style>.neck line{stroke:#444}.neck .nut{stroke-width:4}.neck circle{fill:#ddd}.neck text,.t{font:10px sans-serif;fill:#444}"
+                   ".t{font-size:12px}.n circle{fill:#222}.n text{fill:#fff;font:9px sans-serif;text-anchor:middle;dominant-baseline:central}</style>")
+
+class FretboardRecord(NamedTuple):
+
+    """
+    A scale fretboard, or the fretboard of one chord degree, ready to be exported.
+
+    Attributes:
+
+        scale_key: The root note of the scale.
+        scale_type: The name of the scale type.
+        tuning_name: The name of the tuning.
+        tuning: A tuple containing the root note of each open string.
+        chord_type: The name of the chord type, or None for a scale fretboard.
+        chord_degree: The chord degree, or None for a scale fretboard.
+        notes: The scale notes or chord notes.
+        strings: A list containing the guitar string representation of each open string, in tuning order.
+
+    """
+
+    scale_key: str
+    scale_type: str
+    tuning_name: str
+    tuning: Tuple[str, ...]
+    chord_type: Optional[str]
+    chord_degree: Optional[str]
+    notes: Tuple[str, ...]
+    strings: List[List[str]]
+
+class Exporter:
+
+    """
+    The interface shared by pluggable fretboard exporters.
+    An exporter writes each record to its text stream as it arrives, so a catalogue of any size is never held in memory.
+    Exporters are context managers, writing anything that precedes the first record on entry and anything that follows the last on exit.
+
+    Attributes:
+
+        file_extension: The extension of files written by the exporter.
+        _stream: The text stream written to.
+        _num_records: The number of records that will be written, if known in advance.
+
+    """
+
+    file_extension: str = ""
+
+    def __init__(self,
+                 stream: TextIO,
+                 num_records: Optional[int] = None
+                 ) -> None:
+
+        self._stream: TextIO = stream
+        self._num_records: Optional[int] = num_records
+
+    def begin(self) -> None:
+
+        """
+        Writes anything that precedes the first record.
+
+        """
+
+    def write(self,
+              record: FretboardRecord
+              ) -> None:
+
+        """
+        Writes a single record.
+
+        Args:
+
+            record: The fretboard record.
+
+        """
+
+        raise NotImplementedError
+
+    def end(self) -> None:
+
+        """
+        Writes anything that follows the last record.
+
+        """
+
+    def __enter__(self) -> "Exporter":
+
+        self.begin()
+
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+
+        self.end()
+
+class JSONLinesExporter(Exporter):
+
+    """
+    An exporter writing one JSON object per record and line, the format of the catalogue shards.
+
+    """
+
+    file_extension: str = "jsonl"
+
+    def write(self,
+              record: FretboardRecord
+              ) -> None:
+
+        self._stream.write(json.dumps(record._asdict(), default=to_json) + "\n")
+
+class CSVExporter(Exporter):
+
+    """
+    An exporter writing one CSV row per guitar string, with one column per fret, after a single header row.
+
+    Attributes:
+
+        _writer: The CSV writer over the stream.
+        _num_frets: The number of fret columns in the header.
+
+    """
+
+    file_extension: str = "csv"
+
+    def __init__(self,
+                 stream: TextIO,
+                 num_records: Optional[int] = None,
+                 num_frets: int = FRETBOARD_LEN
+                 ) -> None:
+
+        super().__init__(stream=stream, num_records=num_records)
+
+        self._writer = csv.writer(stream, lineterminator="\n")
+        self._num_frets: int = num_frets
+
+    def begin(self) -> None:
+
+        self._writer.writerow(["scale_key", "scale_type", "tuning_name", "chord_type", "chord_degree", "string_index", "open_note", *(f"fret_{fret}" for fret in range(self._num_frets))])
+
+    def write(self,
+              record: FretboardRecord
+              ) -> None:
+
+        self._writer.writerows([record.scale_key, record.scale_type, record.tuning_name, record.chord_type or "", record.chord_degree or "", string_index, root_note, *(note.rstrip(" _") for note in string)]
+                               for string_index, (root_note, string) in enumerate(zip(record.tuning, record.strings)))
+
+class ASCIIExporter(Exporter):
+
+    """
+    An exporter writing each record as the terminal fretboard diagram, under a title line.
+
+    """
+
+    file_extension: str = "txt"
+
+    def write(self,
+              record: FretboardRecord
+              ) -> None:
+
+        self._stream.write(f"{_record_title(record=record)}\n")
+
+        render_fretboard(stream=self._stream, strings=dict(zip(record.tuning, record.strings)), tuning=record.tuning, fret_marker=True)
+
+        self._stream.write("\n")
+
+class SVGExporter(Exporter):
+
+    """
+    An exporter writing every record into one SVG document, as fretboards stacked top to bottom.
+    The neck of each string count and fret count is rendered once as a symbol that every fretboard reuses, and note markers are formatted once per position and note, so writing a fretboard is only joining cached fragments.
+    Every fretboard is given the height of the largest string count, so the document height is known as soon as the number of records is.
+
+    Attributes:
+
+        _num_frets: The number of frets the document width allows for.
+        _max_strings: The largest string count the fretboard height allows for.
+        _necks: The string counts and fret counts whose neck symbol has been written.
+        _offset: The vertical offset of the next fretboard.
+
+    """
+
+    file_extension: str = "svg"
+
+    def __init__(self,
+                 stream: TextIO,
+                 num_records: Optional[int] = None,
+                 num_frets: int = FRETBOARD_LEN,
+                 max_strings: int = max(len(tuning) for tuning in tunings.values())
+                 ) -> None:
+
+        super().__init__(stream=stream, num_records=num_records)
+
+        self._num_frets: int = num_frets
+        self._max_strings: int = max_strings
+        self._necks: set = set()
+        self._offset: int = 0
+
+    def begin(self) -> None:
+
+        # Without a record count the height is left to the viewer
+        height: str = f' height="{self._num_records * _svg_panel_height(num_strings=self._max_strings)}"' if self._num_records is not None else ""
+
+        self._stream.write(f'<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" width="{_svg_panel_width(num_frets=self._num_frets)}"{height}>{_SVG_STYLE}\n')
+
+    def write(self,
+              record: FretboardRecord
+              ) -> None:
+
+        num_strings: int = len(record.strings)
+
+        num_frets: int = len(record.strings[0])
+
+        if num_strings > self._max_strings:
+
+            raise ValueError(f"Fretboards are sized for at most {self._max_strings} strings, got {num_strings}")
+
+        if (num_strings, num_frets) not in self._necks:
+
+            self._stream.write(_svg_neck(num_strings=num_strings, num_frets=num_frets))
+
+            self._necks.add((num_strings, num_frets))
+
+        panel_height: int = _svg_panel_height(num_strings=self._max_strings)
+
+        # The highest string is drawn at the top, as in the terminal diagram
+        markers: str = "".join(_svg_note_marker(row=num_strings - 1 - string_index, fret=fret, formatted_note=formatted_note)
+                               for string_index, string in enumerate(record.strings) for fret, formatted_note in enumerate(string) if not formatted_note.startswith("_"))
+
+        self._stream.write(f'<svg y="{self._offset}" height="{panel_height}"><text class="t" x="{SVG_MARGIN}" y="{SVG_TITLE_HEIGHT - 6}">{escape(_record_title(record=record))}</text>'
+                           f'<use xlink:href="#neck-{num_strings}-{num_frets}"/><g class="n">{markers}</g></svg>\n')
+
+        self._offset += panel_height
+
+    def end(self) -> None:
+
+        self._stream.write("</svg>\n")
+
+def _record_title(record: FretboardRecord) -> str:
+
+    """
+    A function to title a record by its key, scale type, tuning and chord degree.
+
+    """
+
+    title: str = f"{record.scale_key} {record.scale_type} ({record.tuning_name})"
+
+    return f"{title} {record.chord_type} {record.chord_degree}" if record.chord_degree is not None else title
+
+@lru_cache(maxsize=None)
+def _svg_panel_width(num_frets: int) -> int:
+
+    return 2 * SVG_MARGIN + num_frets * SVG_FRET_WIDTH
+
+@lru_cache(maxsize=None)
+def _svg_panel_height(num_strings: int) -> int:
+
+    return SVG_TITLE_HEIGHT + 2 * SVG_MARGIN + (num_strings - 1) * SVG_STRING_SPACING
+
+@lru_cache(maxsize=None)
+def _svg_neck(num_strings: int,
+              num_frets: int
+              ) -> str:
+
+    """
+    A function to pre-render the fixed geometry of a neck as an SVG symbol: string lines, fret lines, inlays and fret numbers.
+    Fret 0 is drawn left of the nut, so open strings have a column of their own.
+
+    Args:
+
+        num_strings: The number of strings.
+        num_frets: The number of frets, including the open string.
+
+    Return:
+
+        The symbol element.
+
+    """
+
+    top: int = SVG_TITLE_HEIGHT + SVG_MARGIN
+
+    bottom: int = top + (num_strings - 1) * SVG_STRING_SPACING
+
+    right: int = SVG_MARGIN + num_frets * SVG_FRET_WIDTH
+
+    elements: List[str] = [f'<line x1="{SVG_MARGIN + SVG_FRET_WIDTH}" y1="{top + row * SVG_STRING_SPACING}" x2="{right}" y2="{top + row * SVG_STRING_SPACING}"/>' for row in range(num_strings)]
+
+    for fret in range(1, num_frets + 1):
+
+        # The first fret line is the nut
+        line_class: str = ' class="nut"' if fret == 1 else ""
+
+        elements.append(f'<line{line_class} x1="{SVG_MARGIN + fret * SVG_FRET_WIDTH}" y1="{top}" x2="{SVG_MARGIN + fret * SVG_FRET_WIDTH}" y2="{bottom}"/>')
+
+    for fret in range(num_frets):
+
+        centre: int = SVG_MARGIN + fret * SVG_FRET_WIDTH + SVG_FRET_WIDTH // 2
+
+        if fret in SVG_INLAY_FRETS:
+
+            elements.append(f'<circle cx="{centre}" cy="{(top + bottom) // 2}" r="4"/>')
+
+        elif fret in SVG_DOUBLE_INLAY_FRETS:
+
+            elements.append(f'<circle cx="{centre}" cy="{top + SVG_STRING_SPACING // 2}" r="4"/><circle cx="{centre}" cy="{bottom - SVG_STRING_SPACING // 2}" r="4"/>')
+
+        elements.append(f'<text x="{centre}" y="{bottom + SVG_MARGIN - 10}" text-anchor="middle">{fret}</text>')
+
+    return f'<defs><symbol id="neck-{num_strings}-{num_frets}" class="neck">{"".join(elements)}</symbol></defs>\n'
+
+@lru_cache(maxsize=8192)
+def _svg_note_marker(row: int,
+                     fret: int,
+                     formatted_note: str
+                     ) -> str:
+
+    """
+    A function to format the marker of a note at a string row and fret, reused by every fretboard with the same note there.
+
+    Args:
+
+        row: The string row, 0 being the top line.
+        fret: The fret number.
+        formatted_note: The formatted note of the guitar string representation.
+
+    Return:
+
+        The marker element.
+
+    """
+
+    x: int = SVG_MARGIN + fret * SVG_FRET_WIDTH + SVG_FRET_WIDTH // 2
+
+    y: int = SVG_TITLE_HEIGHT + SVG_MARGIN + row * SVG_STRING_SPACING
+
+    return f'<g transform="translate({x},{y})"><circle r="{SVG_NOTE_RADIUS}"/><text>{escape(formatted_note.strip())}</text></g>'
+
+# Exporters keyed by format name
+EXPORTERS: Dict[str, Type[Exporter]] = {
+
+    "jsonl": JSONLinesExporter,
+    "csv": CSVExporter,
+    "ascii": ASCIIExporter,
+    "svg": SVGExporter
+
+}
+
+def register_exporter(name: str,
+                      exporter_class: Type[Exporter]
+                      ) -> None:
+
+    """
+    A function to add an exporter for a new format, or to replace the exporter of an existing one.
+
+    Args:
+
+        name: The format name.
+        exporter_class: A subclass of Exporter.
+
+    """
+
+    EXPORTERS[name] = exporter_class
+
+def export_records(records: Iterable[FretboardRecord],
+                   stream: TextIO,
+                   export_format: str = "jsonl",
+                   num_records: Optional[int] = None
+                   ) -> int:
+
+    """
+    A function to stream records through the exporter of a format, consuming them lazily.
+
+    Args:
+
+        records: An iterable of fretboard records.
+        stream: The text stream to be written to.
+        export_format: The format name.
+        num_records: The number of records, if known in advance.
+
+    Return:
+
+        The number of records written.
+
+    """
+
+    written: int = 0
+
+    with EXPORTERS[export_format](stream=stream, num_records=num_records) as exporter:
+
+        for record in records:
+
+            exporter.write(record=record)
+
+            written += 1
+
+    return written
+
+
+
+if __name__ == "__main__":
+
+    import sys
+
+    print("--------------------")
+
+    demo_scale_notes = ScaleGenerator().get_or_generate_scale(scale_key="A", scale_type=ScaleTypes.PENTATONIC_MINOR)
+
+    demo_scale_strings = ScaleFretboard().get_or_generate_scale_strings(scale_notes=demo_scale_notes, scale_type=ScaleTypes.PENTATONIC_MINOR, tuning=tunings["e_standard"])
+
+    demo_record = FretboardRecord(scale_key="A", scale_type=ScaleTypes.PENTATONIC_MINOR.value, tuning_name="e_standard", tuning=tunings["e_standard"],
+                                  chord_type=None, chord_degree=None, notes=demo_scale_notes, strings=[demo_scale_strings[root_note] for root_note in tunings["e_standard"]])
+
+    for demo_format in ("ascii", "csv", "jsonl"):
+
+        export_records(records=[demo_record], stream=sys.stdout, export_format=demo_format)
+
+        print("--------------------")
@@ -0,0 +1,429 @@
+import sys
+from array import array
+from itertools import cycle, islice
+from typing import List, Tuple, Iterator, Optional, Sequence, Union
+
+from config.config import CHROMATIC_SCALE, PITCH_CLASSES, NUM_PITCH_CLASSES, FRETBOARD_LEN
+from app.library.tunings import tunings
+from app.cache import CacheBackend, get_default_cache
+from app.utils import generate_cache_key, get_or_generate, notes_to_mask
+
+# Supported instruments range from four string basses to twelve string guitars
+MIN_STRINGS: int = 4
+MAX_STRINGS: int = 12
+
+# Marks a fret whose note is not in the scale or chord
+BLANK: int = -1
+
+_FORMATTED_CHROMATIC_SCALE: List[str] = [f"{note:<2}" for note in CHROMATIC_SCALE]
+
+def get_or_generate_cycle(mask: int,
+                          cache: Optional[CacheBackend] = None
+                          ) -> array:
+
+    """
+    A function to retrieve the fret cycle of a pitch class mask from the cache. If unavailable, generates the cycle and stores it in the cache.
+    Pitch classes repeat every twelve frets, so one cycle indexed by pitch class serves every string, fret window and neck length of the mask.
+
+    Args:
+
+        mask: The pitch class mask of the scale or chord.
+        cache: A cache backend, defaulting to the process-wide cache.
+
+    Return:
+
+        cycle: A twelve slot signed byte array containing each pitch class, or BLANK where it is not in the mask.
+
+    """
+
+    cache_key: Tuple[str, int] = generate_cache_key("FretboardCycle", mask)
+
+    cycle: array = get_or_generate(cache=cache if cache is not None else get_default_cache(),
+                                   cache_key=cache_key,
+                                   generate_function=lambda: array("b", [pitch_class if mask >> pitch_class & 1 else BLANK for pitch_class in range(NUM_PITCH_CLASSES)]))
+
+    return cycle
+
+def get_or_generate_fretboard(mask: int,
+                              tuning: Sequence[str],
+                              num_frets: int = FRETBOARD_LEN,
+                              capo: int = 0,
+                              cache: Optional[CacheBackend] = None
+                              ) -> "Fretboard":
+
+    """
+    A function to retrieve a fretboard from the cache, keyed by its content rather than by the scale or chord it was named after.
+    If unavailable, generates the fretboard and stores it in the cache, so equivalent scales, modes and chords share one fretboard.
+
+    Args:
+
+        mask: The pitch class mask of the scale or chord.
+        tuning: A sequence containing the root note of each open string.
+        num_frets: The number of frets per string, counted from the capo.
+        capo: The fret the capo is placed on, 0 for none.
+        cache: A cache backend, defaulting to the process-wide cache.
+
+    Return:
+
+        fretboard: A fretboard indexed by string number.
+
+    """
+
+    cache_key: Tuple[str, int, Tuple[str, ...], int, int] = generate_cache_key("Fretboard", mask, tuple(tuning), num_frets, capo)
+
+    fretboard: Fretboard = get_or_generate(cache=cache if cache is not None else get_default_cache(),
+                                           cache_key=cache_key,
+                                           generate_function=lambda: Fretboard(mask=mask, tuning=tuning, num_frets=num_frets, capo=capo, cache=cache))
+
+    return fretboard
+
+class FretWindow:
+
+    """
+    A read-only view of consecutive frets on one string, reading from a shared fret cycle rather than holding its own copy.
+    Creating a window of any length costs the same, and slicing a window returns another window over the same cycle.
+
+    Attributes:
+
+        _cycle: The twelve slot fret cycle of the scale or chord.
+        _start: The pitch class of the first fret in the window.
+        _length: The number of frets in the window.
+
+    """
+
+    __slots__ = ("_cycle", "_start", "_length")
+
+    def __init__(self,
+                 cycle: array,
+                 start: int,
+                 length: int
+                 ) -> None:
+
+        self._cycle: array = cycle
+        self._start: int = start % NUM_PITCH_CLASSES
+        self._length: int = length
+
+    def __len__(self) -> int:
+
+        return self._length
+
+    def __getitem__(self,
+                    index: Union[int, slice]
+                    ) -> Union[int, "FretWindow", List[int]]:
+
+        if isinstance(index, slice):
+
+            frets: range = range(self._length)[index]
+
+            # Contiguous slices stay views, stepped slices are materialised
+            if frets.step == 1:
+
+                return FretWindow(cycle=self._cycle, start=self._start + frets.start, length=len(frets))
+
+            return [self._cycle[(self._start + fret) % NUM_PITCH_CLASSES] for fret in frets]
+
+        if index < 0:
+
+            index += self._length
+
+        if not 0 <= index < self._length:
+
+            raise IndexError("fret window index out of range")
+
+        return self._cycle[(self._start + index) % NUM_PITCH_CLASSES]
+
+    def __iter__(self) -> Iterator[int]:
+
+        return islice(cycle(self._cycle), self._start, self._start + self._length)
+
+    def __eq__(self,
+               other: object
+               ) -> bool:
+
+        if isinstance(other, FretWindow):
+
+            return self._length == other._length and list(self) == list(other)
+
+        return NotImplemented
+
+    def tolist(self) -> List[int]:
+
+        """
+        Copies the window into a list.
+
+        Returns:
+
+            A list of pitch classes, BLANK where the fret is not in the scale or chord.
+
+        """
+
+        return list(self)
+
+    def __repr__(self) -> str:
+
+        return f"FretWindow({self.tolist()})"
+
+class Fretboard:
+
+    """
+    An immutable fretboard for a scale or chord, indexed by string number from the first note of the tuning.
+    Every string reads from the same fret cycle at its own offset, so memory does not grow with the number of strings or frets.
+    The fret cycle is retrieved from the cache backend supplied on construction, defaulting to the process-wide cache.
+    Fretboards are hashable and compare equal when their mask, tuning, fret count and capo match.
+
+    Attributes:
+
+        _mask: The pitch class mask of the scale or chord.
+        _tuning: A tuple containing the root note of each open string.
+        _num_frets: The number of frets per string, counted from the capo.
+        _capo: The fret the capo is placed on, 0 for none.
+        _cycle: The twelve slot fret cycle of the mask.
+        _starts: A tuple containing the pitch class sounded at fret 0 of each string, after the capo.
+
+    """
+
+    __slots__ = ("_mask", "_tuning", "_num_frets", "_capo", "_cycle", "_starts")
+
+    def __init__(self,
+                 mask: int,
+                 tuning: Sequence[str],
+                 num_frets: int = FRETBOARD_LEN,
+                 capo: int = 0,
+                 cache: Optional[CacheBackend] = None
+                 ) -> None:
+
+        if not MIN_STRINGS <= len(tuning) <= MAX_STRINGS:
+
+            raise ValueError(f"Tunings must have between {MIN_STRINGS} and {MAX_STRINGS} strings, got {len(tuning)}")
+
+        if num_frets < 1 or capo < 0:
+
+            raise ValueError(f"Invalid fretboard of {num_frets} frets with a capo on fret {capo}")
+
+        self._mask: int = mask
+        self._tuning: Tuple[str, ...] = tuple(sys.intern(root_note) for root_note in tuning)
+        self._num_frets: int = num_frets
+        self._capo: int = capo
+        self._cycle: array = get_or_generate_cycle(mask=mask, cache=cache)
+        self._starts: Tuple[int, ...] = tuple((PITCH_CLASSES[root_note] + capo) % NUM_PITCH_CLASSES for root_note in self._tuning)
+
+    @property
+    def mask(self) -> int:
+
+        return self._mask
+
+    @property
+    def tuning(self) -> Tuple[str, ...]:
+
+        return self._tuning
+
+    @property
+    def num_strings(self) -> int:
+
+        return len(self._tuning)
+
+    @property
+    def num_frets(self) -> int:
+
+        return self._num_frets
+
+    @property
+    def capo(self) -> int:
+
+        return self._capo
+
+    @property
+    def cycle(self) -> memoryview:
+
+        """
+        The fret cycle shared by every string, as a read-only view indexed by pitch class.
+
+        """
+
+        return memoryview(self._cycle).toreadonly()
+
+    def row(self,
+            string_index: int
+            ) -> FretWindow:
+
+        """
+        Retrieves every fret of a string as a view over the fret cycle.
+
+        Args:
+
+            string_index: The string number, 0 being the first note of the tuning.
+
+        Returns:
+
+            A fret window of pitch classes, BLANK where the fret is not in the scale or chord.
+
+        """
+
+        return FretWindow(cycle=self._cycle, start=self._starts[string_index], length=self._num_frets)
+
+    def window(self,
+               string_index: int,
+               first_fret: int,
+               last_fret: int
+               ) -> FretWindow:
+
+        """
+        Retrieves a range of frets of a string, such as the frets of a position, as a view over the fret cycle.
+
+        Args:
+
+            string_index: The string number, 0 being the first note of the tuning.
+            first_fret: The first fret of the window, counted from the capo.
+            last_fret: The last fret of the window, inclusive.
+
+        Returns:
+
+            A fret window of pitch classes, BLANK where the fret is not in the scale or chord.
+
+        """
+
+        if not 0 <= first_fret <= last_fret < self._num_frets:
+
+            raise ValueError(f"Invalid window of frets {first_fret} to {last_fret} on a fretboard of {self._num_frets} frets")
+
+        return FretWindow(cycle=self._cycle, start=self._starts[string_index] + first_fret, length=last_fret - first_fret + 1)
+
+    def pitch_class(self,
+                    string_index: int,
+                    fret: int
+                    ) -> Optional[int]:
+
+        """
+        Retrieves the pitch class at a string and fret.
+
+        Args:
+
+            string_index: The string number, 0 being the first note of the tuning.
+            fret: The fret number, counted from the capo.
+
+        Returns:
+
+            The pitch class, or None if it is not in the scale or chord.
+
+        """
+
+        pitch_class: int = self._cycle[(self._starts[string_index] + fret) % NUM_PITCH_CLASSES]
+
+        return pitch_class if pitch_class != BLANK else None
+
+    def is_marked(self,
+                  string_index: int,
+                  fret: int
+                  ) -> bool:
+
+        """
+        Tests whether the note at a string and fret is in the scale or chord.
+
+        """
+
+        return self._cycle[(self._starts[string_index] + fret) % NUM_PITCH_CLASSES] != BLANK
+
+    def string(self,
+               string_index: int
+               ) -> List[str]:
+
+        """
+        Formats a string as a guitar string representation.
+
+        Args:
+
+            string_index: The string number, 0 being the first note of the tuning.
+
+        Returns:
+
+            A list of formatted notes, with blank spaces for notes that are not in the scale or chord.
+
+        """
+
+        return [_FORMATTED_CHROMATIC_SCALE[pitch_class] if pitch_class != BLANK else "__" for pitch_class in self.row(string_index=string_index)]
+
+    def strings(self) -> List[List[str]]:
+
+        """
+        Formats every string, in tuning order.
+
+        Returns:
+
+            A list of guitar string representations.
+
+        """
+
+        return [self.string(string_index=string_index) for string_index in range(len(self._tuning))]
+
+    def __len__(self) -> int:
+
+        return len(self._tuning)
+
+    def __eq__(self,
+               other: object
+               ) -> bool:
+
+        if isinstance(other, Fretboard):
+
+            return (self._mask, self._tuning, self._num_frets, self._capo) == (other._mask, other._tuning, other._num_frets, other._capo)
+
+        return NotImplemented
+
+    def __hash__(self) -> int:
+
+        return hash((self._mask, self._tuning, self._num_frets, self._capo))
+
+    def __reduce__(self) -> Tuple[type, Tuple[int, Tuple[str, ...], int, int]]:
+
+        # Unpickled fretboards rejoin the shared fret cycle instead of carrying their own copy
+        return Fretboard, (self._mask, self._tuning, self._num_frets, self._capo)
+
+    def __repr__(self) -> str:
+
+        return f"Fretboard(mask={self._mask:#05x}, tuning={self._tuning}, num_frets={self._num_frets}, capo={self._capo})"
+
+def fretboard_from_notes(notes: Sequence[str],
+                         tuning: Sequence[str],
+                         num_frets: int = FRETBOARD_LEN,
+                         capo: int = 0
+                         ) -> Fretboard:
+
+    """
+    A function to build a fretboard from scale notes or chord notes.
+
+    Args:
+
+        notes: The scale notes or chord notes.
+        tuning: A sequence containing the root note of each open string.
+        num_frets: The number of frets per string, counted from the capo.
+        capo: The fret the capo is placed on, 0 for none.
+
+    Return:
+
+        A fretboard.
+
+    """
+
+    return Fretboard(mask=notes_to_mask(notes=notes), tuning=tuning, num_frets=num_frets, capo=capo)
+
+
+
+if __name__ == "__main__":
+
+    print("--------------------")
+
+    demo_fretboard = fretboard_from_notes(notes=["C", "D", "E", "F", "G", "A", "B"], tuning=tunings["open_c"], num_frets=13, capo=2)
+
+    print(demo_fretboard)
+
+    for demo_string_index in range(demo_fretboard.num_strings):
+
+        print(demo_fretboard.tuning[demo_string_index], demo_fretboard.string(string_index=demo_string_index))
+
+    print("--------------------")
+
+    print(demo_fretboard.window(string_index=5, first_fret=5, last_fret=9))
+
+    print(demo_fretboard.cycle.obj is fretboard_from_notes(notes=["C", "D", "E", "F", "G", "A", "B"], tuning=tunings["e_standard"], num_frets=25).cycle.obj)
+
+    print("--------------------")
@@ -0,0 +1,401 @@
+import json
+import sys
+import time
+from functools import wraps
+from importlib import import_module
+from threading import Lock
+from typing import List, Dict, Tuple, Callable, Any, Optional, TextIO
+
+import app.utils
+from app.library.enums import ScaleTypes, ChordTypes
+from app.library.tunings import tunings
+from app.scale_generator import ScaleGenerator
+from app.scale_fretboard import ScaleFretboard
+
+# The compute methods wrapped while instrumentation is enabled, as (module, class, method)
+INSTRUMENTED_METHODS: List[Tuple[str, str, str]] = [
+
+    ("app.scale_generator", "ScaleGenerator", "_compute_scale_notes"),
+    ("app.chord_generator", "ChordGenerator", "_compute_chord_notes"),
+    ("app.scale_fretboard", "ScaleFretboard", "_compute_scale_strings"),
+    ("app.chord_fretboard", "ChordFretboard", "_compute_chord_strings"),
+    ("app.chord_fretboard", "ChordFretboard", "_compute_chord_note_strings")
+
+]
+
+_SCALE_TYPE_VALUES: frozenset = frozenset(scale_type.value for scale_type in ScaleTypes)
+_CHORD_TYPE_VALUES: frozenset = frozenset(chord_type.value for chord_type in ChordTypes)
+
+class Histogram:
+
+    """
+    A histogram of durations with power of two microsecond buckets.
+
+    Attributes:
+
+        count: The number of recorded durations.
+        total_ns: The sum of recorded durations in nanoseconds.
+        min_ns: The shortest recorded duration in nanoseconds.
+        max_ns: The longest recorded duration in nanoseconds.
+        buckets: A list, indexed by bucket, where bucket n counts durations below 2 ** n microseconds and at or above the previous bucket.
+
+    """
+
+    __slots__ = ("count", "total_ns", "min_ns", "max_ns", "buckets")
+
+    def __init__(self) -> None:
+
+        self.count: int = 0
+        self.total_ns: int = 0
+        self.min_ns: Optional[int] = None
+        self.max_ns: Optional[int] = None
+        self.buckets: List[int] = []
+
+    def record(self,
+               duration_ns: int
+               ) -> None:
+
+        """
+        Records a single duration.
+
+        Args:
+
+            duration_ns: The duration in nanoseconds.
+
+        """
+
+        self.count += 1
+
+        self.total_ns += duration_ns
+
+        self.min_ns = duration_ns if self.min_ns is None else min(self.min_ns, duration_ns)
+
+        self.max_ns = duration_ns if self.max_ns is None else max(self.max_ns, duration_ns)
+
+        bucket: int = (duration_ns // 1000).bit_length()
+
+        if bucket >= len(self.buckets):
+
+            self.buckets.extend([0] * (bucket + 1 - len(self.buckets)))
+
+        self.buckets[bucket] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+
+        """
+        Converts the histogram into plain data.
+
+        Returns:
+
+            A dictionary of the histogram statistics, with buckets keyed by their upper bound.
+
+        """
+
+        return {
+
+            "count": self.count,
+            "total_us": self.total_ns / 1e3,
+            "mean_us": self.total_ns / self.count / 1e3 if self.count else 0.0,
+            "min_us": self.min_ns / 1e3 if self.min_ns is not None else None,
+            "max_us": self.max_ns / 1e3 if self.max_ns is not None else None,
+            "buckets": {f"<{1 << bucket}us": bucket_count for bucket, bucket_count in enumerate(self.buckets) if bucket_count}
+
+        }
+
+class _Counters:
+
+    """
+    Lookup and compute statistics for one namespace, pattern or method.
+
+    """
+
+    __slots__ = ("calls", "hits", "misses", "compute")
+
+    def __init__(self) -> None:
+
+        self.calls: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.compute: Histogram = Histogram()
+
+    def to_dict(self) -> Dict[str, Any]:
+
+        return {"calls": self.calls, "hits": self.hits, "misses": self.misses, "compute": self.compute.to_dict()}
+
+_lock: Lock = Lock()
+_namespaces: Dict[str, _Counters] = {}
+_patterns: Dict[str, _Counters] = {}
+_methods: Dict[str, _Counters] = {}
+_original_methods: Dict[Tuple[str, str, str], Callable[..., Any]] = {}
+
+def _counters(table: Dict[str, _Counters],
+              name: str
+              ) -> _Counters:
+
+    """
+    A function to retrieve the counters for a name, creating them on first use. Must be called with the lock held.
+
+    """
+
+    counters: Optional[_Counters] = table.get(name)
+
+    if counters is None:
+
+        counters = table[name] = _Counters()
+
+    return counters
+
+def _pattern_label(values: Any) -> Optional[str]:
+
+    """
+    A function to find the scale type and chord type among cache key elements or call arguments.
+
+    Args:
+
+        values: An iterable of cache key elements or argument values.
+
+    Return:
+
+        A "scale_type/chord_type" label, with "-" for a missing part, or None if neither is present.
+
+    """
+
+    scale_type: Optional[str] = None
+    chord_type: Optional[str] = None
+
+    for value in values:
+
+        if isinstance(value, (ScaleTypes, ChordTypes)):
+
+            value = value.value
+
+        if not isinstance(value, str):
+
+            continue
+
+        if scale_type is None and value in _SCALE_TYPE_VALUES:
+
+            scale_type = value
+
+        elif chord_type is None and value in _CHORD_TYPE_VALUES:
+
+            chord_type = value
+
+    if scale_type is None and chord_type is None:
+
+        return None
+
+    return f"{scale_type or '-'}/{chord_type or '-'}"
+
+def _record_lookup(cache_key: Tuple[Any, ...],
+                   hit: bool,
+                   duration_ns: int,
+                   pattern: Optional[Tuple[Any, ...]] = None
+                   ) -> None:
+
+    """
+    The lookup hook installed into get_or_generate while instrumentation is enabled.
+
+    Args:
+
+        cache_key: The cache key that was looked up.
+        hit: Whether the value was served from the cache.
+        duration_ns: The time spent generating the value on a miss, in nanoseconds.
+        pattern: The scale type and chord type passed alongside the cache key, or None to look for them in the cache key.
+
+    """
+
+    label: Optional[str] = _pattern_label(values=pattern if pattern is not None else cache_key[1:])
+
+    with _lock:
+
+        for counters in (_counters(table=_namespaces, name=cache_key[0]), _counters(table=_patterns, name=label) if label is not None else None):
+
+            if counters is None:
+
+                continue
+
+            counters.calls += 1
+
+            if hit:
+
+                counters.hits += 1
+
+            else:
+
+                counters.misses += 1
+
+                counters.compute.record(duration_ns=duration_ns)
+
+def _instrument_method(method_name: str,
+                       method: Callable[..., Any]
+                       ) -> Callable[..., Any]:
+
+    """
+    A function to wrap a compute method so that each call is counted and timed.
+
+    Args:
+
+        method_name: The qualified name the method is reported under.
+        method: The original method.
+
+    Return:
+
+        The wrapped method.
+
+    """
+
+    @wraps(method)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+
+        start: int = time.perf_counter_ns()
+
+        result: Any = method(*args, **kwargs)
+
+        duration_ns: int = time.perf_counter_ns() - start
+
+        label: Optional[str] = _pattern_label(values=kwargs.values())
+
+        with _lock:
+
+            for counters in (_counters(table=_methods, name=method_name), _counters(table=_methods, name=f"{method_name}[{label}]") if label is not None else None):
+
+                if counters is None:
+
+                    continue
+
+                counters.calls += 1
+
+                counters.compute.record(duration_ns=duration_ns)
+
+        return result
+
+    return wrapper
+
+def enable() -> None:
+
+    """
+    A function to enable instrumentation, installing the get_or_generate hook and wrapping every compute method.
+    While disabled, nothing is wrapped and get_or_generate only tests the hook for None.
+
+    """
+
+    with _lock:
+
+        if _original_methods:
+
+            return
+
+        for module_name, class_name, method_name in INSTRUMENTED_METHODS:
+
+            owner: type = getattr(import_module(module_name), class_name)
+
+            original: Callable[..., Any] = owner.__dict__[method_name]
+
+            _original_methods[(module_name, class_name, method_name)] = original
+
+            setattr(owner, method_name, _instrument_method(method_name=f"{class_name}.{method_name}", method=original))
+
+        app.utils.set_lookup_hook(_record_lookup)
+
+def disable() -> None:
+
+    """
+    A function to disable instrumentation, restoring the original compute methods. Recorded statistics are kept.
+
+    """
+
+    with _lock:
+
+        app.utils.set_lookup_hook(None)
+
+        for (module_name, class_name, method_name), original in _original_methods.items():
+
+            setattr(getattr(import_module(module_name), class_name), method_name, original)
+
+        _original_methods.clear()
+
+def is_enabled() -> bool:
+
+    """
+    A function to report whether instrumentation is enabled.
+
+    Return:
+
+        True if enabled.
+
+    """
+
+    return bool(_original_methods)
+
+def reset() -> None:
+
+    """
+    A function to discard every recorded statistic.
+
+    """
+
+    with _lock:
+
+        _namespaces.clear()
+
+        _patterns.clear()
+
+        _methods.clear()
+
+def snapshot() -> Dict[str, Any]:
+
+    """
+    A function to copy the recorded statistics into plain data.
+
+    Return:
+
+        A dictionary with namespaces, patterns and methods, each keyed by name.
+
+    """
+
+    with _lock:
+
+        return {
+
+            "enabled": bool(_original_methods),
+            "namespaces": {name: counters.to_dict() for name, counters in _namespaces.items()},
+            "patterns": {name: counters.to_dict() for name, counters in _patterns.items()},
+            "methods": {name: counters.to_dict() for name, counters in _methods.items()}
+
+        }
+
+def dump(stream: TextIO) -> None:
+
+    """
+    A function to write a snapshot of the recorded statistics to a text stream as JSON.
+
+    Args:
+
+        stream: The text stream to be written to.
+
+    """
+
+    json.dump(snapshot(), stream, indent=2)
+
+
+
+if __name__ == "__main__":
+
+    enable()
+
+    demo_scale_generator = ScaleGenerator()
+
+    demo_scale_fretboard = ScaleFretboard()
+
+    for demo_scale_key in ("C", "D", "C"):
+
+        demo_scale_notes = demo_scale_generator.get_or_generate_scale(scale_key=demo_scale_key, scale_type=ScaleTypes.MAJOR_SCALE)
+
+        demo_scale_fretboard.get_or_generate_scale_strings(scale_notes=demo_scale_notes, scale_type=ScaleTypes.MAJOR_SCALE, tuning=tunings["e_standard"])
+
+    disable()
+
+    dump(sys.stdout)
+
+    print()
@@ -1,16 +1,58 @@
-from app.library.enums import ScaleTypes, ChordTypes
-from app.library.intervals import scale_intervals, chord_intervals, pitch_notations
+import sys
+
+# The tunings submodule shares its name with the tunings table, and importing it would replace a lazily resolved table with the module
 from app.library.tunings import tunings
-from app.library.degrees import chord_degrees
-
-__all__ = [
-
-    "ScaleTypes",
-    "ChordTypes",
-    "scale_intervals",
-    "chord_intervals",
-    "pitch_notations",
-    "tunings",
-    "chord_degrees"
-    
-]
+
+# Public names and the submodule that defines each, imported on first attribute access
+_lazy_attributes: dict[str, str] = {
+
+    "ScaleTypes": "app.library.enums",
+    "ChordTypes": "app.library.enums",
+    "PositionSystems": "app.library.enums",
+    "parent_scale_intervals": "app.library.intervals",
+    "scale_modes": "app.library.intervals",
+    "scale_intervals": "app.library.intervals",
+    "chord_intervals": "app.library.intervals",
+    "chord_qualities": "app.library.intervals",
+    "chord_symbols": "app.library.intervals",
+    "pitch_notations": "app.library.intervals",
+    "chord_degrees": "app.library.degrees",
+    "scale_masks": "app.library.masks",
+    "position_systems": "app.library.positions"
+
+}
+
+__all__ = ["tunings", *_lazy_attributes]
+
+def __getattr__(name: str) -> object:
+
+    """
+    A function to import the submodule defining a public name on first access, then cache the name on the package.
+
+    Args:
+
+        name: The attribute being accessed.
+
+    Return:
+
+        The public object.
+
+    """
+
+    module_name: str | None = _lazy_attributes.get(name)
+
+    if module_name is None:
+
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    __import__(module_name)
+
+    value: object = getattr(sys.modules[module_name], name)
+
+    globals()[name] = value
+
+    return value
+
+def __dir__() -> list[str]:
+
+    return sorted(set(globals()) | set(__all__))
@@ -1,3 +1,6 @@
+from app.library.intervals import scale_intervals, chord_intervals
+from app.library.numerals import build_chord_degrees
+
 scale_degrees = {
 
     "diatonic": ("I", "II", "III", "IV", "V", "VI", "VII"),
@@ -6,66 +9,5 @@ scale_degrees = {
 
 }
 
-chord_degrees = {
-
-    "triad": {
-
-        "major_scale": ("I", "ii", "iii", "IV", "V", "vi", "vii°"),
-
-        "natural_minor": ("i", "ii°", "III", "iv", "v", "VI", "VII"),
-
-        "harmonic_minor": ("i", "ii°", "III+", "iv", "V", "VI", "vii°"),
-
-        "melodic_minor": ("i", "ii", "III+", "IV", "V", "vi°", "vii°"),
-
-        "ionian_mode": ("I", "ii", "iii", "IV", "V", "vi", "vii°"),
-
-        "dorian_mode": ("i", "ii", "III", "IV", "v", "vi°", "VII"),
-
-        "phrygian_mode": ("i", "II", "iii°", "iv", "v", "VI", "vii°"),
-
-        "lydian_mode": ("I", "II", "iii", "#iv°", "V", "vi", "vii"),
-
-        "mixolydian_mode": ("I", "ii", "iii°", "IV", "v", "VI", "VII"),
-
-        "aeolian_mode": ("i", "ii°", "III", "iv", "v", "VI", "VII"),
-
-        "locrian_mode": ("i°", "II", "iii", "iv", "V", "VI", "vii"),
-
-        "pentatonic_major": ("I", "ii", "iii", "V", "vi"),
-
-        "pentatonic_minor": ("i", "iii", "iv", "v", "VII")
-        
-    },
-
-    "seventh": {
-        
-        "major_scale": ("Imaj7", "ii7", "iii7", "IVmaj7", "V7", "vi7", "viiø7"),
-
-        "natural_minor": ("i7", "iiø7", "IIImaj7", "iv7", "v7", "VImaj7", "VII7"),
-
-        "harmonic_minor": ("iM7", "iiø7", "III+M7", "iv7", "V7", "VImaj7", "vii°7"),
-
-        "melodic_minor": ("iM7", "ii7", "III+M7", "IVmaj7", "V7", "viø7", "viiø7"),
-
-        "ionian_mode": ("Imaj7", "ii7", "iii7", "IVmaj7", "V7", "vi7", "viiø7"),
-
-        "dorian_mode": ("i7", "ii7", "IIImaj7", "IV7", "v7", "viø7", "VIImaj7"),
-
-        "phrygian_mode": ("i7", "IImaj7", "iiiø7", "iv7", "v7", "VImaj7", "viiø7"),
-
-        "lydian_mode": ("Imaj7", "II7", "iii7", "#ivø7", "V7", "vi7", "viiø7"),
-
-        "mixolydian_mode": ("I7", "ii7", "iiiø7", "IVmaj7", "v7", "VI7", "VIImaj7"),
-
-        "aeolian_mode": ("i7", "iiø7", "IIImaj7", "iv7", "v7", "VImaj7", "VII7"),
-
-        "locrian_mode": ("iø7", "IImaj7", "iii7", "iv7", "V7", "VImaj7", "viiø7"),
-
-        "pentatonic_major": ("Imaj7", "ii7", "iii7", "Vmaj7", "vi7"),
-
-        "pentatonic_minor": ("i7", "iii7", "iv7", "v7", "VII7")
-
-    }
-    
-}
+# Chord numerals of every chord type on every scale type, computed once from the interval stacks of each mode
+chord_degrees = build_chord_degrees(scale_sequence=scale_intervals, chord_sequence=chord_intervals)
@@ -33,3 +33,11 @@ class ChordTypes(Enum):
     TRIAD = "triad"
 
     SEVENTH = "seventh"
+
+class PositionSystems(Enum):
+
+    THREE_NOTES_PER_STRING = "three_notes_per_string"
+
+    FOUR_FRET_BOX = "four_fret_box"
+
+    CAGED = "caged"
@@ -1,31 +1,55 @@
-scale_intervals = {
+from config.config import NUM_PITCH_CLASSES
 
-    "major_scale": (0, 2, 4, 5, 7, 9, 11),
+# Parent scales, from which every scale type is derived
+parent_scale_intervals = {
 
-    "natural_minor": (0, 2, 3, 5, 7, 8, 10),
+    "major_scale": (0, 2, 4, 5, 7, 9, 11),
 
     "harmonic_minor": (0, 2, 3, 5, 7, 8, 11),
 
     "melodic_minor": (0, 2, 3, 5, 7, 9, 11),
 
-    # "ionian_mode": (0, 2, 4, 5, 7, 9, 11),
+    "pentatonic_major": (0, 2, 4, 7, 9)
 
-    "dorian_mode": (0, 2, 3, 5, 7, 9, 10),
+}
 
-    "phrygian_mode": (0, 1, 3, 5, 7, 8, 10),
+# Each scale type as a mode of a parent scale, numbered from 1 for the parent scale itself
+scale_modes = {
 
-    "lydian_mode": (0, 2, 4, 6, 7, 9, 11),
+    "major_scale": ("major_scale", 1),
 
-    "mixolydian_mode": (0, 2, 4, 5, 7, 9, 10),
+    "natural_minor": ("major_scale", 6),
 
-    # "aeolian_mode": (0, 2, 3, 5, 7, 8, 10),
+    "harmonic_minor": ("harmonic_minor", 1),
 
-    "locrian_mode": (0, 1, 3, 5, 6, 8, 10),
+    "melodic_minor": ("melodic_minor", 1),
 
-    "pentatonic_major": (0, 2, 4, 7, 9),
+    "ionian_mode": ("major_scale", 1),
+
+    "dorian_mode": ("major_scale", 2),
+
+    "phrygian_mode": ("major_scale", 3),
+
+    "lydian_mode": ("major_scale", 4),
+
+    "mixolydian_mode": ("major_scale", 5),
+
+    "aeolian_mode": ("major_scale", 6),
+
+    "locrian_mode": ("major_scale", 7),
+
+    "pentatonic_major": ("pentatonic_major", 1),
+
+    "pentatonic_minor": ("pentatonic_major", 5)
+
+}
+
+# Scale intervals, rotated from the parent scale to begin on the mode's first degree
+scale_intervals = {
+
+    scale_type: tuple(sorted((interval - parent_scale_intervals[parent_type][mode - 1]) % NUM_PITCH_CLASSES for interval in parent_scale_intervals[parent_type]))
+    for scale_type, (parent_type, mode) in scale_modes.items()
 
-    "pentatonic_minor": (0, 3, 5, 7, 10)
-    
 }
 
 chord_intervals = {
@@ -36,6 +60,60 @@ chord_intervals = {
     
 }
 
+# Chord qualities keyed by the intervals of the chord above its root, as a roman numeral template for the first degree
+chord_qualities = {
+
+    (0, 4, 7): "I",
+
+    (0, 3, 7): "i",
+
+    (0, 3, 6): "i°",
+
+    (0, 4, 8): "I+",
+
+    (0, 4, 7, 11): "Imaj7",
+
+    (0, 4, 7, 10): "I7",
+
+    (0, 3, 7, 10): "i7",
+
+    (0, 3, 6, 10): "iø7",
+
+    (0, 3, 6, 9): "i°7",
+
+    (0, 3, 7, 11): "iM7",
+
+    (0, 4, 8, 11): "I+M7"
+
+}
+
+# Chord symbol suffixes keyed by the intervals of the chord above its root, in semitones
+chord_symbols = {
+
+    (0, 4, 7): "",
+
+    (0, 3, 7): "m",
+
+    (0, 3, 6): "dim",
+
+    (0, 4, 8): "aug",
+
+    (0, 4, 7, 11): "maj7",
+
+    (0, 4, 7, 10): "7",
+
+    (0, 3, 7, 10): "m7",
+
+    (0, 3, 6, 10): "m7b5",
+
+    (0, 3, 6, 9): "dim7",
+
+    (0, 3, 7, 11): "mMaj7",
+
+    (0, 4, 8, 11): "augMaj7"
+
+}
+
 pitch_notations = {
 
     "e_standard": (2, 2, 3, 3, 3, 4),
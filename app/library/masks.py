@@ -0,0 +1,8 @@
+from app.library.intervals import scale_intervals
+
+# Twelve bit pitch class masks relative to the root, bit 0 being the root itself
+scale_masks = {
+
+    scale_type: sum(1 << interval for interval in intervals) for scale_type, intervals in scale_intervals.items()
+
+}
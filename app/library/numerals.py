@@ -0,0 +1,149 @@
+from typing import List, Dict, Tuple, Optional, Sequence
+
+from config.config import NUM_PITCH_CLASSES, ACCIDENTALS
+from app.library.intervals import scale_intervals, chord_qualities
+
+# Imports nothing outside the library, so that the library tables built here never import the app modules that read them
+
+# Roman numerals of the seven scale degrees
+NUMERALS: Tuple[str, ...] = ("I", "II", "III", "IV", "V", "VI", "VII")
+
+# Accidentals keyed by the number of semitones a degree is raised above the reference scale
+_ACCIDENTAL_NAMES: Dict[int, str] = {offset: accidental for accidental, offset in ACCIDENTALS.items()}
+
+def rotate_intervals(intervals: Sequence[int],
+                     mode: int
+                     ) -> Tuple[int, ...]:
+
+    """
+    A function to derive the intervals of a mode by rotating the intervals of its parent scale to begin on another degree.
+
+    Args:
+
+        intervals: The parent scale intervals.
+        mode: The degree the mode begins on, 1 being the parent scale itself.
+
+    Return:
+
+        A tuple containing the mode intervals.
+
+    """
+
+    return tuple(sorted((interval - intervals[mode - 1]) % NUM_PITCH_CLASSES for interval in intervals))
+
+def degree_numerals(intervals: Sequence[int],
+                    interval_sequence: Dict[str, Tuple[int, ...]] = scale_intervals
+                    ) -> Tuple[Tuple[int, str], ...]:
+
+    """
+    A function to number each degree of a scale against its reference scale, the major scale if it contains a major third and the natural minor scale otherwise.
+    Seven note scales number their degrees in order, while other scales take the number of the reference degree at or below each note.
+
+    Args:
+
+        intervals: The scale intervals.
+        interval_sequence: The dictionary containing the major and natural minor scale intervals.
+
+    Return:
+
+        A tuple, indexed by degree, containing the reference degree index and the accidental raising or lowering it.
+
+    """
+
+    reference: Tuple[int, ...] = interval_sequence["major_scale" if 4 in intervals else "natural_minor"]
+
+    numerals: List[Tuple[int, str]] = []
+
+    for degree, interval in enumerate(intervals):
+
+        reference_degree: int = degree if len(intervals) == len(reference) else max(index for index, reference_interval in enumerate(reference) if reference_interval <= interval)
+
+        numerals.append((reference_degree, _ACCIDENTAL_NAMES[interval - reference[reference_degree]]))
+
+    return tuple(numerals)
+
+def chord_quality(intervals: Sequence[int],
+                  degree: int,
+                  chord_pattern: Sequence[int]
+                  ) -> Optional[str]:
+
+    """
+    A function to name the quality of the chord stacked on a scale degree, as a roman numeral template for the first degree.
+
+    Args:
+
+        intervals: The scale intervals.
+        degree: The scale degree the chord is built on, 0 being the scale key.
+        chord_pattern: The chord interval pattern, in scale degrees.
+
+    Return:
+
+        The template, such as "i" or "Imaj7", or None if the stacked intervals are not a known chord.
+
+    """
+
+    stack: Tuple[int, ...] = tuple((intervals[(degree + step) % len(intervals)] - intervals[degree]) % NUM_PITCH_CLASSES for step in chord_pattern)
+
+    return chord_qualities.get(stack)
+
+def chord_numerals(intervals: Sequence[int],
+                   chord_pattern: Sequence[int],
+                   interval_sequence: Dict[str, Tuple[int, ...]] = scale_intervals
+                   ) -> Tuple[str, ...]:
+
+    """
+    A function to compute the roman numeral of the chord on each degree of a scale, from the scale intervals alone.
+    The numeral is upper case for chords with a major third and lower case otherwise, prefixed by any accidental against the reference scale and suffixed by the chord quality.
+    Chords stacked from scales other than seven note scales are not tertian, so they take the quality of the reference scale chord on the same degree.
+
+    Args:
+
+        intervals: The scale intervals.
+        chord_pattern: The chord interval pattern, in scale degrees.
+        interval_sequence: The dictionary containing the major and natural minor scale intervals.
+
+    Return:
+
+        A tuple containing the chord numeral of each scale degree.
+
+    """
+
+    reference: Tuple[int, ...] = interval_sequence["major_scale" if 4 in intervals else "natural_minor"]
+
+    numerals: List[str] = []
+
+    for degree, (reference_degree, accidental) in enumerate(degree_numerals(intervals=intervals, interval_sequence=interval_sequence)):
+
+        template: Optional[str] = chord_quality(intervals=intervals, degree=degree, chord_pattern=chord_pattern)
+
+        if template is None:
+
+            template = chord_quality(intervals=reference, degree=reference_degree, chord_pattern=chord_pattern)
+
+        numeral: str = NUMERALS[reference_degree] if template[0] == "I" else NUMERALS[reference_degree].lower()
+
+        numerals.append(accidental + numeral + template[1:])
+
+    return tuple(numerals)
+
+def build_chord_degrees(scale_sequence: Dict[str, Tuple[int, ...]],
+                        chord_sequence: Dict[str, Tuple[int, ...]]
+                        ) -> Dict[str, Dict[str, Tuple[str, ...]]]:
+
+    """
+    A function to precompute the chord numerals of every chord type on every scale type.
+
+    Args:
+
+        scale_sequence: The dictionary containing scale intervals.
+        chord_sequence: The dictionary containing chord intervals.
+
+    Return:
+
+        A dictionary, keyed by chord type, containing a nested dictionary with scale types as keys and chord numerals as values.
+
+    """
+
+    return {chord_type: {scale_type: chord_numerals(intervals=intervals, chord_pattern=chord_pattern, interval_sequence=scale_sequence)
+                         for scale_type, intervals in scale_sequence.items()}
+            for chord_type, chord_pattern in chord_sequence.items()}
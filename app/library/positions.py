@@ -0,0 +1,11 @@
+# Fingering rules of each position system: the notes each string may take, the widest stretch on one string and the widest box, None for no box
+# Shape systems also name the open chord shapes their boxes are moved from, and the string intervals, lowest first, of the tuning those shapes belong to
+position_systems = {
+
+    "three_notes_per_string": {"notes_per_string": (3,), "max_stretch": 5, "box_span": None},
+
+    "four_fret_box": {"notes_per_string": (1, 2, 3), "max_stretch": 4, "box_span": 4},
+
+    "caged": {"notes_per_string": (1, 2, 3), "max_stretch": 4, "box_span": 4, "shapes": ("C", "A", "G", "E", "D"), "string_intervals": (5, 5, 5, 4, 5)}
+
+}
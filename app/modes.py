@@ -0,0 +1,102 @@
+from typing import List, Dict, Tuple, Optional, Sequence
+
+from config.config import CHROMATIC_SCALE, PITCH_CLASSES, NUM_MASKS
+from app.library.intervals import parent_scale_intervals, scale_intervals, chord_intervals
+from app.library.numerals import rotate_intervals, chord_numerals
+from app.utils import intervals_to_mask, notes_to_mask, rotate_mask, get_or_build_table
+
+def build_mode_table(parent_sequence: Dict[str, Tuple[int, ...]]
+                     ) -> List[Optional[Tuple[str, int]]]:
+
+    """
+    A function to precompute a lookup table of every mode of every parent scale, by root relative pitch class mask.
+    Where several modes share a mask, the first parent scale in the parent sequence is kept.
+
+    Args:
+
+        parent_sequence: The dictionary containing parent scale intervals.
+
+    Return:
+
+        mode_table: A list, indexed by pitch class mask, containing a tuple of parent scale type and mode number, or None.
+
+    """
+
+    mode_table: List[Optional[Tuple[str, int]]] = [None] * NUM_MASKS
+
+    for parent_type, intervals in parent_sequence.items():
+
+        for mode in range(1, len(intervals) + 1):
+
+            mask: int = intervals_to_mask(intervals=rotate_intervals(intervals=intervals, mode=mode))
+
+            if mode_table[mask] is None:
+
+                mode_table[mask] = (parent_type, mode)
+
+    return mode_table
+
+def get_mode_table(parent_sequence: Dict[str, Tuple[int, ...]] = parent_scale_intervals
+                   ) -> List[Optional[Tuple[str, int]]]:
+
+    """
+    A function to retrieve the mode lookup table for a parent scale dictionary, building it on first use.
+
+    Args:
+
+        parent_sequence: The dictionary containing parent scale intervals.
+
+    Return:
+
+        mode_table: A list, indexed by pitch class mask, containing a tuple of parent scale type and mode number, or None.
+
+    """
+
+    mode_table: List[Optional[Tuple[str, int]]] = get_or_build_table(build_mode_table, parent_sequence)
+
+    return mode_table
+
+def determine_mode(note_sequence: Sequence[str],
+                   parent_sequence: Dict[str, Tuple[int, ...]] = parent_scale_intervals,
+                   chromatic_scale: List[str] = CHROMATIC_SCALE
+                   ) -> Optional[Tuple[str, int]]:
+
+    """
+    A function to identify a sequence of notes as a mode of a parent scale, beginning on the first note.
+    The notes are reduced to a pitch class mask relative to the first note, which indexes a precomputed mode table.
+
+    Args:
+
+        note_sequence: The scale notes to be identified.
+        parent_sequence: The dictionary containing parent scale intervals.
+        chromatic_scale: The twelve note chromatic scale.
+
+    Return:
+
+        A tuple of parent scale type and mode number, or None if the notes are not a mode of any parent scale.
+
+    """
+
+    pitch_classes: Dict[str, int] = PITCH_CLASSES if chromatic_scale is CHROMATIC_SCALE else {note: index for index, note in enumerate(chromatic_scale)}
+
+    mask: int = rotate_mask(mask=notes_to_mask(notes=note_sequence, note_sequence=chromatic_scale), semitones=-pitch_classes[note_sequence[0]])
+
+    return get_mode_table(parent_sequence=parent_sequence)[mask]
+
+
+
+if __name__ == "__main__":
+
+    print("--------------------")
+
+    print(determine_mode(note_sequence=["D", "E", "F", "G", "A", "Bb", "C"]))
+
+    print(determine_mode(note_sequence=["E", "F#", "G#", "A", "B", "C", "D"]))
+
+    print("--------------------")
+
+    for demo_scale_type in ("major_scale", "harmonic_minor", "lydian_mode", "pentatonic_minor"):
+
+        print(demo_scale_type, chord_numerals(intervals=scale_intervals[demo_scale_type], chord_pattern=chord_intervals["triad"]))
+
+    print("--------------------")
@@ -0,0 +1,295 @@
+from typing import List, Tuple, Optional, NamedTuple, Iterable, Sequence
+
+from config.config import CHROMATIC_SCALE, PITCH_CLASSES, NUM_PITCH_CLASSES, NUM_MASKS
+from app.library.intervals import chord_intervals
+from app.library.degrees import chord_degrees
+from app.library.masks import scale_masks
+from app.library.tunings import tunings
+from app.library.enums import ScaleTypes, ChordTypes
+from app.utils import notes_to_mask, rotate_mask, chord_masks_from_scale_mask
+
+class PatternEntry(NamedTuple):
+
+    """
+    A scale, or a chord on one degree of a scale, in a specific key.
+
+    Attributes:
+
+        scale_key: The root note of the scale.
+        scale_type: The name of the scale type.
+        chord_type: The name of the chord type, or None for a scale.
+        chord_degree: The chord degree within the scale, or None for a scale.
+        mask: The pitch class mask of the scale or chord.
+
+    """
+
+    scale_key: str
+    scale_type: ScaleTypes
+    chord_type: Optional[ChordTypes]
+    chord_degree: Optional[str]
+    mask: int
+
+class PatternIndex:
+
+    """
+    An inverted index over every key, scale type and chord type, keyed by pitch class mask.
+    Each of the 4096 possible masks maps directly to the scales and chords that contain it, so queries are a single list lookup.
+
+    Attributes:
+
+        _scale_entries: A list of every scale entry.
+        _chord_entries: A list of every chord entry.
+        _scale_supersets: A list, indexed by pitch class mask, containing the scale entries that contain the mask.
+        _chord_supersets: A list, indexed by pitch class mask, containing the chord entries that contain the mask.
+
+    """
+
+    def __init__(self) -> None:
+
+        self._scale_entries: List[PatternEntry] = []
+        self._chord_entries: List[PatternEntry] = []
+
+        for scale_key in CHROMATIC_SCALE:
+
+            scale_key_index: int = PITCH_CLASSES[scale_key]
+
+            for scale_type in ScaleTypes:
+
+                scale_mask: int = rotate_mask(mask=scale_masks[scale_type.value], semitones=scale_key_index)
+
+                self._scale_entries.append(PatternEntry(scale_key, scale_type, None, None, scale_mask))
+
+                for chord_type in ChordTypes:
+
+                    chord_masks: List[int] = chord_masks_from_scale_mask(scale_mask=scale_mask,
+                                                                         start_position=scale_key_index,
+                                                                         intervals=chord_intervals[chord_type.value])
+
+                    for chord_degree, chord_mask in zip(chord_degrees[chord_type.value][scale_type.value], chord_masks):
+
+                        self._chord_entries.append(PatternEntry(scale_key, scale_type, chord_type, chord_degree, chord_mask))
+
+        self._scale_supersets: List[Tuple[PatternEntry, ...]] = self._build_superset_table(entries=self._scale_entries)
+        self._chord_supersets: List[Tuple[PatternEntry, ...]] = self._build_superset_table(entries=self._chord_entries)
+
+    @staticmethod
+    def _build_superset_table(entries: Sequence[PatternEntry]
+                              ) -> List[Tuple[PatternEntry, ...]]:
+
+        """
+        Computes, for every pitch class mask, the entries whose mask contains it, by enumerating the submasks of each entry.
+
+        Args:
+
+            entries: The entries to be indexed.
+
+        Returns:
+
+            superset_table: A list, indexed by pitch class mask, containing a tuple of entries.
+
+        """
+
+        superset_lists: List[List[PatternEntry]] = [[] for _ in range(NUM_MASKS)]
+
+        for entry in entries:
+
+            # Walks every submask of the entry mask, including the empty mask
+            submask: int = entry.mask
+
+            while True:
+
+                superset_lists[submask].append(entry)
+
+                if submask == 0:
+
+                    break
+
+                submask = (submask - 1) & entry.mask
+
+        return [tuple(superset_list) for superset_list in superset_lists]
+
+    def find_scales(self,
+                    notes: Iterable[str]
+                    ) -> Tuple[PatternEntry, ...]:
+
+        """
+        Finds every scale containing all of the given notes.
+
+        Args:
+
+            notes: The notes to be contained.
+
+        Returns:
+
+            A tuple of scale entries.
+
+        """
+
+        return self._scale_supersets[notes_to_mask(notes=notes)]
+
+    def find_chords(self,
+                    notes: Iterable[str]
+                    ) -> Tuple[PatternEntry, ...]:
+
+        """
+        Finds every chord containing all of the given notes.
+
+        Args:
+
+            notes: The notes to be contained.
+
+        Returns:
+
+            A tuple of chord entries.
+
+        """
+
+        return self._chord_supersets[notes_to_mask(notes=notes)]
+
+    def find_scales_by_mask(self,
+                            mask: int
+                            ) -> Tuple[PatternEntry, ...]:
+
+        """
+        Finds every scale containing all of the pitch classes in the mask.
+
+        Args:
+
+            mask: An integer pitch class mask.
+
+        Returns:
+
+            A tuple of scale entries.
+
+        """
+
+        return self._scale_supersets[mask]
+
+    def find_chords_by_mask(self,
+                            mask: int
+                            ) -> Tuple[PatternEntry, ...]:
+
+        """
+        Finds every chord containing all of the pitch classes in the mask.
+
+        Args:
+
+            mask: An integer pitch class mask.
+
+        Returns:
+
+            A tuple of chord entries.
+
+        """
+
+        return self._chord_supersets[mask]
+
+    def find_scales_from_positions(self,
+                                   positions: Iterable[Tuple[int, int]],
+                                   tuning: Sequence[str]
+                                   ) -> Tuple[PatternEntry, ...]:
+
+        """
+        Finds every scale containing all of the notes fretted at the given positions.
+
+        Args:
+
+            positions: An iterable of (string index, fret) tuples, with string index 0 being the first note of the tuning.
+            tuning: A sequence containing the root note of each open string.
+
+        Returns:
+
+            A tuple of scale entries.
+
+        """
+
+        return self._scale_supersets[positions_to_mask(positions=positions, tuning=tuning)]
+
+    def find_chords_from_positions(self,
+                                   positions: Iterable[Tuple[int, int]],
+                                   tuning: Sequence[str]
+                                   ) -> Tuple[PatternEntry, ...]:
+
+        """
+        Finds every chord containing all of the notes fretted at the given positions.
+
+        Args:
+
+            positions: An iterable of (string index, fret) tuples, with string index 0 being the first note of the tuning.
+            tuning: A sequence containing the root note of each open string.
+
+        Returns:
+
+            A tuple of chord entries.
+
+        """
+
+        return self._chord_supersets[positions_to_mask(positions=positions, tuning=tuning)]
+
+def positions_to_mask(positions: Iterable[Tuple[int, int]],
+                      tuning: Sequence[str]
+                      ) -> int:
+
+    """
+    A function to convert fretted positions into a pitch class mask under a tuning.
+
+    Args:
+
+        positions: An iterable of (string index, fret) tuples, with string index 0 being the first note of the tuning.
+        tuning: A sequence containing the root note of each open string.
+
+    Return:
+
+        mask: An integer pitch class mask.
+
+    """
+
+    mask: int = 0
+
+    for string_index, fret in positions:
+
+        mask |= 1 << ((PITCH_CLASSES[tuning[string_index]] + fret) % NUM_PITCH_CLASSES)
+
+    return mask
+
+# The process-wide pattern index, built on first use
+_pattern_index: Optional[PatternIndex] = None
+
+def get_pattern_index() -> PatternIndex:
+
+    """
+    A function to retrieve the process-wide pattern index, building it on first use.
+
+    Return:
+
+        The pattern index.
+
+    """
+
+    global _pattern_index
+
+    if _pattern_index is None:
+
+        _pattern_index = PatternIndex()
+
+    return _pattern_index
+
+
+
+if __name__ == "__main__":
+
+    print("--------------------")
+
+    demo_pattern_index = get_pattern_index()
+
+    for demo_entry in demo_pattern_index.find_scales(notes=["C", "Eb", "G"]):
+
+        print(demo_entry.scale_key, demo_entry.scale_type.value)
+
+    print("--------------------")
+
+    for demo_entry in demo_pattern_index.find_chords_from_positions(positions=[(1, 3), (2, 2), (3, 0)], tuning=tunings["e_standard"]):
+
+        print(demo_entry.scale_key, demo_entry.scale_type.value, demo_entry.chord_type.value, demo_entry.chord_degree)
+
+    print("--------------------")
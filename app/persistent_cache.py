@@ -0,0 +1,279 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+from threading import Lock
+from typing import List, Dict, Tuple, Any, Optional
+
+from config.config import CHROMATIC_SCALE, FRETBOARD_LEN
+from app.library.intervals import scale_intervals, chord_intervals, pitch_notations
+from app.library.degrees import chord_degrees
+from app.library.tunings import tunings
+from app.cache import CacheBackend, CacheInfo, LRUCache, MISSING
+
+# Bumped whenever cached values change shape without the library tables changing
+CACHE_FORMAT_VERSION: int = 3
+
+def library_fingerprint() -> str:
+
+    """
+    A function to fingerprint every table that cached values are derived from, so a persistent cache can tell when it is stale.
+
+    Return:
+
+        A hexadecimal digest of the format version, the chromatic scale, the fretboard length and the interval, degree and tuning tables.
+
+    """
+
+    tables: Tuple[Any, ...] = (CACHE_FORMAT_VERSION, CHROMATIC_SCALE, FRETBOARD_LEN, scale_intervals, chord_intervals, pitch_notations, chord_degrees, tunings)
+
+    return hashlib.blake2b(repr(tables).encode(), digest_size=16).hexdigest()
+
+class SQLiteCache(CacheBackend):
+
+    """
+    A persistent cache backend storing pickled values in a local SQLite database, in front of which sits an in-memory cache.
+    The database uses write-ahead logging, so several processes can read it while one writes, and it is emptied when it was written with different library tables.
+    Values that cannot be pickled are kept in memory only. The database must only ever be written by this package, as values are unpickled on read.
+
+    Attributes:
+
+        _path: The path of the database file.
+        _front: The in-memory cache consulted before the database.
+        _timeout: The number of seconds to wait for another process's write lock.
+        _fingerprint: The library fingerprint of the current process.
+        _connection: The database connection, opened on first use in each process.
+        _pid: The id of the process that opened the connection.
+        _stats: A dictionary, keyed by namespace, containing a list of hits and misses.
+        _lock: A lock guarding the connection and statistics.
+
+    """
+
+    def __init__(self,
+                 path: str,
+                 front: Optional[CacheBackend] = None,
+                 timeout: float = 30.0
+                 ) -> None:
+
+        self._path: str = path
+        self._front: CacheBackend = front if front is not None else LRUCache()
+        self._timeout: float = timeout
+        self._fingerprint: str = library_fingerprint()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._stats: Dict[str, List[int]] = {}
+        self._lock: Lock = Lock()
+
+    def get(self,
+            cache_key: Tuple[Any, ...],
+            default: Any = MISSING
+            ) -> Any:
+
+        value: Any = self._front.get(cache_key)
+
+        if value is MISSING:
+
+            with self._lock:
+
+                try:
+
+                    row: Optional[Tuple[bytes]] = self._connect().execute("SELECT value FROM entries WHERE key = ?", (self._digest(cache_key=cache_key),)).fetchone()
+
+                # A database that is locked for longer than the timeout is treated as a miss rather than failing the lookup
+                except sqlite3.OperationalError:
+
+                    row = None
+
+            if row is not None:
+
+                value = pickle.loads(row[0])
+
+                self._front.set(cache_key, value)
+
+        with self._lock:
+
+            stats: List[int] = self._stats.setdefault(cache_key[0], [0, 0])
+
+            if value is MISSING:
+
+                stats[1] += 1
+
+            else:
+
+                stats[0] += 1
+
+        return default if value is MISSING else value
+
+    def set(self,
+            cache_key: Tuple[Any, ...],
+            value: Any
+            ) -> None:
+
+        self._front.set(cache_key, value)
+
+        try:
+
+            data: bytes = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+        except (pickle.PicklingError, TypeError, AttributeError):
+
+            return
+
+        with self._lock:
+
+            try:
+
+                self._connect().execute("INSERT OR REPLACE INTO entries (key, namespace, value) VALUES (?, ?, ?)", (self._digest(cache_key=cache_key), cache_key[0], data))
+
+            except sqlite3.OperationalError:
+
+                pass
+
+    def clear(self) -> None:
+
+        self._front.clear()
+
+        with self._lock:
+
+            self._connect().execute("DELETE FROM entries")
+
+            self._stats.clear()
+
+    def cache_info(self,
+                   namespace: Optional[str] = None
+                   ) -> CacheInfo:
+
+        with self._lock:
+
+            if namespace is not None:
+
+                hits, misses = self._stats.get(namespace, [0, 0])
+
+                currsize, nbytes = self._connect().execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM entries WHERE namespace = ?", (namespace,)).fetchone()
+
+            else:
+
+                hits = sum(stats[0] for stats in self._stats.values())
+
+                misses = sum(stats[1] for stats in self._stats.values())
+
+                currsize, nbytes = self._connect().execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM entries").fetchone()
+
+            return CacheInfo(hits, misses, None, currsize, nbytes)
+
+    def namespaces(self) -> List[str]:
+
+        """
+        Lists every namespace stored in the database or looked up by this process.
+
+        Returns:
+
+            A list of namespaces.
+
+        """
+
+        with self._lock:
+
+            stored: List[str] = [namespace for namespace, in self._connect().execute("SELECT DISTINCT namespace FROM entries")]
+
+            return list(dict.fromkeys([*self._stats, *stored]))
+
+    def close(self) -> None:
+
+        """
+        Closes the database connection. It is reopened if the cache is used again.
+
+        """
+
+        with self._lock:
+
+            if self._connection is not None and self._pid == os.getpid():
+
+                self._connection.close()
+
+            self._connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+
+        """
+        Retrieves the database connection, opening it on first use and again in a forked child. Must be called with the lock held.
+        Opening creates the tables and empties them if they were written with a different library fingerprint.
+
+        """
+
+        if self._connection is not None and self._pid == os.getpid():
+
+            return self._connection
+
+        connection: sqlite3.Connection = sqlite3.connect(self._path, timeout=self._timeout, isolation_level=None, check_same_thread=False)
+
+        connection.execute("PRAGMA journal_mode=WAL")
+
+        connection.execute("PRAGMA synchronous=NORMAL")
+
+        connection.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+        connection.execute("CREATE TABLE IF NOT EXISTS entries (key BLOB PRIMARY KEY, namespace TEXT NOT NULL, value BLOB NOT NULL) WITHOUT ROWID")
+
+        row: Optional[Tuple[str]] = connection.execute("SELECT value FROM meta WHERE name = 'fingerprint'").fetchone()
+
+        if row is None or row[0] != self._fingerprint:
+
+            # The fingerprint is checked again under the write lock, as another process may have just rebuilt the database
+            connection.execute("BEGIN IMMEDIATE")
+
+            row = connection.execute("SELECT value FROM meta WHERE name = 'fingerprint'").fetchone()
+
+            if row is None or row[0] != self._fingerprint:
+
+                connection.execute("DELETE FROM entries")
+
+                connection.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('fingerprint', ?)", (self._fingerprint,))
+
+            connection.execute("COMMIT")
+
+        self._connection = connection
+
+        self._pid = os.getpid()
+
+        return connection
+
+    @staticmethod
+    def _digest(cache_key: Tuple[Any, ...]) -> bytes:
+
+        """
+        Converts a cache key into a database key that is the same in every process, unlike its hash.
+
+        """
+
+        return hashlib.blake2b(repr(cache_key).encode(), digest_size=16).digest()
+
+
+
+if __name__ == "__main__":
+
+    import tempfile
+
+    from app.library.enums import ScaleTypes
+    from app.scale_generator import ScaleGenerator
+
+    print("--------------------")
+
+    with tempfile.TemporaryDirectory() as demo_directory:
+
+        demo_path = os.path.join(demo_directory, "cache.sqlite3")
+
+        demo_scale_generator = ScaleGenerator(cache=SQLiteCache(path=demo_path))
+
+        print(demo_scale_generator.get_or_generate_scale(scale_key="C", scale_type=ScaleTypes.MAJOR_SCALE))
+
+        # A second cache over the same file, standing in for a new process, starts warm
+        demo_cache = SQLiteCache(path=demo_path)
+
+        print(ScaleGenerator(cache=demo_cache).get_or_generate_scale(scale_key="C", scale_type=ScaleTypes.MAJOR_SCALE))
+
+        print(demo_cache.cache_info("ScaleGenerator"))
+
+        demo_cache.close()
+
+    print("--------------------")
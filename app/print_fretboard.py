@@ -1,33 +1,80 @@
-from typing import List, Dict, Optional
+import sys
+from functools import lru_cache
+from typing import List, Dict, Tuple, Optional, NamedTuple, Iterable, TextIO
 
 from config.config import FRETS
 from app.scale_generator import ScaleGenerator
 from app.scale_fretboard import ScaleFretboard
 from app.chord_generator import ChordGenerator
 from app.chord_fretboard import ChordFretboard
+from app.fretboard import Fretboard
 from app.library.enums import ScaleTypes, ChordTypes
 from app.library.tunings import tunings
 from app.library.degrees import chord_degrees
 
-def print_fretboard(strings: Dict[str, List[str]], 
-                    tuning: List[str], 
-                    chord_degree: Optional[str] = None,
-                    fret_marker: Optional[bool] = False
-                    ) -> None:
-    
+# The fret marker line is identical for every fretboard, so it is formatted once
+_FRET_MARKER_LINE: str = str(FRETS)
+
+class FretboardDiagram(NamedTuple):
+
     """
-    A function to print either scale fretboards or chord fretboards to the terminal, in horizontal orientation.
+    A single fretboard to be rendered within a batch.
+
+    Attributes:
+
+        strings: A dictionary containing scale notes mapped to guitar string representations, a nested dictionary containing chord degrees, or their Fretboard equivalents.
+        tuning: A sequence containing the root note of each open string.
+        chord_degree: An optional key to access the nested dictionary containing chord notes mapped to guitar string representations.
+        title: An optional line rendered above the fretboard.
+
+    """
+
+    strings: Dict
+    tuning: Tuple[str, ...]
+    chord_degree: Optional[str] = None
+    title: Optional[str] = None
+
+@lru_cache(maxsize=4096)
+def _format_row(row: Tuple[str, ...]) -> str:
+
+    """
+    A function to format a guitar string representation as a single line, reusing the line for identical strings.
+
+    Args:
+
+        row: A tuple of formatted notes.
+
+    Return:
+
+        The formatted line.
+
+    """
+
+    return str(list(row))
+
+def _fretboard_lines(strings: Dict,
+                     tuning: Iterable[str],
+                     chord_degree: Optional[str] = None,
+                     fret_marker: Optional[bool] = False
+                     ) -> List[str]:
+
+    """
+    A function to build the lines of a fretboard, highest string first, without writing them.
 
     Args:
 
         strings: A dictionary containing scale notes mapped to guitar string representations, or a nested dictionary containing chord degrees.
-        tuning: A list containing the root note of each open string.
+        tuning: A sequence containing the root note of each open string.
         chord_degree: An optional parameter to access the nested dictionary containing chord notes mapped to guitar string representations.
-        fret_marker: An optional list of numbers printed beneath the fretboard.
-    
+        fret_marker: An optional list of numbers rendered beneath the fretboard.
+
+    Return:
+
+        lines: A list of lines.
+
     """
 
-    if chord_degree:
+    if chord_degree and not isinstance(strings, Fretboard):
 
         fretboard = strings.get(chord_degree)
 
@@ -35,61 +82,221 @@ def print_fretboard(strings: Dict[str, List[str]],
 
         fretboard = strings
 
-    for root_note in tuning[::-1]:
+    # Fretboards are indexed by string number, so repeated open notes each keep their own line
+    if isinstance(fretboard, Fretboard):
 
-        string = fretboard.get(root_note)
+        lines: List[str] = [_format_row(tuple(fretboard.string(string_index=string_index))) for string_index in reversed(range(fretboard.num_strings))]
+
+        if fret_marker:
+
+            lines.append(_fret_marker_line(num_frets=fretboard.num_frets, capo=fretboard.capo))
+
+        return lines
+
+    rows: List[Tuple[str, ...]] = [tuple(fretboard.get(root_note)) for root_note in tuple(tuning)[::-1]]
+
+    lines = [_format_row(row) for row in rows]
+
+    # Frets are numbered at the width of the formatted notes, which double accidentals widen
+    width: int = len(rows[0][0]) if rows and rows[0] else 2
 
-        print(string)
-    
     if fret_marker:
 
-        _print_fret_marker()
+        lines.append(_FRET_MARKER_LINE if width == 2 else _fret_marker_line(num_frets=len(rows[0]), capo=0, width=width))
+
+    return lines
+
+@lru_cache(maxsize=64)
+def _fret_marker_line(num_frets: int,
+                      capo: int,
+                      width: int = 2
+                      ) -> str:
+
+    """
+    A function to format the fret numbers beneath a fretboard of any length, numbered from the capo.
+
+    Args:
+
+        num_frets: The number of frets.
+        capo: The fret the capo is placed on, 0 for none.
+        width: The width of each formatted note above the fret numbers.
+
+    Return:
+
+        The formatted line.
+
+    """
+
+    return str([f"{capo + fret:<{width}}" for fret in range(num_frets)])
 
-def _print_fret_marker() -> None:
+def render_fretboard(stream: TextIO,
+                     strings: Dict,
+                     tuning: Iterable[str],
+                     chord_degree: Optional[str] = None,
+                     fret_marker: Optional[bool] = False
+                     ) -> None:
 
     """
-    A function to print a list of numbers representing the frets of the fretboard.
+    A function to render either a scale fretboard or a chord fretboard into a text stream with a single write, in horizontal orientation.
+
+    Args:
+
+        stream: The text stream or buffer to be written to.
+        strings: A dictionary containing scale notes mapped to guitar string representations, or a nested dictionary containing chord degrees.
+        tuning: A sequence containing the root note of each open string.
+        chord_degree: An optional parameter to access the nested dictionary containing chord notes mapped to guitar string representations.
+        fret_marker: An optional list of numbers rendered beneath the fretboard.
+
+    """
+
+    lines: List[str] = _fretboard_lines(strings=strings, tuning=tuning, chord_degree=chord_degree, fret_marker=fret_marker)
+
+    lines.append("")
+
+    stream.write("\n".join(lines))
+
+def render_fretboards(stream: TextIO,
+                      diagrams: Iterable[FretboardDiagram],
+                      columns: int = 1,
+                      fret_marker: Optional[bool] = False,
+                      separator: str = "   "
+                      ) -> None:
+
+    """
+    A function to render any number of fretboards into a text stream in one pass, as a grid with the given number of columns.
+    Each grid row is joined in memory and written once, so the stream receives one write per row of diagrams.
+
+    Args:
+
+        stream: The text stream or buffer to be written to.
+        diagrams: An iterable of fretboard diagrams, consumed lazily.
+        columns: The number of fretboards rendered side by side.
+        fret_marker: An optional list of numbers rendered beneath each fretboard.
+        separator: The text placed between fretboards in the same grid row.
+
+    """
+
+    grid_row: List[List[str]] = []
+
+    for diagram in diagrams:
+
+        lines: List[str] = _fretboard_lines(strings=diagram.strings, tuning=diagram.tuning, chord_degree=diagram.chord_degree, fret_marker=fret_marker)
+
+        if diagram.title is not None:
+
+            lines.insert(0, diagram.title)
+
+        grid_row.append(lines)
+
+        if len(grid_row) == columns:
+
+            stream.write(_join_grid_row(grid_row=grid_row, separator=separator))
+
+            grid_row = []
+
+    if grid_row:
+
+        stream.write(_join_grid_row(grid_row=grid_row, separator=separator))
+
+def _join_grid_row(grid_row: List[List[str]],
+                   separator: str
+                   ) -> str:
+
+    """
+    A function to join the lines of fretboards placed side by side, padding shorter fretboards and narrower lines.
+
+    Args:
+
+        grid_row: A list containing the lines of each fretboard.
+        separator: The text placed between fretboards.
+
+    Return:
+
+        The joined grid row, followed by a blank line.
+
+    """
+
+    if len(grid_row) == 1:
+
+        return "\n".join(grid_row[0]) + "\n\n"
+
+    height: int = max(len(lines) for lines in grid_row)
+
+    widths: List[int] = [max(len(line) for line in lines) for lines in grid_row]
+
+    rows: List[str] = [separator.join(f"{lines[index] if index < len(lines) else '':<{width}}" for lines, width in zip(grid_row, widths)).rstrip() for index in range(height)]
+
+    return "\n".join(rows) + "\n\n"
+
+def print_fretboard(strings: Dict, 
+                    tuning: List[str], 
+                    chord_degree: Optional[str] = None,
+                    fret_marker: Optional[bool] = False
+                    ) -> None:
+    
+    """
+    A function to print either scale fretboards or chord fretboards to the terminal, in horizontal orientation.
+
+    Args:
+
+        strings: A dictionary containing scale notes mapped to guitar string representations, or a nested dictionary containing chord degrees.
+        tuning: A list containing the root note of each open string.
+        chord_degree: An optional parameter to access the nested dictionary containing chord notes mapped to guitar string representations.
+        fret_marker: An optional list of numbers printed beneath the fretboard.
     
     """
 
-    print(FRETS)
+    render_fretboard(stream=sys.stdout, strings=strings, tuning=tuning, chord_degree=chord_degree, fret_marker=fret_marker)
+
+def main() -> None:
+
+    """
+    A function to demonstrate a scale fretboard and a chord fretboard, printed to the terminal.
+
+    """
+
+    # generate_cache_key("ScaleGenerator", scale_key, scale_mask)
+    scale_generator = ScaleGenerator()
+
+    scale_notes = scale_generator.get_or_generate_scale(scale_key="D", scale_type=ScaleTypes.NATURAL_MINOR)
+
+    print(f"scale_notes: {scale_notes}")
+
+    print("--------------------")
 
-# generate_cache_key("ScaleGenerator", scale_key, scale_type.value)
-scale_generator = ScaleGenerator()
+    # generate_cache_key("ScaleFretboard", scale_mask, tuning)
+    scale_fretboard = ScaleFretboard()
 
-scale_notes = scale_generator.get_or_generate_scale(scale_key="D", scale_type=ScaleTypes.NATURAL_MINOR)
+    scale_strings = scale_fretboard.get_or_generate_scale_strings(scale_notes=scale_notes, scale_type=ScaleTypes.NATURAL_MINOR, tuning=tunings["e_standard"])
 
-print(f"scale_notes: {scale_notes}")
+    print(f"scale_strings: {scale_strings}")
 
-print("--------------------")
+    print_fretboard(strings=scale_strings, chord_degree=None, tuning=tunings["e_standard"], fret_marker=True)
 
-# generate_cache_key("ScaleFretboard", scale_notes[0], scale_type.value, tuning)
-scale_fretboard = ScaleFretboard()
+    print("--------------------")
 
-scale_strings = scale_fretboard.get_or_generate_scale_strings(scale_notes=scale_notes, scale_type=ScaleTypes.NATURAL_MINOR, tuning=tunings["e_standard"])
+    # generate_cache_key("ChordGenerator", scale_notes[0], scale_mask, chord_type.value, chord_degrees)
+    chord_generator = ChordGenerator()
 
-print(f"scale_strings: {scale_strings}")
+    chord_notes = chord_generator.get_or_generate_chord(scale_notes=scale_notes, scale_type=ScaleTypes.NATURAL_MINOR, chord_type=ChordTypes.SEVENTH)
 
-print_fretboard(strings=scale_strings, chord_degree=None, tuning=tunings["e_standard"], fret_marker=True)
+    print(f"chord_notes: {chord_notes}")
 
-print("--------------------")
+    print("--------------------")
 
-# generate_cache_key("ChordGenerator", scale_notes[0], scale_type.value, chord_type.value)
-chord_generator = ChordGenerator()
+    # generate_cache_key("ChordFretboard", chord_notes, tuning)
+    chord_fretboard = ChordFretboard()
 
-chord_notes = chord_generator.get_or_generate_chord(scale_notes=scale_notes, scale_type=ScaleTypes.NATURAL_MINOR, chord_type=ChordTypes.SEVENTH)
+    chord_strings = chord_fretboard.get_or_generate_chord_strings(scale_notes=scale_notes, scale_type=ScaleTypes.NATURAL_MINOR, chord_notes=chord_notes, chord_type=ChordTypes.SEVENTH, tuning=tunings["e_standard"])
 
-print(f"chord_notes: {chord_notes}")
+    print(f"chord_strings: {chord_strings}")
 
-print("--------------------")
+    print_fretboard(strings=chord_strings, chord_degree=chord_degrees["seventh"]["natural_minor"][0], tuning=tunings["e_standard"], fret_marker=True)
 
-# generate_cache_key("ChordFretboard", scale_notes[0], scale_type.value, chord_type.value, tuning)
-chord_fretboard = ChordFretboard()
+    print("--------------------")
 
-chord_strings = chord_fretboard.get_or_generate_chord_strings(scale_notes=scale_notes, scale_type=ScaleTypes.NATURAL_MINOR, chord_notes=chord_notes, chord_type=ChordTypes.SEVENTH, tuning=tunings["e_standard"])
 
-print(f"chord_strings: {chord_strings}")
 
-print_fretboard(strings=chord_strings, chord_degree=chord_degrees["seventh"]["natural_minor"][0], tuning=tunings["e_standard"], fret_marker=True)
+if __name__ == "__main__":
 
-print("--------------------")
+    main()
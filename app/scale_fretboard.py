@@ -1,10 +1,14 @@
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional, Sequence
 
-from config.config import CHROMATIC_SCALE, FRETBOARD_LEN
+from config.config import CHROMATIC_SCALE, PITCH_CLASSES, FRETBOARD_LEN
 from app.library.tunings import tunings
 from app.library.enums import ScaleTypes
 from app.scale_generator import ScaleGenerator
-from app.utils import generate_string, generate_cache_key, get_or_generate
+from app.cache import CacheBackend, get_default_cache, cache_info
+from app.values import FretboardStrings
+from app.fretboard import Fretboard, get_or_generate_fretboard
+from app.spelling import spelled_chromatic_scale
+from app.utils import generate_string, generate_cache_key, get_or_generate, notes_to_mask
 
 class ScaleFretboard:
 
@@ -16,85 +20,132 @@ class ScaleFretboard:
         _fretboard_len: The length of the fretboard.
         _frets: A range object, representing the fret positions on the fretboard.
         _chromatic_scale: The twelve note chromatic scale.
-        _scale_string_cache: A dictionary, keyed by a tuple of scale key, scale type and tuning, containing a nested dictionary with root notes as keys and scale note string representations as values.
+        _scale_string_cache: A cache backend, shared process-wide unless one is supplied, keyed by a tuple of spelled scale notes in pitch class order and tuning, containing immutable fretboard strings with root notes as keys and scale note string representations as values.
     
     """
 
-    def __init__(self):
+    def __init__(self,
+                 cache: Optional[CacheBackend] = None
+                 ) -> None:
 
         self._fretboard_len: int = FRETBOARD_LEN
         self._frets: range = range(FRETBOARD_LEN)
         self._chromatic_scale: List[str] = CHROMATIC_SCALE
-        self._scale_string_cache: Dict[Tuple[str, str, str, Tuple[str, ...]], Dict[str, List[str]]] = {}
+        self._scale_string_cache: CacheBackend = cache if cache is not None else get_default_cache()
 
     def get_or_generate_scale_strings(self,
-                                      scale_notes: List[str],
+                                      scale_notes: Sequence[str],
                                       scale_type: ScaleTypes,
                                       tuning: List[str]
-                                      ) -> Dict[str, List[str]]:
+                                      ) -> FretboardStrings:
         
         """ 
-        Retrieves scale strings from the cache, based on the scale notes, scale type and tuning.
-        If unavailable, generates scale strings and stores them in the cache.
+        Retrieves scale strings from the cache, based on the spelled scale notes and tuning.
+        If unavailable, generates scale strings and stores them in the cache, so scales with the same notes, such as relative major and minor scales, share one entry.
         
         Args:
 
-            scale_notes: A list containing the scale notes.
-            scale_type: The name of the scale type.
+            scale_notes: A sequence containing the scale notes.
+            scale_type: The name of the scale type, which does not affect the scale strings.
             tuning: A list containing the root note of each open string.
 
         Returns:
 
-            scale_strings: A dictionary containing root notes as keys and scale note string representations as values.
+            scale_strings: Immutable fretboard strings containing root notes as keys and tuples of formatted scale notes as values, shared with every caller.
 
         """
 
-        cache_key: Tuple[str, str, str, Tuple[str, ...]] = generate_cache_key("ScaleFretboard", scale_notes[0], scale_type.value, tuning)
+        # Notes are sorted by pitch class rather than collected into a set, as the key must repr identically in every process
+        cache_key: Tuple[str, Tuple[str, ...], Tuple[str, ...]] = generate_cache_key("ScaleFretboard", tuple(sorted(scale_notes, key=PITCH_CLASSES.__getitem__)), tuple(tuning))
 
-        scale_strings: Dict[str, List[str]] = get_or_generate(cache=self._scale_string_cache, 
-                                                              cache_key=cache_key, 
-                                                              generate_function=lambda: self._compute_scale_strings(scale_notes=scale_notes, tuning=tuning))
+        scale_strings: FretboardStrings = get_or_generate(cache=self._scale_string_cache, 
+                                                          cache_key=cache_key, 
+                                                          generate_function=lambda: self._compute_scale_strings(scale_notes=scale_notes, tuning=tuning),
+                                                          pattern=(scale_type,))
 
         return scale_strings
 
+    def get_or_generate_fretboard(self,
+                                  scale_notes: Sequence[str],
+                                  scale_type: ScaleTypes,
+                                  tuning: List[str],
+                                  num_frets: Optional[int] = None,
+                                  capo: int = 0
+                                  ) -> Fretboard:
+        
+        """ 
+        Retrieves a string indexed scale fretboard from the cache, based on the scale mask, tuning, number of frets and capo.
+        If unavailable, generates the fretboard and stores it in the cache, shared with every scale or chord of the same pitch classes.
+        Unlike the scale strings, every string of the tuning is kept, including repeated open notes.
+        
+        Args:
+
+            scale_notes: A sequence containing the scale notes.
+            scale_type: The name of the scale type.
+            tuning: A list containing the root note of each open string.
+            num_frets: The number of frets per string, defaulting to the fretboard length.
+            capo: The fret the capo is placed on, 0 for none.
+
+        Returns:
+
+            fretboard: A fretboard indexed by string number.
+
+        """
+
+        num_frets = num_frets if num_frets is not None else self._fretboard_len
+
+        fretboard: Fretboard = get_or_generate_fretboard(mask=notes_to_mask(notes=scale_notes), 
+                                                         tuning=tuning, 
+                                                         num_frets=num_frets, 
+                                                         capo=capo, 
+                                                         cache=self._scale_string_cache)
+
+        return fretboard
+
     def _compute_scale_strings(self,
-                               scale_notes: List[str],
+                               scale_notes: Sequence[str],
                                tuning: List[str]
-                               ) -> Dict[str, List[str]]:
+                               ) -> FretboardStrings:
         
         """
-        Computes guitar string representations containing scale notes and blank spaces for notes that do not exist in the scale.
+        Computes guitar string representations containing scale notes, spelled as they are in the scale, and blank spaces for notes that do not exist in the scale.
 
         Args:
 
-            scale_notes: A list containing the scale notes.
+            scale_notes: A sequence containing the scale notes.
             tuning: A list containing the root note of each open string.
 
         Returns:
 
-            scale_string_dict: A dictionary containing root notes as keys and scale note string representations as values.
+            Immutable fretboard strings containing root notes as keys and scale note string representations as values.
         
         """
 
         # Defines the dictionary to be returned
         scale_string_dict: Dict[str, List[str]] = {}
 
+        # Reduces the scale notes to a pitch class mask
+        scale_mask: int = notes_to_mask(notes=scale_notes)
+
+        # Respells the chromatic scale with the scale notes
+        note_sequence: List[str] = spelled_chromatic_scale(notes=scale_notes)
+
         # Generates a scale string for each root note in the tuning
         for root_note in tuning:
         
-            # String root note index position in the chromatic scale
-            root_index: int = self._chromatic_scale.index(root_note)
+            # String root note pitch class
+            root_index: int = PITCH_CLASSES[root_note]
 
             # Computes scale string from the chromatic scale starting at the root index
             scale_string: List[str] = generate_string(start_position=root_index, 
-                                                      note_sequence=self._chromatic_scale, 
-                                                      scale_or_chord=scale_notes, 
+                                                      note_sequence=note_sequence, 
+                                                      scale_or_chord=scale_mask, 
                                                       frets=self._frets)
 
             # Stores scale string in the dictionary to be returned
             scale_string_dict[root_note] = scale_string
 
-        return scale_string_dict
+        return FretboardStrings(scale_string_dict)
 
 
 
@@ -118,6 +169,6 @@ if __name__ == "__main__":
 
     print("--------------------")
 
-    print(demo_scale_fretboard._scale_string_cache)
+    print(cache_info("ScaleFretboard"))
 
     print("--------------------")
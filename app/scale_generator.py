@@ -1,9 +1,12 @@
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
 
-from config.config import CHROMATIC_SCALE
-from app.library.intervals import scale_intervals
+from config.config import CHROMATIC_SCALE, NOTE_SPELLINGS
+from app.library.masks import scale_masks
 from app.library.enums import ScaleTypes
-from app.utils import generate_sequence_from_intervals, generate_cache_key, get_or_generate
+from app.cache import CacheBackend, LRUCache, get_default_cache, cache_info
+from app.utils import generate_cache_key, get_or_generate, rotate_mask, mask_to_notes
+from app.values import Scale
+from app.spelling import spell_scale
 
 class ScaleGenerator:
 
@@ -13,53 +16,69 @@ class ScaleGenerator:
     Attributes:
 
         _chromatic_scale: The twelve note chromatic scale.
-        _scale_notes_cache: A dictionary to store a tuple of scale key and scale type as keys and scale notes as values.
+        _pitch_classes: A dictionary containing notes of the chromatic scale as keys and their pitch classes as values.
+        _scale_notes_cache: A cache backend to store a tuple of scale key and scale mask as keys and scale notes as values, shared process-wide unless one is supplied.
     
     """
 
     def __init__(self,
-                 chromatic_scale: List[str] = CHROMATIC_SCALE
+                 chromatic_scale: List[str] = CHROMATIC_SCALE,
+                 cache: Optional[CacheBackend] = None
                  ) -> None:
 
         self._chromatic_scale: List[str] = chromatic_scale
-        self._scale_notes_cache: Dict[Tuple[str, str], List[str]] = {}
+        self._pitch_classes: Dict[str, int] = {note: index for index, note in enumerate(chromatic_scale)}
+
+        # A custom chromatic scale names notes differently, so it cannot share the process-wide cache
+        if cache is None:
+
+            cache = get_default_cache() if chromatic_scale is CHROMATIC_SCALE else LRUCache()
+
+        self._scale_notes_cache: CacheBackend = cache
 
     def get_or_generate_scale(self, 
                               scale_key: str,
                               scale_type: ScaleTypes
-                              ) -> List[str]:
+                              ) -> Scale:
         
         """
-        Generates a unique cache key, and then retrieves scale notes from the cache, based on the scale key and scale type.
-        If unavailable, generates scale notes and stores them in the cache.
+        Generates a unique cache key, and then retrieves scale notes from the cache, based on the scale key and the scale mask of the scale type.
+        If unavailable, generates scale notes and stores them in the cache, so scale types with the same intervals share one entry.
 
         Args:
 
-            scale_key: The root note of the scale.
+            scale_key: The root note of the scale, in any enharmonic spelling such as C#, Db or D♭.
             scale_type: The name of the scale type.
 
         Returns:
 
-            scale_notes: A list containing the scale notes.
+            scale_notes: An immutable scale containing the scale notes.
         
         """
 
-        cache_key: Tuple[str, str, str] = generate_cache_key("ScaleGenerator", scale_key, scale_type.value)
+        # Normalises the scale key through the interned spelling map, unless notes are named by a custom chromatic scale
+        if self._chromatic_scale is CHROMATIC_SCALE:
 
-        scale_notes: List[str] = get_or_generate(cache=self._scale_notes_cache, 
-                                                 cache_key=cache_key, 
-                                                 generate_function=lambda: self._compute_scale_notes(scale_key=scale_key, 
-                                                                                                     scale_type=scale_type))
+            scale_key = NOTE_SPELLINGS[scale_key]
+
+        cache_key: Tuple[str, str, int] = generate_cache_key("ScaleGenerator", scale_key, scale_masks[scale_type.value])
+
+        scale_notes: Scale = get_or_generate(cache=self._scale_notes_cache, 
+                                             cache_key=cache_key, 
+                                             generate_function=lambda: self._compute_scale_notes(scale_key=scale_key, 
+                                                                                                 scale_type=scale_type),
+                                             pattern=(scale_type,))
     
         return scale_notes
 
     def _compute_scale_notes(self,
                              scale_key: str,
                              scale_type: ScaleTypes
-                             ) -> List[str]:
+                             ) -> Scale:
         
         """
-        Computes scale notes from scale intervals, based on the scale key and scale type.
+        Computes scale notes based on the scale key and scale type, spelled from the precomputed spelling table so that each degree takes its own letter name.
+        A custom chromatic scale names the notes itself, so its scale notes are rendered from the scale mask instead.
 
         Args:
 
@@ -68,20 +87,25 @@ class ScaleGenerator:
 
         Returns:
 
-            scale_notes: A list containing the scale notes.
+            scale_notes: An immutable scale containing the scale notes.
         
         """
 
-        # Scale key index position in the chromatic scale
-        scale_key_index: int = self._chromatic_scale.index(scale_key)
+        # Looks up the spelled scale notes, one per degree
+        if self._chromatic_scale is CHROMATIC_SCALE:
+
+            return Scale(spell_scale(scale_key=scale_key, scale_type=scale_type.value))
+
+        # Scale key pitch class
+        scale_key_index: int = self._pitch_classes[scale_key]
 
-        # Accesses scale intervals dictionary
-        intervals: List[int] = scale_intervals[scale_type.value]
+        # Transposes the root relative scale mask to the scale key
+        scale_mask: int = rotate_mask(mask=scale_masks[scale_type.value], semitones=scale_key_index)
 
-        # Computes scale notes from scale intervals via the chromatic scale
-        scale_notes: List[str] = generate_sequence_from_intervals(start_position=scale_key_index, 
-                                                                  note_sequence=self._chromatic_scale, 
-                                                                  intervals=intervals)
+        # Renders scale notes from the scale mask, beginning at the scale key
+        scale_notes: Scale = Scale(mask_to_notes(mask=scale_mask, 
+                                                 start_position=scale_key_index, 
+                                                 note_sequence=self._chromatic_scale))
 
         return scale_notes
 
@@ -99,6 +123,6 @@ if __name__ == "__main__":
 
     print("--------------------")
 
-    print(demo_scale_generator._scale_notes_cache)
+    print(cache_info("ScaleGenerator"))
 
     print("--------------------")
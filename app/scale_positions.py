@@ -0,0 +1,466 @@
+from typing import List, Dict, Tuple, Optional, Sequence, Iterator, Callable, Any
+
+from config.config import PITCH_CLASSES, FRETBOARD_LEN, NUM_PITCH_CLASSES
+from app.library.tunings import tunings
+from app.library.positions import position_systems
+from app.library.enums import ScaleTypes, PositionSystems
+from app.scale_generator import ScaleGenerator
+from app.cache import CacheBackend, LazySequence, get_default_cache
+from app.utils import generate_cache_key, get_or_generate, notes_to_mask, mask_to_pitch_classes
+
+# A position holds the ascending frets played on each string, from the first note of the tuning upwards
+Position = Tuple[Tuple[int, ...], ...]
+
+class ScalePositions:
+
+    """
+    A class to generate box positions of a scale, such as three notes per string, four fret box and CAGED positions, from scale notes.
+    Each position plays consecutive scale notes across the strings, with a fingering chosen to minimise stretches and position shifts.
+    CAGED positions move the open position box of each of the C, A, G, E and D chord shapes up the neck until it is rooted on the scale key, so they are only defined for tunings with the string intervals of standard tuning.
+
+    Attributes:
+
+        _num_frets: The number of frets, including the open string, available to positions.
+        _position_cache: A cache backend, shared process-wide unless one is supplied, keyed by a tuple of scale mask, tuning, position system and number of frets, containing lazily generated positions.
+
+    """
+
+    def __init__(self,
+                 num_frets: int = FRETBOARD_LEN,
+                 cache: Optional[CacheBackend] = None
+                 ) -> None:
+
+        self._num_frets: int = num_frets
+        self._position_cache: CacheBackend = cache if cache is not None else get_default_cache()
+
+    def get_or_generate_positions(self,
+                                  scale_notes: Sequence[str],
+                                  tuning: Sequence[str],
+                                  position_system: PositionSystems = PositionSystems.THREE_NOTES_PER_STRING
+                                  ) -> LazySequence:
+
+        """
+        Retrieves scale positions from the cache, based on the scale mask, tuning and position system, and the scale key for shape systems such as CAGED.
+        If unavailable, starts a lazy search whose positions are generated as they are read, and stores it in the cache, so every mode of a scale shares one entry unless the positions are placed by the key.
+
+        Args:
+
+            scale_notes: A sequence containing the scale notes.
+            tuning: A sequence containing the root note of each open string, each string sounding above the one before it.
+            position_system: The name of the position system.
+
+        Returns:
+
+            positions: A lazy sequence of positions, one per scale degree on the first string, or one per chord shape, in fret order.
+
+        """
+
+        if not supports_tuning(position_system=position_system, tuning=tuning):
+
+            raise ValueError(f"{position_system.value} positions are only defined for tunings with the string intervals {position_systems[position_system.value]['string_intervals']}, got {tuple(tuning)}")
+
+        rules: Dict[str, Any] = dict(position_systems[position_system.value])
+
+        shapes: Optional[Tuple[str, ...]] = rules.pop("shapes", None)
+
+        rules.pop("string_intervals", None)
+
+        scale_mask: int = notes_to_mask(notes=scale_notes)
+
+        # Shapes are placed by the scale key, which the scale mask does not hold
+        root_pitch_class: Optional[int] = PITCH_CLASSES[scale_notes[0]] if shapes is not None else None
+
+        cache_key: Tuple = generate_cache_key("ScalePositions", scale_mask, tuple(tuning), position_system.value, self._num_frets, root_pitch_class)
+
+        generate_function: Callable[[], LazySequence]
+
+        if shapes is None:
+
+            generate_function = lambda: LazySequence(self._compute_positions(scale_mask=scale_mask, tuning=tuning, **rules))
+
+        else:
+
+            generate_function = lambda: LazySequence(self._compute_shape_positions(scale_mask=scale_mask, root_pitch_class=root_pitch_class, tuning=tuning, shapes=shapes, **rules))
+
+        positions: LazySequence = get_or_generate(cache=self._position_cache,
+                                                  cache_key=cache_key,
+                                                  generate_function=generate_function)
+
+        return positions
+
+    def _compute_positions(self,
+                           scale_mask: int,
+                           tuning: Sequence[str],
+                           notes_per_string: Tuple[int, ...],
+                           max_stretch: int,
+                           box_span: Optional[int]
+                           ) -> Iterator[Position]:
+
+        """
+        Computes a position beginning on each scale note of the first string within the first twelve frets, skipping any that cannot be fingered and any whose notes another position already plays.
+
+        Args:
+
+            scale_mask: The pitch class mask of the scale.
+            tuning: A sequence containing the root note of each open string.
+            notes_per_string: The numbers of notes a string may take.
+            max_stretch: The largest distance in frets between the notes of one string.
+            box_span: The largest distance in frets between any two notes of the position, or None for no limit.
+
+        Returns:
+
+            An iterator of positions.
+
+        """
+
+        open_pitches: List[int] = _open_string_pitches(tuning=tuning)
+
+        num_notes: int = len(tuning) * max(notes_per_string)
+
+        kept: List[Position] = []
+
+        # Neighbouring boxes can differ by a single dropped note, so each position waits for the next before it is kept
+        pending: Optional[Position] = None
+
+        for first_fret in sorted((pitch_class - open_pitches[0]) % NUM_PITCH_CLASSES for pitch_class in mask_to_pitch_classes(mask=scale_mask)):
+
+            if first_fret >= self._num_frets:
+
+                continue
+
+            # The box reaches one fret behind the first note, for the index finger
+            low_fret: int = max(first_fret - 1, 0) if box_span is not None else 0
+
+            high_fret: int = min(low_fret + box_span if box_span is not None else self._num_frets - 1, self._num_frets - 1)
+
+            position: Optional[Position] = _box_position(scale_mask=scale_mask,
+                                                         open_pitches=open_pitches,
+                                                         first_fret=first_fret,
+                                                         num_notes=num_notes,
+                                                         notes_per_string=notes_per_string,
+                                                         max_stretch=max_stretch,
+                                                         low_fret=low_fret,
+                                                         high_fret=high_fret)
+
+            if position is None or any(_covers(position=kept_position, other=position) for kept_position in kept) or (pending is not None and _covers(position=pending, other=position)):
+
+                continue
+
+            if pending is not None and not _covers(position=position, other=pending):
+
+                kept.append(pending)
+
+                yield pending
+
+            pending = position
+
+        if pending is not None:
+
+            yield pending
+
+    def _compute_shape_positions(self,
+                                 scale_mask: int,
+                                 root_pitch_class: int,
+                                 tuning: Sequence[str],
+                                 shapes: Tuple[str, ...],
+                                 notes_per_string: Tuple[int, ...],
+                                 max_stretch: int,
+                                 box_span: int
+                                 ) -> Iterator[Position]:
+
+        """
+        Computes a position for each chord shape, by moving the shape's open position box up the neck until the shape's chord root lands on the scale key.
+        The nut of the open position becomes the lowest fret of the box, so a shape rooted within the first twelve frets is played there, and open shapes keep their open strings.
+
+        Args:
+
+            scale_mask: The pitch class mask of the scale.
+            root_pitch_class: The pitch class of the scale key.
+            tuning: A sequence containing the root note of each open string, with the string intervals of standard tuning.
+            shapes: The root notes of the open chord shapes.
+            notes_per_string: The numbers of notes a string may take.
+            max_stretch: The largest distance in frets between the notes of one string.
+            box_span: The largest distance in frets between any two notes of the position.
+
+        Returns:
+
+            An iterator of positions, in fret order.
+
+        """
+
+        open_pitches: List[int] = _open_string_pitches(tuning=tuning)
+
+        num_notes: int = len(tuning) * max(notes_per_string)
+
+        # The highest string stands in for the high E string of standard tuning, so lowered and raised tunings move every shape with it
+        tuning_offset: int = (open_pitches[-1] - PITCH_CLASSES["E"]) % NUM_PITCH_CLASSES
+
+        for low_fret in sorted((root_pitch_class - PITCH_CLASSES[shape] - tuning_offset) % NUM_PITCH_CLASSES for shape in shapes):
+
+            high_fret: int = min(low_fret + box_span, self._num_frets - 1)
+
+            # The box begins on the lowest scale note of the first string at or above the nut of the shape
+            first_fret: int = min(low_fret + (pitch_class - open_pitches[0] - low_fret) % NUM_PITCH_CLASSES for pitch_class in mask_to_pitch_classes(mask=scale_mask))
+
+            if first_fret > high_fret:
+
+                continue
+
+            position: Optional[Position] = _box_position(scale_mask=scale_mask,
+                                                         open_pitches=open_pitches,
+                                                         first_fret=first_fret,
+                                                         num_notes=num_notes,
+                                                         notes_per_string=notes_per_string,
+                                                         max_stretch=max_stretch,
+                                                         low_fret=low_fret,
+                                                         high_fret=high_fret)
+
+            if position is not None:
+
+                yield position
+
+def supports_tuning(position_system: PositionSystems,
+                    tuning: Sequence[str]
+                    ) -> bool:
+
+    """
+    A function to test whether a position system is defined for a tuning.
+    Shape systems need the string intervals of the tuning they were defined on across the highest strings, with any strings added below a fourth apart, as on seven and eight string guitars.
+
+    Args:
+
+        position_system: The name of the position system.
+        tuning: A sequence containing the root note of each open string.
+
+    Return:
+
+        True if the position system can place positions on the tuning.
+
+    """
+
+    string_intervals: Optional[Tuple[int, ...]] = position_systems[position_system.value].get("string_intervals")
+
+    if string_intervals is None:
+
+        return True
+
+    open_pitches: List[int] = _open_string_pitches(tuning=tuning)
+
+    intervals: Tuple[int, ...] = tuple(high - low for low, high in zip(open_pitches, open_pitches[1:]))
+
+    num_added: int = len(intervals) - len(string_intervals)
+
+    return num_added >= 0 and intervals[num_added:] == string_intervals and all(interval == string_intervals[0] for interval in intervals[:num_added])
+
+def _box_position(scale_mask: int,
+                  open_pitches: Sequence[int],
+                  first_fret: int,
+                  num_notes: int,
+                  notes_per_string: Tuple[int, ...],
+                  max_stretch: int,
+                  low_fret: int,
+                  high_fret: int
+                  ) -> Optional[Position]:
+
+    """
+    A function to finger the consecutive scale notes that ascend from a fret of the first string, within a box of frets.
+
+    Args:
+
+        scale_mask: The pitch class mask of the scale.
+        open_pitches: The absolute pitches of the open strings.
+        first_fret: The fret of the first note on the first string.
+        num_notes: The largest number of notes the position may hold.
+        notes_per_string: The numbers of notes a string may take.
+        max_stretch: The largest distance in frets between the notes of one string.
+        low_fret: The lowest fret of the box.
+        high_fret: The highest fret of the box.
+
+    Return:
+
+        The position with the lowest cost, or None if no fingering fits.
+
+    """
+
+    # Absolute pitches of consecutive scale notes, ascending from the first note
+    first_pitch: int = open_pitches[0] + first_fret
+
+    pitches: List[int] = [pitch for pitch in range(first_pitch, first_pitch + num_notes * NUM_PITCH_CLASSES) if scale_mask >> (pitch % NUM_PITCH_CLASSES) & 1][:num_notes]
+
+    return _optimise_fingering(pitches=pitches,
+                               open_pitches=open_pitches,
+                               notes_per_string=notes_per_string,
+                               max_stretch=max_stretch,
+                               low_fret=low_fret,
+                               high_fret=high_fret)
+
+def _covers(position: Position,
+            other: Position
+            ) -> bool:
+
+    """
+    A function to test whether a position plays every note of another, on the same strings and frets.
+
+    Args:
+
+        position: The covering position.
+        other: The position that may be covered.
+
+    Return:
+
+        True if every fret of the other position is in the position.
+
+    """
+
+    return all(set(frets) <= set(position_frets) for frets, position_frets in zip(other, position))
+
+def _open_string_pitches(tuning: Sequence[str]) -> List[int]:
+
+    """
+    A function to place the open strings of a tuning in ascending pitch, each string sounding above the one before it by less than an octave.
+
+    Args:
+
+        tuning: A sequence containing the root note of each open string.
+
+    Return:
+
+        A list of absolute pitches in semitones, the first string being its pitch class.
+
+    """
+
+    open_pitches: List[int] = [PITCH_CLASSES[tuning[0]]]
+
+    for root_note in tuning[1:]:
+
+        open_pitches.append(open_pitches[-1] + ((PITCH_CLASSES[root_note] - open_pitches[-1]) % NUM_PITCH_CLASSES or NUM_PITCH_CLASSES))
+
+    return open_pitches
+
+def _optimise_fingering(pitches: Sequence[int],
+                        open_pitches: Sequence[int],
+                        notes_per_string: Tuple[int, ...],
+                        max_stretch: int,
+                        low_fret: int,
+                        high_fret: int
+                        ) -> Optional[Position]:
+
+    """
+    A function to split consecutive scale notes across the strings, playing as many notes as the box allows while minimising the stretch on each string plus the shift between the first notes of neighbouring strings.
+    The frets of a string are fixed by the notes it takes, so the search is a dynamic programme over the string and the index of its first note, with at most one state per pair.
+
+    Args:
+
+        pitches: The absolute pitches of consecutive scale notes, ascending from the first note of the position.
+        open_pitches: The absolute pitches of the open strings.
+        notes_per_string: The numbers of notes a string may take.
+        max_stretch: The largest distance in frets between the notes of one string.
+        low_fret: The lowest fret of the box.
+        high_fret: The highest fret of the box.
+
+    Return:
+
+        The position with the lowest cost, or None if no fingering fits.
+
+    """
+
+    num_strings: int = len(open_pitches)
+
+    # Lowest cost and note count of the strings from a string upwards, keyed by the string and the index of its first note
+    # Costs compare the negated number of notes first, so a fuller position always wins over a shorter one with less stretch
+    best: Dict[Tuple[int, int], Optional[Tuple[Tuple[int, int], int]]] = {}
+
+    def solve(string_index: int,
+              note_index: int
+              ) -> Optional[Tuple[Tuple[int, int], int]]:
+
+        state: Tuple[int, int] = (string_index, note_index)
+
+        if state in best:
+
+            return best[state]
+
+        first_fret: int = pitches[note_index] - open_pitches[string_index]
+
+        result: Optional[Tuple[Tuple[int, int], int]] = None
+
+        for num_notes in notes_per_string:
+
+            if note_index + num_notes > len(pitches):
+
+                continue
+
+            last_fret: int = pitches[note_index + num_notes - 1] - open_pitches[string_index]
+
+            if first_fret < low_fret or last_fret > high_fret or last_fret - first_fret > max_stretch:
+
+                continue
+
+            cost: Tuple[int, int] = (-num_notes, last_fret - first_fret)
+
+            if string_index + 1 < num_strings:
+
+                if note_index + num_notes >= len(pitches):
+
+                    continue
+
+                remainder: Optional[Tuple[Tuple[int, int], int]] = solve(string_index + 1, note_index + num_notes)
+
+                if remainder is None:
+
+                    continue
+
+                shift: int = abs(pitches[note_index + num_notes] - open_pitches[string_index + 1] - first_fret)
+
+                cost = (cost[0] + remainder[0][0], cost[1] + shift + remainder[0][1])
+
+            if result is None or cost < result[0]:
+
+                result = (cost, num_notes)
+
+        best[state] = result
+
+        return result
+
+    if solve(0, 0) is None:
+
+        return None
+
+    # Follows the chosen note counts back up the strings
+    position: List[Tuple[int, ...]] = []
+
+    note_index: int = 0
+
+    for string_index in range(num_strings):
+
+        num_notes: int = best[(string_index, note_index)][1]
+
+        position.append(tuple(pitch - open_pitches[string_index] for pitch in pitches[note_index:note_index + num_notes]))
+
+        note_index += num_notes
+
+    return tuple(position)
+
+
+
+if __name__ == "__main__":
+
+    print("--------------------")
+
+    demo_scale_generator = ScaleGenerator()
+
+    demo_scale_notes = demo_scale_generator.get_or_generate_scale(scale_key="G", scale_type=ScaleTypes.MAJOR_SCALE)
+
+    print(demo_scale_notes)
+
+    print("--------------------")
+
+    demo_scale_positions = ScalePositions()
+
+    for demo_position_system in PositionSystems:
+
+        for demo_position in demo_scale_positions.get_or_generate_positions(scale_notes=demo_scale_notes, tuning=tunings["e_standard"], position_system=demo_position_system):
+
+            print(demo_position_system.value, demo_position)
+
+        print("--------------------")
@@ -0,0 +1,529 @@
+import argparse
+import asyncio
+import hashlib
+import json
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import List, Dict, Tuple, Any, Optional, Callable
+from urllib.parse import urlsplit, parse_qs
+
+from app.library.intervals import scale_intervals
+from app.library.tunings import tunings
+from app.library.enums import ScaleTypes, ChordTypes
+from app.cache import LRUCache
+from app.scale_generator import ScaleGenerator
+from app.chord_generator import ChordGenerator
+from app.scale_fretboard import ScaleFretboard
+from app.chord_fretboard import ChordFretboard
+from app.utils import generate_cache_key, get_or_generate, determine_pattern_type
+from app.values import Scale, ChordSet, to_json
+
+# Batches larger than this are rejected rather than queued
+MAX_BATCH_SIZE: int = 10000
+
+# Request bodies larger than this are rejected before being read
+MAX_BODY_BYTES: int = 8 * 1024 * 1024
+
+_STATUS_REASONS: Dict[int, str] = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+class RequestError(Exception):
+
+    """
+    An error caused by the client, reported with an HTTP status code.
+
+    Attributes:
+
+        status: The HTTP status code.
+
+    """
+
+    def __init__(self,
+                 status: int,
+                 message: str
+                 ) -> None:
+
+        super().__init__(message)
+
+        self.status: int = status
+
+class FretboardService:
+
+    """
+    A class to answer scale, chord, fretboard and pattern identification queries as JSON compatible data, using the generator classes.
+
+    Attributes:
+
+        _scale_generator: The scale generator.
+        _chord_generator: The chord generator.
+        _scale_fretboard: The scale fretboard generator.
+        _chord_fretboard: The chord fretboard generator.
+        _endpoints: A dictionary containing endpoint paths as keys and handler methods as values.
+
+    """
+
+    def __init__(self) -> None:
+
+        self._scale_generator: ScaleGenerator = ScaleGenerator()
+        self._chord_generator: ChordGenerator = ChordGenerator()
+        self._scale_fretboard: ScaleFretboard = ScaleFretboard()
+        self._chord_fretboard: ChordFretboard = ChordFretboard()
+        self._endpoints: Dict[str, Callable[[Dict[str, str]], Any]] = {
+
+            "/scale": self.scale,
+            "/chord": self.chord,
+            "/scale_fretboard": self.scale_fretboard,
+            "/chord_fretboard": self.chord_fretboard,
+            "/identify": self.identify
+
+        }
+
+    def handle(self,
+               path: str,
+               params: Dict[str, str]
+               ) -> Any:
+
+        """
+        Dispatches a query to its endpoint.
+
+        Args:
+
+            path: The endpoint path.
+            params: A dictionary containing query parameter names as keys and values as values.
+
+        Returns:
+
+            The JSON compatible result.
+
+        """
+
+        handler: Optional[Callable[[Dict[str, str]], Any]] = self._endpoints.get(path)
+
+        if handler is None:
+
+            raise RequestError(404, f"Unknown endpoint {path}")
+
+        try:
+
+            return handler(params)
+
+        except (KeyError, ValueError, IndexError) as error:
+
+            raise RequestError(400, f"Invalid parameters: {error}") from error
+
+    def _scale_notes(self,
+                     params: Dict[str, str]
+                     ) -> Tuple[Scale, ScaleTypes]:
+
+        scale_type: ScaleTypes = ScaleTypes(params["scale_type"])
+
+        return self._scale_generator.get_or_generate_scale(scale_key=params["key"], scale_type=scale_type), scale_type
+
+    def scale(self,
+              params: Dict[str, str]
+              ) -> Dict[str, Any]:
+
+        """
+        Answers /scale?key=&scale_type= with the scale notes.
+
+        """
+
+        scale_notes, _ = self._scale_notes(params=params)
+
+        return {"scale_notes": scale_notes}
+
+    def chord(self,
+              params: Dict[str, str]
+              ) -> Dict[str, Any]:
+
+        """
+        Answers /chord?key=&scale_type=&chord_type= with the chord notes of every degree.
+
+        """
+
+        scale_notes, scale_type = self._scale_notes(params=params)
+
+        chord_notes: ChordSet = self._chord_generator.get_or_generate_chord(scale_notes=scale_notes, scale_type=scale_type, chord_type=ChordTypes(params["chord_type"]))
+
+        return {"chord_notes": chord_notes}
+
+    def scale_fretboard(self,
+                        params: Dict[str, str]
+                        ) -> Dict[str, Any]:
+
+        """
+        Answers /scale_fretboard?key=&scale_type=&tuning= with the scale strings.
+
+        """
+
+        scale_notes, scale_type = self._scale_notes(params=params)
+
+        tuning: Tuple[str, ...] = tunings[params.get("tuning", "e_standard")]
+
+        return {"tuning": tuning, "scale_strings": self._scale_fretboard.get_or_generate_scale_strings(scale_notes=scale_notes, scale_type=scale_type, tuning=tuning)}
+
+    def chord_fretboard(self,
+                        params: Dict[str, str]
+                        ) -> Dict[str, Any]:
+
+        """
+        Answers /chord_fretboard?key=&scale_type=&chord_type=&tuning= with the chord strings of every degree.
+
+        """
+
+        scale_notes, scale_type = self._scale_notes(params=params)
+
+        chord_type: ChordTypes = ChordTypes(params["chord_type"])
+
+        chord_notes: ChordSet = self._chord_generator.get_or_generate_chord(scale_notes=scale_notes, scale_type=scale_type, chord_type=chord_type)
+
+        tuning: Tuple[str, ...] = tunings[params.get("tuning", "e_standard")]
+
+        return {"tuning": tuning, "chord_strings": self._chord_fretboard.get_or_generate_chord_strings(scale_notes=scale_notes, scale_type=scale_type, chord_notes=chord_notes, chord_type=chord_type, tuning=tuning)}
+
+    def identify(self,
+                 params: Dict[str, str]
+                 ) -> Dict[str, Any]:
+
+        """
+        Answers /identify?notes=C,E,G with the scale type matching the notes, the first note being the root.
+
+        """
+
+        notes: List[str] = [note for note in params["notes"].split(",") if note]
+
+        if not notes:
+
+            raise ValueError("notes must not be empty")
+
+        return {"notes": notes, "pattern_type": determine_pattern_type(note_sequence=notes, interval_sequence=scale_intervals)}
+
+# One service per process, so batch workers reuse their own warm caches
+_process_service: Optional[FretboardService] = None
+
+def validate_query(query: Any) -> Tuple[str, Dict[str, str]]:
+
+    """
+    A function to check the shape of a batch query before it is answered, so that only client mistakes are reported as malformed queries.
+
+    Args:
+
+        query: A decoded batch query.
+
+    Return:
+
+        A tuple of endpoint path and query parameters.
+
+    """
+
+    if not isinstance(query, dict):
+
+        raise RequestError(400, "Malformed query: expected a JSON object")
+
+    endpoint: Any = query.get("endpoint")
+
+    if not isinstance(endpoint, str):
+
+        raise RequestError(400, "Malformed query: endpoint must be a string")
+
+    params: Any = query.get("params", {})
+
+    if not isinstance(params, dict) or not all(isinstance(value, str) for value in params.values()):
+
+        raise RequestError(400, "Malformed query: params must be an object of strings")
+
+    return endpoint, params
+
+def run_batch(queries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+
+    """
+    A function to answer a batch of queries, run in a worker process away from the event loop.
+
+    Args:
+
+        queries: A list of dictionaries, each with an "endpoint" path and a "params" dictionary.
+
+    Return:
+
+        A list of results, each either {"result": ...} or {"error": ..., "status": ...}, with status 500 for queries that failed on the server.
+
+    """
+
+    global _process_service
+
+    if _process_service is None:
+
+        _process_service = FretboardService()
+
+    results: List[Dict[str, Any]] = []
+
+    for query in queries:
+
+        try:
+
+            endpoint, params = validate_query(query=query)
+
+            results.append({"result": _process_service.handle(path=endpoint, params=params)})
+
+        except RequestError as error:
+
+            results.append({"error": str(error), "status": error.status})
+
+        # One failing query must not fail the rest of the batch
+        except Exception as error:
+
+            results.append({"error": f"Internal error: {type(error).__name__}", "status": 500})
+
+    return results
+
+class FretboardServer:
+
+    """
+    A class to serve FretboardService over HTTP/1.1 with asyncio, caching GET responses with ETags and running batches in an executor.
+
+    Attributes:
+
+        _service: The service answering single queries on the event loop.
+        _executor: The executor that runs batch queries.
+        _response_cache: A cache backend, keyed by request target, containing a tuple of ETag and response body.
+
+    """
+
+    def __init__(self,
+                 executor: Optional[Executor] = None,
+                 response_cache_entries: int = 4096
+                 ) -> None:
+
+        self._service: FretboardService = FretboardService()
+        self._executor: Executor = executor if executor is not None else ProcessPoolExecutor()
+        self._response_cache: LRUCache = LRUCache(max_entries=response_cache_entries)
+
+    async def serve(self,
+                    host: str = "127.0.0.1",
+                    port: int = 8000
+                    ) -> None:
+
+        """
+        Serves requests until cancelled.
+
+        Args:
+
+            host: The interface to listen on.
+            port: The port to listen on.
+
+        """
+
+        server: asyncio.AbstractServer = await asyncio.start_server(self._handle_connection, host=host, port=port)
+
+        async with server:
+
+            await server.serve_forever()
+
+    async def _handle_connection(self,
+                                 reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter
+                                 ) -> None:
+
+        """
+        Answers requests on one connection until the client closes it or asks for it to be closed.
+
+        """
+
+        try:
+
+            while True:
+
+                request_line: bytes = await reader.readline()
+
+                if not request_line:
+
+                    break
+
+                method, target, version = request_line.decode("latin-1").split()
+
+                headers: Dict[str, str] = {}
+
+                while True:
+
+                    header_line: bytes = await reader.readline()
+
+                    if header_line in (b"\r\n", b"\n", b""):
+
+                        break
+
+                    name, _, value = header_line.decode("latin-1").partition(":")
+
+                    headers[name.strip().lower()] = value.strip()
+
+                content_length: int = int(headers.get("content-length", "0"))
+
+                if content_length > MAX_BODY_BYTES:
+
+                    writer.write(self._response(status=413, body=self._error_body(message="Request body too large"), keep_alive=False))
+
+                    break
+
+                body: bytes = await reader.readexactly(content_length) if content_length else b""
+
+                keep_alive: bool = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+
+                status, response_body, etag = await self._dispatch(method=method, target=target, body=body, if_none_match=headers.get("if-none-match"))
+
+                writer.write(self._response(status=status, body=response_body, keep_alive=keep_alive, etag=etag))
+
+                await writer.drain()
+
+                if not keep_alive:
+
+                    break
+
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+
+            pass
+
+        finally:
+
+            writer.close()
+
+    async def _dispatch(self,
+                        method: str,
+                        target: str,
+                        body: bytes,
+                        if_none_match: Optional[str]
+                        ) -> Tuple[int, bytes, Optional[str]]:
+
+        """
+        Routes a request, serving GET responses from the response cache where possible.
+
+        Returns:
+
+            A tuple of status code, response body and ETag.
+
+        """
+
+        split_target = urlsplit(target)
+
+        try:
+
+            if split_target.path == "/batch":
+
+                if method != "POST":
+
+                    raise RequestError(405, "/batch only accepts POST")
+
+                queries: Any = json.loads(body or b"[]")
+
+                if not isinstance(queries, list) or len(queries) > MAX_BATCH_SIZE:
+
+                    raise RequestError(400, f"/batch expects a JSON list of at most {MAX_BATCH_SIZE} queries")
+
+                results: List[Dict[str, Any]] = await asyncio.get_running_loop().run_in_executor(self._executor, run_batch, queries)
+
+                return 200, json.dumps(results, default=to_json).encode(), None
+
+            if method != "GET":
+
+                raise RequestError(405, f"{split_target.path} only accepts GET")
+
+            params: Dict[str, str] = {name: values[-1] for name, values in parse_qs(split_target.query).items()}
+
+            cache_key: Tuple[str, str, Tuple[Tuple[str, str], ...]] = generate_cache_key("FretboardServer", split_target.path, tuple(sorted(params.items())))
+
+            etag, response_body = get_or_generate(cache=self._response_cache,
+                                                  cache_key=cache_key,
+                                                  generate_function=lambda: self._render(path=split_target.path, params=params))
+
+            if if_none_match is not None and etag in (tag.strip() for tag in if_none_match.split(",")):
+
+                return 304, b"", etag
+
+            return 200, response_body, etag
+
+        except RequestError as error:
+
+            return error.status, self._error_body(message=str(error)), None
+
+        except json.JSONDecodeError as error:
+
+            return 400, self._error_body(message=f"Invalid JSON: {error}"), None
+
+        # Any other failure is the server's, answered rather than dropping the connection
+        except Exception as error:
+
+            return 500, self._error_body(message=f"Internal error: {type(error).__name__}"), None
+
+    def _render(self,
+                path: str,
+                params: Dict[str, str]
+                ) -> Tuple[str, bytes]:
+
+        """
+        Answers a GET query and serialises it, computing its ETag from the body.
+
+        Returns:
+
+            A tuple of ETag and response body.
+
+        """
+
+        response_body: bytes = json.dumps(self._service.handle(path=path, params=params), default=to_json).encode()
+
+        return f'"{hashlib.blake2b(response_body, digest_size=16).hexdigest()}"', response_body
+
+    @staticmethod
+    def _error_body(message: str) -> bytes:
+
+        return json.dumps({"error": message}).encode()
+
+    @staticmethod
+    def _response(status: int,
+                  body: bytes,
+                  keep_alive: bool,
+                  etag: Optional[str] = None
+                  ) -> bytes:
+
+        """
+        Serialises an HTTP/1.1 response.
+
+        """
+
+        header_lines: List[str] = [f"HTTP/1.1 {status} {_STATUS_REASONS.get(status, '')}",
+                                   f"Content-Length: {len(body)}",
+                                   f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+
+        if status != 304:
+
+            header_lines.append("Content-Type: application/json")
+
+        if etag is not None:
+
+            header_lines.append(f"ETag: {etag}")
+
+        return ("\r\n".join(header_lines) + "\r\n\r\n").encode("latin-1") + body
+
+def main(argv: Optional[List[str]] = None) -> None:
+
+    """
+    A function to run the HTTP service from the command line.
+
+    """
+
+    parser = argparse.ArgumentParser(description="Scale, chord and fretboard JSON service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=None, help="Batch worker processes, defaulting to the CPU count")
+    args = parser.parse_args(argv)
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+
+        try:
+
+            asyncio.run(FretboardServer(executor=executor).serve(host=args.host, port=args.port))
+
+        except KeyboardInterrupt:
+
+            pass
+
+
+
+if __name__ == "__main__":
+
+    main()
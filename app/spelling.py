@@ -0,0 +1,207 @@
+from typing import List, Dict, Tuple, Optional, Sequence
+
+from config.config import CHROMATIC_SCALE, NUM_PITCH_CLASSES, LETTER_NAMES, NATURAL_PITCH_CLASSES, ACCIDENTALS, PITCH_CLASSES, NOTE_SPELLINGS
+from app.library.intervals import scale_intervals
+from app.utils import get_or_build_table
+
+# Accidentals keyed by the number of semitones they raise a natural note
+_ACCIDENTAL_NAMES: Dict[int, str] = {offset: accidental for accidental, offset in ACCIDENTALS.items()}
+
+# Scale keys with a precomputed spelling, each natural, sharp and flat letter name
+SPELLED_KEYS: List[str] = [NOTE_SPELLINGS[letter + accidental] for letter in LETTER_NAMES for accidental in ("", "#", "b")]
+
+def spell_note(pitch_class: int,
+               letter: str
+               ) -> str:
+
+    """
+    A function to name a pitch class with a given letter, falling back to the chromatic scale spelling if more than a double accidental would be needed.
+
+    Args:
+
+        pitch_class: The pitch class to be named.
+        letter: The letter name the note must be spelled with.
+
+    Return:
+
+        The note name.
+
+    """
+
+    # Signed distance from the natural note to the pitch class, between -6 and 5 semitones
+    offset: int = (pitch_class - NATURAL_PITCH_CLASSES[letter] + NUM_PITCH_CLASSES // 2) % NUM_PITCH_CLASSES - NUM_PITCH_CLASSES // 2
+
+    accidental: Optional[str] = _ACCIDENTAL_NAMES.get(offset)
+
+    return NOTE_SPELLINGS[letter + accidental] if accidental is not None else CHROMATIC_SCALE[pitch_class]
+
+def spell_intervals(scale_key: str,
+                    intervals: Sequence[int],
+                    interval_sequence: Dict[str, Tuple[int, ...]] = scale_intervals
+                    ) -> Tuple[str, ...]:
+
+    """
+    A function to spell a scale from its key and intervals, so that each note takes the letter name its degree calls for.
+    Seven note scales use each letter once, beginning with the letter of the scale key.
+    Other scales borrow the spelling of their parent scale, the major scale if they contain a major third and the natural minor scale otherwise.
+
+    Args:
+
+        scale_key: The root note of the scale, in any spelling accepted by NOTE_SPELLINGS.
+        intervals: The scale intervals.
+        interval_sequence: The dictionary containing the major and natural minor scale intervals.
+
+    Return:
+
+        A tuple containing the spelled scale notes, one per degree.
+
+    """
+
+    scale_key = NOTE_SPELLINGS[scale_key]
+
+    root_pitch_class: int = PITCH_CLASSES[scale_key]
+
+    letter_index: int = LETTER_NAMES.index(scale_key[0])
+
+    if len(intervals) == len(LETTER_NAMES):
+
+        return tuple(spell_note(pitch_class=(root_pitch_class + interval) % NUM_PITCH_CLASSES, letter=LETTER_NAMES[(letter_index + degree) % len(LETTER_NAMES)])
+                     for degree, interval in enumerate(intervals))
+
+    # The parent is the major scale if the scale contains a major third
+    parent_type: str = "major_scale" if 4 in intervals else "natural_minor"
+
+    parent_spelling: Dict[int, str] = {PITCH_CLASSES[note]: note for note in spell_intervals(scale_key=scale_key, intervals=interval_sequence[parent_type], interval_sequence=interval_sequence)}
+
+    return tuple(parent_spelling.get((root_pitch_class + interval) % NUM_PITCH_CLASSES, CHROMATIC_SCALE[(root_pitch_class + interval) % NUM_PITCH_CLASSES]) for interval in intervals)
+
+def build_spelling_table(interval_sequence: Dict[str, Tuple[int, ...]]
+                         ) -> Dict[Tuple[str, str], Tuple[str, ...]]:
+
+    """
+    A function to precompute the spelling of every scale type in every natural, sharp and flat key.
+
+    Args:
+
+        interval_sequence: The dictionary containing scale intervals.
+
+    Return:
+
+        spelling_table: A dictionary, keyed by a tuple of scale key and scale type, containing the spelled scale notes indexed by degree.
+
+    """
+
+    spelling_table: Dict[Tuple[str, str], Tuple[str, ...]] = {}
+
+    for scale_key in SPELLED_KEYS:
+
+        for scale_type, intervals in interval_sequence.items():
+
+            spelling_table[(scale_key, scale_type)] = spell_intervals(scale_key=scale_key, intervals=intervals, interval_sequence=interval_sequence)
+
+    return spelling_table
+
+def get_spelling_table(interval_sequence: Dict[str, Tuple[int, ...]] = scale_intervals
+                       ) -> Dict[Tuple[str, str], Tuple[str, ...]]:
+
+    """
+    A function to retrieve the spelling table for an interval dictionary, building it on first use.
+
+    Args:
+
+        interval_sequence: The dictionary containing scale intervals.
+
+    Return:
+
+        spelling_table: A dictionary, keyed by a tuple of scale key and scale type, containing the spelled scale notes indexed by degree.
+
+    """
+
+    spelling_table: Dict[Tuple[str, str], Tuple[str, ...]] = get_or_build_table(build_spelling_table, interval_sequence)
+
+    return spelling_table
+
+def spell_scale(scale_key: str,
+                scale_type: str,
+                interval_sequence: Dict[str, Tuple[int, ...]] = scale_intervals
+                ) -> Tuple[str, ...]:
+
+    """
+    A function to look up the spelled notes of a scale. Keys outside the precomputed table, such as double sharps, are spelled on demand and added to it.
+
+    Args:
+
+        scale_key: The root note of the scale, in any spelling accepted by NOTE_SPELLINGS.
+        scale_type: The name of the scale type.
+        interval_sequence: The dictionary containing scale intervals.
+
+    Return:
+
+        A tuple containing the spelled scale notes, one per degree.
+
+    """
+
+    spelling_table: Dict[Tuple[str, str], Tuple[str, ...]] = get_spelling_table(interval_sequence=interval_sequence)
+
+    scale_notes: Optional[Tuple[str, ...]] = spelling_table.get((scale_key, scale_type))
+
+    if scale_notes is None:
+
+        scale_key = NOTE_SPELLINGS[scale_key]
+
+        scale_notes = spelling_table.get((scale_key, scale_type))
+
+        if scale_notes is None:
+
+            scale_notes = spelling_table[(scale_key, scale_type)] = spell_intervals(scale_key=scale_key, intervals=interval_sequence[scale_type], interval_sequence=interval_sequence)
+
+    return scale_notes
+
+def spelled_chromatic_scale(notes: Sequence[str]) -> List[str]:
+
+    """
+    A function to respell the chromatic scale with the spelling of some scale notes or chord notes, for rendering guitar strings.
+
+    Args:
+
+        notes: The scale notes or chord notes.
+
+    Return:
+
+        The chromatic scale itself if every note already uses its spelling, otherwise a copy with those notes substituted.
+
+    """
+
+    if all(CHROMATIC_SCALE[PITCH_CLASSES[note]] == note for note in notes):
+
+        return CHROMATIC_SCALE
+
+    chromatic_scale: List[str] = list(CHROMATIC_SCALE)
+
+    for note in notes:
+
+        chromatic_scale[PITCH_CLASSES[note]] = note
+
+    return chromatic_scale
+
+
+
+if __name__ == "__main__":
+
+    print("--------------------")
+
+    for demo_scale_key in ("F", "D", "Db", "F#", "Gb", "c♯"):
+
+        print(demo_scale_key, spell_scale(scale_key=demo_scale_key, scale_type="major_scale"))
+
+    print("--------------------")
+
+    print(spell_scale(scale_key="A", scale_type="pentatonic_minor"), spell_scale(scale_key="Eb", scale_type="pentatonic_major"))
+
+    print(spell_scale(scale_key="G#", scale_type="harmonic_minor"))
+
+    print("--------------------")
+
+    print(spelled_chromatic_scale(notes=spell_scale(scale_key="E", scale_type="major_scale")))
+
+    print("--------------------")
@@ -0,0 +1,227 @@
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Sequence
+
+from config.config import CACHE_MAX_ENTRIES
+from app.library.tunings import tunings
+from app.library.enums import ScaleTypes, ChordTypes
+from app.cache import CacheBackend, SingleFlightCache
+from app.scale_generator import ScaleGenerator
+from app.chord_generator import ChordGenerator
+from app.scale_fretboard import ScaleFretboard
+from app.chord_fretboard import ChordFretboard
+from app.fretboard import Fretboard
+from app.values import Scale, ChordSet, FretboardStrings
+
+class ThreadSafeGenerators:
+
+    """
+    A class to share the scale, chord and fretboard generators between threads, such as the workers of a threaded web server.
+    Every generator stores its results in one single flight cache, so threads that miss on the same cache key at once wait on a single computation rather than each repeating it, and cached results are read without a lock.
+
+    Attributes:
+
+        _cache: The single flight cache shared by the generators.
+        _scale_generator: The scale generator.
+        _chord_generator: The chord generator.
+        _scale_fretboard: The scale fretboard generator.
+        _chord_fretboard: The chord fretboard generator.
+
+    """
+
+    def __init__(self,
+                 backend: Optional[CacheBackend] = None,
+                 max_entries: Optional[int] = CACHE_MAX_ENTRIES
+                 ) -> None:
+
+        self._cache: SingleFlightCache = SingleFlightCache(backend=backend, max_entries=max_entries)
+        self._scale_generator: ScaleGenerator = ScaleGenerator(cache=self._cache)
+        self._chord_generator: ChordGenerator = ChordGenerator(cache=self._cache)
+        self._scale_fretboard: ScaleFretboard = ScaleFretboard(cache=self._cache)
+        self._chord_fretboard: ChordFretboard = ChordFretboard(cache=self._cache)
+
+    @property
+    def cache(self) -> SingleFlightCache:
+
+        return self._cache
+
+    def get_or_generate_scale(self,
+                              scale_key: str,
+                              scale_type: ScaleTypes
+                              ) -> Scale:
+
+        """
+        Retrieves scale notes, as ScaleGenerator.get_or_generate_scale.
+
+        Args:
+
+            scale_key: The root note of the scale.
+            scale_type: The name of the scale type.
+
+        Returns:
+
+            An immutable scale containing the scale notes.
+
+        """
+
+        return self._scale_generator.get_or_generate_scale(scale_key=scale_key, scale_type=scale_type)
+
+    def get_or_generate_chord(self,
+                              scale_notes: Sequence[str],
+                              scale_type: ScaleTypes,
+                              chord_type: ChordTypes
+                              ) -> ChordSet:
+
+        """
+        Retrieves chord notes, as ChordGenerator.get_or_generate_chord.
+
+        Args:
+
+            scale_notes: A sequence containing the scale notes.
+            scale_type: The name of the scale type.
+            chord_type: The name of the chord type.
+
+        Returns:
+
+            An immutable chord set containing chord degrees as keys and chord notes as values.
+
+        """
+
+        return self._chord_generator.get_or_generate_chord(scale_notes=scale_notes, scale_type=scale_type, chord_type=chord_type)
+
+    def get_or_generate_scale_strings(self,
+                                      scale_notes: Sequence[str],
+                                      scale_type: ScaleTypes,
+                                      tuning: List[str]
+                                      ) -> FretboardStrings:
+
+        """
+        Retrieves scale note strings, as ScaleFretboard.get_or_generate_scale_strings.
+
+        Args:
+
+            scale_notes: A sequence containing the scale notes.
+            scale_type: The name of the scale type.
+            tuning: A list containing the root note of each open string.
+
+        Returns:
+
+            Immutable fretboard strings containing root notes as keys and scale note string representations as values.
+
+        """
+
+        return self._scale_fretboard.get_or_generate_scale_strings(scale_notes=scale_notes, scale_type=scale_type, tuning=tuning)
+
+    def get_or_generate_fretboard(self,
+                                  scale_notes: Sequence[str],
+                                  scale_type: ScaleTypes,
+                                  tuning: List[str],
+                                  num_frets: Optional[int] = None,
+                                  capo: int = 0
+                                  ) -> Fretboard:
+
+        """
+        Retrieves a scale fretboard, as ScaleFretboard.get_or_generate_fretboard.
+
+        Args:
+
+            scale_notes: A sequence containing the scale notes.
+            scale_type: The name of the scale type.
+            tuning: A list containing the root note of each open string.
+            num_frets: The number of frets per string, defaulting to the fretboard length.
+            capo: The fret the capo is placed on, 0 for none.
+
+        Returns:
+
+            A fretboard indexed by string number.
+
+        """
+
+        return self._scale_fretboard.get_or_generate_fretboard(scale_notes=scale_notes, scale_type=scale_type, tuning=tuning, num_frets=num_frets, capo=capo)
+
+    def get_or_generate_chord_strings(self,
+                                      scale_notes: Sequence[str],
+                                      scale_type: ScaleTypes,
+                                      chord_notes: Mapping,
+                                      chord_type: ChordTypes,
+                                      tuning: List[str]
+                                      ) -> FretboardStrings:
+
+        """
+        Retrieves chord note strings, as ChordFretboard.get_or_generate_chord_strings.
+
+        Args:
+
+            scale_notes: A sequence containing the scale notes.
+            scale_type: The name of the scale type.
+            chord_notes: A dictionary containing chord degrees as keys and chord notes as values.
+            chord_type: The name of the chord type.
+            tuning: A list containing the root note of each open string.
+
+        Returns:
+
+            Immutable fretboard strings, keyed by chord degree, containing nested fretboard strings with root notes as keys and chord note string representations as values.
+
+        """
+
+        return self._chord_fretboard.get_or_generate_chord_strings(scale_notes=scale_notes, scale_type=scale_type, chord_notes=chord_notes, chord_type=chord_type, tuning=tuning)
+
+    def get_or_generate_chord_fretboards(self,
+                                         scale_notes: Sequence[str],
+                                         scale_type: ScaleTypes,
+                                         chord_notes: Mapping,
+                                         chord_type: ChordTypes,
+                                         tuning: List[str],
+                                         num_frets: Optional[int] = None,
+                                         capo: int = 0
+                                         ) -> Dict[str, Fretboard]:
+
+        """
+        Retrieves chord fretboards, as ChordFretboard.get_or_generate_chord_fretboards.
+
+        Args:
+
+            scale_notes: A sequence containing the scale notes.
+            scale_type: The name of the scale type.
+            chord_notes: A dictionary containing chord degrees as keys and chord notes as values.
+            chord_type: The name of the chord type.
+            tuning: A list containing the root note of each open string.
+            num_frets: The number of frets per string, defaulting to the fretboard length.
+            capo: The fret the capo is placed on, 0 for none.
+
+        Returns:
+
+            A dictionary containing chord degrees as keys and fretboards indexed by string number as values.
+
+        """
+
+        return self._chord_fretboard.get_or_generate_chord_fretboards(scale_notes=scale_notes, scale_type=scale_type, chord_notes=chord_notes, chord_type=chord_type, tuning=tuning, num_frets=num_frets, capo=capo)
+
+
+
+if __name__ == "__main__":
+
+    print("--------------------")
+
+    demo_generators = ThreadSafeGenerators()
+
+    def demo_request(demo_index: int) -> ChordSet:
+
+        demo_scale_notes = demo_generators.get_or_generate_scale(scale_key="A", scale_type=ScaleTypes.HARMONIC_MINOR)
+
+        demo_chord_notes = demo_generators.get_or_generate_chord(scale_notes=demo_scale_notes, scale_type=ScaleTypes.HARMONIC_MINOR, chord_type=ChordTypes.SEVENTH)
+
+        demo_generators.get_or_generate_chord_strings(scale_notes=demo_scale_notes, scale_type=ScaleTypes.HARMONIC_MINOR, chord_notes=demo_chord_notes, chord_type=ChordTypes.SEVENTH, tuning=tunings["e_standard"])
+
+        return demo_chord_notes
+
+    # Sixteen threads ask for the same cold results at once, and each result is computed once
+    with ThreadPoolExecutor(max_workers=16) as demo_executor:
+
+        demo_results = list(demo_executor.map(demo_request, range(16)))
+
+    print(demo_results[0])
+
+    print(demo_generators.cache.cache_info(), "shared:", demo_generators.cache.shared)
+
+    print("--------------------")
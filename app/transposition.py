@@ -0,0 +1,337 @@
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import List, Dict, Tuple, Any, Sequence
+
+from config.config import CHROMATIC_SCALE, PITCH_CLASSES, NUM_PITCH_CLASSES, LETTER_NAMES, NOTE_SPELLINGS
+from app.library.enums import ScaleTypes, ChordTypes
+from app.scale_generator import ScaleGenerator
+from app.chord_generator import ChordGenerator
+from app.values import Scale, Chord, ChordSet, FretboardStrings
+from app.fretboard import Fretboard, get_or_generate_fretboard
+from app.spelling import spell_note
+from app.utils import rotate_mask, note_width
+
+# The blank space standing in for a fret whose note is not in the scale or chord
+_BLANK_FRET: str = "__"
+
+# Every width a formatted note may be padded to, up to the widest double accidental
+_NOTE_WIDTHS: range = range(len(_BLANK_FRET), note_width(note_sequence=list(PITCH_CLASSES)) + 1)
+
+def transposition_interval(from_key: str,
+                           to_key: str
+                           ) -> Tuple[int, int]:
+
+    """
+    A function to measure the interval between two keys, both in semitones and in letter names, so that transposed notes keep their spelling.
+
+    Args:
+
+        from_key: The key being transposed from.
+        to_key: The key being transposed to.
+
+    Return:
+
+        A tuple of the number of semitones and the number of letter names upwards.
+
+    """
+
+    from_key, to_key = NOTE_SPELLINGS[from_key], NOTE_SPELLINGS[to_key]
+
+    return (PITCH_CLASSES[to_key] - PITCH_CLASSES[from_key]) % NUM_PITCH_CLASSES, (LETTER_NAMES.index(to_key[0]) - LETTER_NAMES.index(from_key[0])) % len(LETTER_NAMES)
+
+@lru_cache(maxsize=None)
+def note_translation(from_key: str,
+                     to_key: str
+                     ) -> Dict[str, str]:
+
+    """
+    A function to map every note spelling to its transposition, computed once per pair of keys, so transposing a result is only dictionary lookups.
+    The dictionary is shared by every caller and must not be modified.
+
+    Args:
+
+        from_key: The key being transposed from.
+        to_key: The key being transposed to.
+
+    Return:
+
+        translation: A dictionary containing notes as keys and transposed notes as values.
+
+    """
+
+    semitones, letter_steps = transposition_interval(from_key=from_key, to_key=to_key)
+
+    return {note: spell_note(pitch_class=(PITCH_CLASSES[spelling] + semitones) % NUM_PITCH_CLASSES,
+                             letter=LETTER_NAMES[(LETTER_NAMES.index(spelling[0]) + letter_steps) % len(LETTER_NAMES)])
+            for note, spelling in NOTE_SPELLINGS.items()}
+
+@lru_cache(maxsize=None)
+def _formatted_translation(from_key: str,
+                           to_key: str
+                           ) -> Dict[str, str]:
+
+    """
+    A function to map every formatted note of a guitar string representation to its transposition, blank spaces included.
+    Notes of every width are mapped to transposed notes of the narrowest width, which transpose_strings widens again where a double accidental needs it.
+
+    """
+
+    translation: Dict[str, str] = {f"{note:<{width}}": f"{transposed_note:<2}" for note, transposed_note in note_translation(from_key=from_key, to_key=to_key).items() for width in _NOTE_WIDTHS}
+
+    translation.update({"_" * width: _BLANK_FRET for width in _NOTE_WIDTHS})
+
+    return translation
+
+def transpose_scale(scale_notes: Sequence[str],
+                    to_key: str
+                    ) -> Scale:
+
+    """
+    A function to transpose scale notes to another key, beginning at the new scale key.
+
+    Args:
+
+        scale_notes: A sequence containing the scale notes.
+        to_key: The key being transposed to.
+
+    Return:
+
+        An immutable scale containing the transposed scale notes.
+
+    """
+
+    translation: Dict[str, str] = note_translation(from_key=scale_notes[0], to_key=to_key)
+
+    return Scale(translation[note] for note in scale_notes)
+
+def transpose_chords(chord_notes: Mapping,
+                     from_key: str,
+                     to_key: str
+                     ) -> ChordSet:
+
+    """
+    A function to transpose the chords of a scale to another key, keeping their chord degrees.
+
+    Args:
+
+        chord_notes: A dictionary containing chord degrees as keys and chord notes as values.
+        from_key: The scale key of the chords.
+        to_key: The key being transposed to.
+
+    Return:
+
+        An immutable chord set containing the transposed chords.
+
+    """
+
+    translation: Dict[str, str] = note_translation(from_key=from_key, to_key=to_key)
+
+    return ChordSet({chord_degree: Chord(translation[note] for note in chord) for chord_degree, chord in chord_notes.items()})
+
+def transpose_progression(progression: Sequence[Sequence[str]],
+                          from_key: str,
+                          to_key: str
+                          ) -> List[Chord]:
+
+    """
+    A function to transpose a chord progression to another key in bulk.
+
+    Args:
+
+        progression: A sequence of chords, each a sequence of chord notes.
+        from_key: The key of the progression.
+        to_key: The key being transposed to.
+
+    Return:
+
+        A list of transposed chords, in progression order.
+
+    """
+
+    translation: Dict[str, str] = note_translation(from_key=from_key, to_key=to_key)
+
+    return [Chord(translation[note] for note in chord) for chord in progression]
+
+def transpose_strings(strings: Mapping,
+                      from_key: str,
+                      to_key: str
+                      ) -> FretboardStrings:
+
+    """
+    A function to transpose guitar string representations to another key, by shifting each string along the fretboard and renaming its notes.
+    Frets repeat every twelve notes, so only the first twelve frets of each string are renamed, rotated by the shift, and then repeated up the neck.
+
+    Args:
+
+        strings: A dictionary containing root notes as keys and scale or chord note string representations as values, at least twelve frets long.
+        from_key: The key of the strings.
+        to_key: The key being transposed to.
+
+    Return:
+
+        Immutable fretboard strings containing root notes as keys and transposed string representations as values.
+
+    """
+
+    # The first fret of the transposed cycle is read from 12 - k frets up the original string
+    offset: int = (NUM_PITCH_CLASSES - transposition_interval(from_key=from_key, to_key=to_key)[0]) % NUM_PITCH_CLASSES
+
+    formatted_translation: Dict[str, str] = _formatted_translation(from_key=from_key, to_key=to_key)
+
+    transposed_strings: Dict[str, Tuple[str, ...]] = {}
+
+    for root_note, string in strings.items():
+
+        if len(string) < NUM_PITCH_CLASSES:
+
+            raise ValueError(f"Strings must have at least {NUM_PITCH_CLASSES} frets to be transposed, got {len(string)}")
+
+        cycle: Tuple[str, ...] = tuple(formatted_translation[formatted_note] for formatted_note in string[offset:NUM_PITCH_CLASSES] + string[:offset])
+
+        # A cycle holds every note of the scale or chord, so a double accidental in the new key widens the whole string
+        width: int = note_width(note_sequence=cycle)
+
+        if width > len(_BLANK_FRET):
+
+            cycle = tuple("_" * width if formatted_note == _BLANK_FRET else f"{formatted_note.rstrip():<{width}}" for formatted_note in cycle)
+
+        transposed_strings[root_note] = (cycle * (len(string) // NUM_PITCH_CLASSES + 1))[:len(string)]
+
+    return FretboardStrings(transposed_strings)
+
+def transpose_chord_strings(chord_strings: Mapping,
+                            from_key: str,
+                            to_key: str
+                            ) -> FretboardStrings:
+
+    """
+    A function to transpose the chord note strings of every chord degree to another key.
+
+    Args:
+
+        chord_strings: A dictionary, keyed by chord degrees, containing a nested dictionary with root notes as keys and chord note strings as values.
+        from_key: The key of the chord strings.
+        to_key: The key being transposed to.
+
+    Return:
+
+        Immutable fretboard strings of the same shape containing transposed chord note strings.
+
+    """
+
+    return FretboardStrings({chord_degree: transpose_strings(strings=strings, from_key=from_key, to_key=to_key) for chord_degree, strings in chord_strings.items()})
+
+def transpose_fretboard(fretboard: Fretboard,
+                        semitones: int
+                        ) -> Fretboard:
+
+    """
+    A function to transpose a fretboard by rotating its pitch class mask, which moves every fret cycle by the same offset.
+
+    Args:
+
+        fretboard: The fretboard to be transposed.
+        semitones: The number of semitones to transpose by, negative values transpose downwards.
+
+    Return:
+
+        The transposed fretboard, shared through the cache with any equal fretboard.
+
+    """
+
+    return get_or_generate_fretboard(mask=rotate_mask(mask=fretboard.mask, semitones=semitones),
+                                     tuning=fretboard.tuning,
+                                     num_frets=fretboard.num_frets,
+                                     capo=fretboard.capo)
+
+def transpose(value: Any,
+              from_key: str,
+              to_key: str
+              ) -> Any:
+
+    """
+    A function to transpose any computed result to another key: scale notes, chord sets, scale or chord strings and fretboards.
+
+    Args:
+
+        value: The result to be transposed.
+        from_key: The key of the result.
+        to_key: The key being transposed to.
+
+    Return:
+
+        The transposed result, of the same shape.
+
+    """
+
+    if isinstance(value, Fretboard):
+
+        return transpose_fretboard(fretboard=value, semitones=transposition_interval(from_key=from_key, to_key=to_key)[0])
+
+    if isinstance(value, Mapping):
+
+        first_value: Any = next(iter(value.values()), None)
+
+        if isinstance(first_value, Fretboard):
+
+            return {chord_degree: transpose(value=fretboard, from_key=from_key, to_key=to_key) for chord_degree, fretboard in value.items()}
+
+        if isinstance(first_value, Mapping):
+
+            return transpose_chord_strings(chord_strings=value, from_key=from_key, to_key=to_key)
+
+        # Strings are tuples, as chords are, so they are told apart by the type of the mapping, dictionaries of lists being read as strings too
+        if isinstance(value, FretboardStrings) or isinstance(first_value, list):
+
+            return transpose_strings(strings=value, from_key=from_key, to_key=to_key)
+
+        return transpose_chords(chord_notes=value, from_key=from_key, to_key=to_key)
+
+    # Scale notes and single chords keep their type
+    translation: Dict[str, str] = note_translation(from_key=from_key, to_key=to_key)
+
+    return (Chord if isinstance(value, Chord) else Scale)(translation[note] for note in value)
+
+def transpose_to_all_keys(value: Any,
+                          from_key: str,
+                          keys: Sequence[str] = CHROMATIC_SCALE
+                          ) -> Dict[str, Any]:
+
+    """
+    A function to show one computed result in every key, by transposing it rather than running the pipeline again for each key.
+
+    Args:
+
+        value: The result to be transposed.
+        from_key: The key of the result.
+        keys: The keys to transpose to, defaulting to the twelve keys of the chromatic scale.
+
+    Return:
+
+        A dictionary containing keys as keys and transposed results as values, the key of the result holding the result itself.
+
+    """
+
+    return {key: value if NOTE_SPELLINGS[key] == NOTE_SPELLINGS[from_key] else transpose(value=value, from_key=from_key, to_key=key) for key in keys}
+
+
+
+if __name__ == "__main__":
+
+    print("--------------------")
+
+    demo_scale_notes = ScaleGenerator().get_or_generate_scale(scale_key="C", scale_type=ScaleTypes.MAJOR_SCALE)
+
+    for demo_key, demo_scale in transpose_to_all_keys(value=demo_scale_notes, from_key="C").items():
+
+        print(demo_key, demo_scale)
+
+    print("--------------------")
+
+    demo_chord_notes = ChordGenerator().get_or_generate_chord(scale_notes=demo_scale_notes, scale_type=ScaleTypes.MAJOR_SCALE, chord_type=ChordTypes.TRIAD)
+
+    print(transpose(value=demo_chord_notes, from_key="C", to_key="Eb"))
+
+    print(transpose_progression(progression=[demo_chord_notes["ii"], demo_chord_notes["V"], demo_chord_notes["I"]], from_key="C", to_key="F#"))
+
+    print("--------------------")
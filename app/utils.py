@@ -1,12 +1,25 @@
-from typing import List, Dict, Tuple, Callable, Any
+from functools import lru_cache
+from time import perf_counter_ns
+from typing import List, Dict, Tuple, Callable, Any, Optional, Union, Sequence
 
-from config.config import CHROMATIC_SCALE
+from config.config import CHROMATIC_SCALE, NUM_PITCH_CLASSES, PITCH_CLASSES, PITCH_CLASS_MASK, NUM_MASKS
 from app.library.intervals import scale_intervals
+from app.cache import Cache, MISSING
+
+# Pre-formatted note names, so guitar string representations never format a note more than once
+_FORMATTED_CHROMATIC_SCALE: List[str] = [f"{note:<2}" for note in CHROMATIC_SCALE]
+
+# Hook called by get_or_generate after every lookup, installed by app.instrumentation while it is enabled
+_lookup_hook: Optional[Callable[[Tuple[Any, ...], bool, int, Optional[Tuple[Any, ...]]], None]] = None
+
+# Lookup tables derived from library dictionaries, keyed by the build function and the ids of the dictionaries it was given
+# Each entry holds copies of the dictionaries taken when the table was built, and the table
+_derived_tables: Dict[Tuple[Any, ...], Tuple[Tuple[Dict, ...], Any]] = {}
 
 def generate_sequence_from_intervals(start_position: int, 
-                                     note_sequence: List[str], 
+                                     note_sequence: List[Any], 
                                      intervals: List[int]
-                                     ) -> List[str]:
+                                     ) -> List[Any]:
     
     """
     A function that uses a sequence of notes and an interval pattern to compute a new sequence of notes.
@@ -27,18 +40,19 @@ def generate_sequence_from_intervals(start_position: int,
 
 def generate_string(start_position: int, 
                     note_sequence: List[str], 
-                    scale_or_chord: List[str], 
+                    scale_or_chord: Union[List[str], int], 
                     frets: range
                     ) -> List[str]:
 
     """
     A function that uses a sequence of notes and a separate sequence of scale notes or chord notes to compute a new sequence of notes.
+    Membership is tested against a pitch class mask, so note names are only produced when each fret is formatted.
     
     Args:
 
         start_position: The index position in the sequence of notes where the guitar string representation begins.
         note_sequence: The sequence of notes that must correspond with the scale notes or chord notes, in order to build the guitar string representation.
-        scale_or_chord: The sequence of notes from either a scale or a chord.
+        scale_or_chord: The sequence of notes from either a scale or a chord, or its pitch class mask.
         frets: A range object, representing the fret positions on the fretboard.
 
     Return:
@@ -47,7 +61,178 @@ def generate_string(start_position: int,
 
     """
 
-    return [f"{note_sequence[(start_position + fret) % len(note_sequence)]:<2}" if note_sequence[(start_position + fret) % len(note_sequence)] in scale_or_chord else "__" for fret in frets]
+    sequence_len: int = len(note_sequence)
+
+    mask: int = scale_or_chord if isinstance(scale_or_chord, int) else notes_to_mask(notes=scale_or_chord, note_sequence=note_sequence)
+
+    # Chromatic rows are rotations of one formatted cycle per mask
+    if note_sequence is CHROMATIC_SCALE:
+
+        formatted_cycle: Tuple[str, ...] = _formatted_cycle(mask=mask)
+
+        return [formatted_cycle[(start_position + fret) % NUM_PITCH_CLASSES] for fret in frets]
+
+    # Notes are padded to the widest spelling, so double accidentals keep every fret of the string aligned
+    width: int = note_width(note_sequence=note_sequence)
+
+    formatted_notes: List[str] = [f"{note:<{width}}" for note in note_sequence]
+
+    blank: str = "_" * width
+
+    return [formatted_notes[position] if mask >> position & 1 else blank for position in [(start_position + fret) % sequence_len for fret in frets]]
+
+def note_width(note_sequence: Sequence[str]) -> int:
+
+    """
+    A function to find the width of each formatted note of a guitar string representation.
+
+    Args:
+
+        note_sequence: The sequence of notes the guitar string representation is built from.
+
+    Return:
+
+        Two characters, or the length of the widest note name if a double accidental such as F## is wider.
+
+    """
+
+    return max(2, max(map(len, note_sequence), default=2))
+
+@lru_cache(maxsize=None)
+def _formatted_cycle(mask: int) -> Tuple[str, ...]:
+
+    """
+    A function to format the twelve frets of a pitch class mask once, indexed by pitch class.
+
+    Args:
+
+        mask: The pitch class mask of the scale or chord.
+
+    Return:
+
+        A tuple of formatted notes, with blank spaces for pitch classes that are not in the mask.
+
+    """
+
+    return tuple(_FORMATTED_CHROMATIC_SCALE[position] if mask >> position & 1 else "__" for position in range(NUM_PITCH_CLASSES))
+
+def notes_to_mask(notes: Sequence[str], 
+                  note_sequence: List[str] = CHROMATIC_SCALE
+                  ) -> int:
+
+    """
+    A function to convert a sequence of notes into a pitch class mask, where bit n is set if the nth note of the note sequence is present.
+
+    Args:
+
+        notes: The scale notes or chord notes to be converted.
+        note_sequence: The sequence of notes that defines the pitch class of each note.
+
+    Return:
+
+        mask: An integer pitch class mask.
+
+    """
+
+    pitch_classes: Dict[str, int] = PITCH_CLASSES if note_sequence is CHROMATIC_SCALE else {note: index for index, note in enumerate(note_sequence)}
+
+    mask: int = 0
+
+    for note in notes:
+
+        mask |= 1 << pitch_classes[note]
+
+    return mask
+
+def intervals_to_mask(intervals: Sequence[int], 
+                      start_position: int = 0
+                      ) -> int:
+
+    """
+    A function to convert an interval pattern into a pitch class mask, starting from the given pitch class.
+
+    Args:
+
+        intervals: The interval pattern, in semitones from the root.
+        start_position: The pitch class of the root.
+
+    Return:
+
+        mask: An integer pitch class mask.
+
+    """
+
+    mask: int = 0
+
+    for interval in intervals:
+
+        mask |= 1 << ((start_position + interval) % NUM_PITCH_CLASSES)
+
+    return mask
+
+def rotate_mask(mask: int, 
+                semitones: int
+                ) -> int:
+
+    """
+    A function to transpose a pitch class mask upwards by a number of semitones.
+
+    Args:
+
+        mask: An integer pitch class mask.
+        semitones: The number of semitones to transpose by, negative values transpose downwards.
+
+    Return:
+
+        An integer pitch class mask.
+
+    """
+
+    semitones %= NUM_PITCH_CLASSES
+
+    return ((mask << semitones) | (mask >> (NUM_PITCH_CLASSES - semitones))) & PITCH_CLASS_MASK
+
+def mask_to_pitch_classes(mask: int, 
+                          start_position: int = 0
+                          ) -> List[int]:
+
+    """
+    A function to list the pitch classes of a mask in ascending order, beginning at the start position.
+
+    Args:
+
+        mask: An integer pitch class mask.
+        start_position: The pitch class to begin from, usually the root.
+
+    Return:
+
+        A list of pitch classes.
+
+    """
+
+    return [(start_position + offset) % NUM_PITCH_CLASSES for offset in range(NUM_PITCH_CLASSES) if mask >> ((start_position + offset) % NUM_PITCH_CLASSES) & 1]
+
+def mask_to_notes(mask: int, 
+                  start_position: int = 0, 
+                  note_sequence: List[str] = CHROMATIC_SCALE
+                  ) -> List[str]:
+
+    """
+    A function to render a pitch class mask as note names, beginning at the start position.
+
+    Args:
+
+        mask: An integer pitch class mask.
+        start_position: The pitch class to begin from, usually the root.
+        note_sequence: The sequence of notes used to name each pitch class.
+
+    Return:
+
+        A list of note names.
+
+    """
+
+    return [note_sequence[pitch_class] for pitch_class in mask_to_pitch_classes(mask=mask, start_position=start_position)]
 
 def generate_cache_key(class_name: str, *args) -> Tuple[Any, ...]:
 
@@ -67,9 +252,10 @@ def generate_cache_key(class_name: str, *args) -> Tuple[Any, ...]:
 
     return (class_name, *args)
 
-def get_or_generate(cache: Dict[Tuple[Any, ...], Any], 
+def get_or_generate(cache: Cache, 
                     cache_key: Tuple[Any, ...], 
-                    generate_function: Callable[[], Any]
+                    generate_function: Callable[[], Any],
+                    pattern: Optional[Tuple[Any, ...]] = None
                     ) -> Any:
 
     """
@@ -78,9 +264,10 @@ def get_or_generate(cache: Dict[Tuple[Any, ...], Any],
 
     Args:
 
-        cache: A dictionary structure for caching.
+        cache: A dictionary structure for caching, or a cache backend.
         cache_key: A unique tuple.
         generate_function: A function to generate the data, if not available in the cache.
+        pattern: The scale type and chord type the data belongs to, reported to the lookup hook, as content addressed cache keys no longer hold them.
 
     Return:
 
@@ -88,16 +275,198 @@ def get_or_generate(cache: Dict[Tuple[Any, ...], Any],
     
     """
 
-    if cache_key in cache:
+    if _lookup_hook is not None:
 
-        return cache[cache_key]
-    
-    return_value = generate_function()
+        return _get_or_generate_instrumented(cache=cache, cache_key=cache_key, generate_function=generate_function, pattern=pattern)
+
+    if isinstance(cache, dict):
+
+        if cache_key in cache:
+
+            return cache[cache_key]
 
-    cache[cache_key] = return_value
+        return_value = generate_function()
+
+        cache[cache_key] = return_value
+
+        return return_value
+
+    return cache.get_or_compute(cache_key, generate_function)
+
+def _get_or_generate_instrumented(cache: Cache, 
+                                  cache_key: Tuple[Any, ...], 
+                                  generate_function: Callable[[], Any],
+                                  pattern: Optional[Tuple[Any, ...]] = None
+                                  ) -> Any:
+
+    """
+    A function that behaves as get_or_generate, reporting the lookup and any generation time to the lookup hook.
+
+    """
+
+    duration_ns: int = 0
+
+    hit: bool = True
+
+    def timed_generate_function() -> Any:
+
+        nonlocal duration_ns, hit
+
+        hit = False
+
+        start: int = perf_counter_ns()
+
+        generated_value = generate_function()
+
+        duration_ns = perf_counter_ns() - start
+
+        return generated_value
+
+    if isinstance(cache, dict):
+
+        return_value = cache.get(cache_key, MISSING)
+
+        if return_value is MISSING:
+
+            return_value = cache[cache_key] = timed_generate_function()
+
+    else:
+
+        # Backends coordinating concurrent callers still see a single computation while instrumented
+        return_value = cache.get_or_compute(cache_key, timed_generate_function)
+
+    hook: Optional[Callable[[Tuple[Any, ...], bool, int, Optional[Tuple[Any, ...]]], None]] = _lookup_hook
+
+    if hook is not None:
+
+        hook(cache_key, hit, duration_ns, pattern)
 
     return return_value
 
+def set_lookup_hook(hook: Optional[Callable[[Tuple[Any, ...], bool, int, Optional[Tuple[Any, ...]]], None]]) -> None:
+
+    """
+    A function to install, or with None remove, the hook called by get_or_generate after every lookup.
+
+    Args:
+
+        hook: A function receiving the cache key, whether it was a hit, the generation time in nanoseconds, and the pattern passed to get_or_generate or None.
+
+    """
+
+    global _lookup_hook
+
+    _lookup_hook = hook
+
+def get_or_build_table(build_function: Callable[..., Any],
+                       *sources: Dict
+                       ) -> Any:
+
+    """
+    A function to retrieve a lookup table derived from one or more dictionaries, building it on first use.
+    Tables are found by the ids of the dictionaries, and only reused while the dictionaries still hold what the table was built from, so a dictionary changed in place, or a new one reusing an id, is never served a stale table.
+
+    Args:
+
+        build_function: The function building the table, called with the dictionaries in order.
+        sources: The dictionaries the table is derived from.
+
+    Return:
+
+        The lookup table, shared by every caller and not to be modified.
+
+    """
+
+    table_key: Tuple[Any, ...] = (build_function, *map(id, sources))
+
+    cached: Optional[Tuple[Tuple[Dict, ...], Any]] = _derived_tables.get(table_key)
+
+    # Values are compared by identity first, so an unchanged dictionary costs one pass over its keys
+    if cached is not None and cached[0] == sources:
+
+        return cached[1]
+
+    table: Any = build_function(*sources)
+
+    _derived_tables[table_key] = (tuple(dict(source) for source in sources), table)
+
+    return table
+
+def chord_masks_from_scale_mask(scale_mask: int, 
+                                start_position: int, 
+                                intervals: Sequence[int]
+                                ) -> List[int]:
+
+    """
+    A function to compute the pitch class mask of the chord built on each degree of a scale.
+
+    Args:
+
+        scale_mask: The pitch class mask of the scale.
+        start_position: The pitch class of the scale key.
+        intervals: The chord interval pattern, in scale degrees.
+
+    Return:
+
+        A list of chord pitch class masks, one per scale degree.
+
+    """
+
+    scale_pitch_classes: List[int] = mask_to_pitch_classes(mask=scale_mask, start_position=start_position)
+
+    scale_len: int = len(scale_pitch_classes)
+
+    return [sum(1 << scale_pitch_classes[(chord_degree + interval) % scale_len] for interval in intervals) for chord_degree in range(scale_len)]
+
+def build_pattern_table(interval_sequence: Dict[str, Tuple[int, ...]]
+                        ) -> List[Optional[str]]:
+
+    """
+    A function to precompute a lookup table of every possible root relative pitch class mask.
+    Where several patterns share a mask, the first one in the interval sequence is kept.
+
+    Args:
+
+        interval_sequence: The dictionary containing scale intervals and chord intervals.
+
+    Return:
+
+        pattern_table: A list, indexed by pitch class mask, containing the name of the matching pattern or None.
+
+    """
+
+    pattern_table: List[Optional[str]] = [None] * NUM_MASKS
+
+    for pattern_type, interval_pattern in interval_sequence.items():
+
+        mask: int = intervals_to_mask(intervals=interval_pattern)
+
+        if pattern_table[mask] is None:
+
+            pattern_table[mask] = pattern_type
+
+    return pattern_table
+
+def get_pattern_table(interval_sequence: Dict[str, Tuple[int, ...]]
+                      ) -> List[Optional[str]]:
+
+    """
+    A function to retrieve the pattern lookup table for an interval dictionary, building it on first use.
+
+    Args:
+
+        interval_sequence: The dictionary containing scale intervals and chord intervals.
+
+    Return:
+
+        pattern_table: A list, indexed by pitch class mask, containing the name of the matching pattern or None.
+
+    """
+
+    pattern_table: List[Optional[str]] = get_or_build_table(build_pattern_table, interval_sequence)
+
+    return pattern_table
+
 def determine_pattern_type(note_sequence: List[str], 
                            interval_sequence: Dict[str, Tuple[int, ...]], 
                            chromatic_scale: List[str] = CHROMATIC_SCALE
@@ -105,6 +474,7 @@ def determine_pattern_type(note_sequence: List[str],
 
     """
     A function to match a sequence of notes to the correct interval pattern.
+    The notes are reduced to a pitch class mask relative to the first note, which indexes a precomputed pattern table.
 
     Args:
 
@@ -118,20 +488,11 @@ def determine_pattern_type(note_sequence: List[str],
     
     """
 
-    root_index = chromatic_scale.index(note_sequence[0])
+    pitch_classes: Dict[str, int] = PITCH_CLASSES if chromatic_scale is CHROMATIC_SCALE else {note: index for index, note in enumerate(chromatic_scale)}
 
-    note_intervals = [(index - root_index) % len(chromatic_scale) for index, note in enumerate(chromatic_scale) if note in note_sequence]
-
-    intervals = tuple(note_intervals)
-
-    for pattern_type, interval_pattern in interval_sequence.items():
-
-        if interval_pattern == intervals:
-
-            return pattern_type
-        
-    return None
+    mask: int = rotate_mask(mask=notes_to_mask(notes=note_sequence, note_sequence=chromatic_scale), semitones=-pitch_classes[note_sequence[0]])
 
+    return get_pattern_table(interval_sequence=interval_sequence)[mask]
 
 
 if __name__ == "__main__":
@@ -151,3 +512,5 @@ if __name__ == "__main__":
     print(generate_string(start_position=start_position, note_sequence=chromatic_scale, scale_or_chord=scale_notes, frets=frets))
 
     print(determine_pattern_type(note_sequence=scale_notes, interval_sequence=scale_intervals))
+
+    print(determine_pattern_type(note_sequence=["D", "E", "F", "G", "A", "Bb", "C"], interval_sequence=scale_intervals))
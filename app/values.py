@@ -0,0 +1,236 @@
+import sys
+from collections.abc import Mapping
+from typing import Dict, Tuple, Iterable, Iterator, Any
+
+from config.config import PITCH_CLASSES
+from app.utils import notes_to_mask
+
+class Scale(tuple):
+
+    """
+    An immutable, hashable sequence of scale notes, beginning at the scale key.
+    Scales are tuples of interned note names, so they compare equal to tuples of the same notes and can be used directly as cache keys.
+
+    """
+
+    __slots__ = ()
+
+    def __new__(cls,
+                notes: Iterable[str]
+                ) -> "Scale":
+
+        return super().__new__(cls, [sys.intern(note) for note in notes])
+
+    @property
+    def root(self) -> str:
+
+        return self[0]
+
+    @property
+    def mask(self) -> int:
+
+        return notes_to_mask(notes=self)
+
+    @property
+    def pitch_classes(self) -> Tuple[int, ...]:
+
+        return tuple(PITCH_CLASSES[note] for note in self)
+
+    def __repr__(self) -> str:
+
+        return f"{type(self).__name__}{tuple.__repr__(self)}"
+
+class Chord(Scale):
+
+    """
+    An immutable, hashable sequence of chord notes, root first.
+
+    """
+
+    __slots__ = ()
+
+class ChordSet(Mapping):
+
+    """
+    An immutable, hashable mapping of chord degrees to chords, in scale degree order.
+    Unlike dictionaries, chord sets are only equal to mappings of the same chords in the same order, so that equal chord sets always hash alike.
+
+    Attributes:
+
+        _chords: A dictionary containing chord degrees as keys and chords as values.
+        _hash: The hash of the chord degrees and chords, computed on first use.
+
+    """
+
+    __slots__ = ("_chords", "_hash")
+
+    def __init__(self,
+                 chords: Any = ()
+                 ) -> None:
+
+        self._chords: Dict[str, Chord] = {sys.intern(chord_degree): chord_notes if type(chord_notes) is Chord else Chord(chord_notes)
+                                          for chord_degree, chord_notes in dict(chords).items()}
+        self._hash: Any = None
+
+    def __getitem__(self,
+                    chord_degree: str
+                    ) -> Chord:
+
+        return self._chords[chord_degree]
+
+    def __iter__(self) -> Iterator[str]:
+
+        return iter(self._chords)
+
+    def __len__(self) -> int:
+
+        return len(self._chords)
+
+    def __eq__(self,
+               other: Any
+               ) -> bool:
+
+        # Degrees are compared in order, as they are hashed and as the chord set's repr keys persistent caches
+        if not isinstance(other, Mapping):
+
+            return NotImplemented
+
+        return tuple(self._chords.items()) == tuple(other.items())
+
+    def __hash__(self) -> int:
+
+        if self._hash is None:
+
+            self._hash = hash(tuple(self._chords.items()))
+
+        return self._hash
+
+    def __repr__(self) -> str:
+
+        return f"ChordSet({self._chords!r})"
+
+    def __reduce__(self) -> Tuple[type, Tuple[Dict[str, Chord]]]:
+
+        # String hashes differ between processes, so the cached hash is never pickled
+        return ChordSet, (self._chords,)
+
+    def to_dict(self) -> Dict[str, Tuple[str, ...]]:
+
+        """
+        Copies the chord set into a dictionary, for serialisation.
+
+        Returns:
+
+            A dictionary containing chord degrees as keys and chords as values.
+
+        """
+
+        return dict(self._chords)
+
+class FretboardStrings(Mapping):
+
+    """
+    An immutable, hashable mapping of open string root notes to guitar string representations, or of chord degrees to the strings of each chord.
+    Each string is a tuple of formatted notes, so strings shared through the cache cannot be modified in place by one caller under another.
+
+    Attributes:
+
+        _strings: A dictionary containing root notes or chord degrees as keys and strings or nested fretboard strings as values.
+        _hash: The hash of the keys and strings, computed on first use.
+
+    """
+
+    __slots__ = ("_strings", "_hash")
+
+    def __init__(self,
+                 strings: Any = ()
+                 ) -> None:
+
+        self._strings: Dict[str, Any] = {key: value if isinstance(value, (tuple, FretboardStrings)) else FretboardStrings(value) if isinstance(value, Mapping) else tuple(value)
+                                         for key, value in dict(strings).items()}
+        self._hash: Any = None
+
+    def __getitem__(self,
+                    key: str
+                    ) -> Any:
+
+        return self._strings[key]
+
+    def __iter__(self) -> Iterator[str]:
+
+        return iter(self._strings)
+
+    def __len__(self) -> int:
+
+        return len(self._strings)
+
+    def __hash__(self) -> int:
+
+        if self._hash is None:
+
+            self._hash = hash(frozenset(self._strings.items()))
+
+        return self._hash
+
+    def __repr__(self) -> str:
+
+        return f"FretboardStrings({self._strings!r})"
+
+    def __reduce__(self) -> Tuple[type, Tuple[Dict[str, Any]]]:
+
+        return FretboardStrings, (self._strings,)
+
+    def to_dict(self) -> Dict[str, Any]:
+
+        """
+        Copies the fretboard strings into a dictionary, for serialisation.
+
+        Returns:
+
+            A dictionary containing root notes or chord degrees as keys and strings or nested fretboard strings as values.
+
+        """
+
+        return dict(self._strings)
+
+def to_json(value: Any) -> Any:
+
+    """
+    A function passed as the default of json.dump and json.dumps, converting value types that JSON does not natively support.
+    Scales and chords are tuples, so they are already serialised as lists.
+
+    Args:
+
+        value: The value to be converted.
+
+    Return:
+
+        A JSON serialisable equivalent.
+
+    """
+
+    if isinstance(value, (ChordSet, FretboardStrings)):
+
+        return value.to_dict()
+
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+
+if __name__ == "__main__":
+
+    print("--------------------")
+
+    demo_scale = Scale(["C", "D", "E", "F", "G", "A", "B"])
+
+    print(demo_scale, demo_scale.root, f"{demo_scale.mask:#05x}")
+
+    print("--------------------")
+
+    demo_chord_set = ChordSet({"I": ["C", "E", "G"], "ii": ["D", "F", "A"]})
+
+    print(demo_chord_set, demo_chord_set == ChordSet({"I": ("C", "E", "G"), "ii": ("D", "F", "A")}))
+
+    print({demo_scale: "cache key", demo_chord_set: "cache key"})
+
+    print("--------------------")
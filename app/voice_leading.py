@@ -0,0 +1,585 @@
+from itertools import combinations_with_replacement
+from typing import List, Dict, Tuple, Optional, NamedTuple, Sequence
+
+import numpy as np
+
+from config.config import CHROMATIC_SCALE, PITCH_CLASSES, NUM_PITCH_CLASSES, NUM_MASKS
+from app.library.intervals import scale_intervals, chord_intervals, chord_symbols
+from app.library.enums import ScaleTypes, ChordTypes
+from app.scale_generator import ScaleGenerator
+from app.chord_generator import ChordGenerator
+from app.utils import intervals_to_mask, notes_to_mask, rotate_mask, mask_to_pitch_classes, chord_masks_from_scale_mask, get_or_build_table
+
+# Intervals and their complements fall in the same interval class, from the semitone to the tritone
+NUM_INTERVAL_CLASSES: int = NUM_PITCH_CLASSES // 2
+
+# Distance metrics, with 1 where a smaller value is nearer and -1 where a larger value is nearer
+METRICS: Dict[str, int] = {"voice_leading": 1, "common_tones": -1, "hamming": 1, "interval_vector": 1}
+
+# Number of set bits of every pitch class mask
+_POPCOUNTS: np.ndarray = np.array([bin(mask).count("1") for mask in range(NUM_MASKS)], dtype=np.uint8)
+
+class DistanceTables(NamedTuple):
+
+    """
+    Distances between every pair of scale and chord pitch class masks in the library, one matrix per metric, indexed by mask position.
+
+    Attributes:
+
+        masks: The pitch class masks, in ascending order.
+        index: A dictionary containing pitch class masks as keys and their positions as values.
+        names: A dictionary containing pitch class masks as keys and the names of the scales and chords sharing the mask as values.
+        is_scale: A boolean array, True where a mask is a scale.
+        is_chord: A boolean array, True where a mask is a chord.
+        voice_leading: The smallest total number of semitones moved by the voices from one mask to the other.
+        common_tones: The number of pitch classes in both masks.
+        hamming: The number of pitch classes in only one of the masks.
+        interval_vector: The sum of the differences between the interval class counts of the masks.
+
+    """
+
+    masks: Tuple[int, ...]
+    index: Dict[int, int]
+    names: Dict[int, Tuple[str, ...]]
+    is_scale: np.ndarray
+    is_chord: np.ndarray
+    voice_leading: np.ndarray
+    common_tones: np.ndarray
+    hamming: np.ndarray
+    interval_vector: np.ndarray
+
+def circular_distance(from_pitch_class: int,
+                      to_pitch_class: int
+                      ) -> int:
+
+    """
+    A function to measure the fewest semitones between two pitch classes, upwards or downwards.
+
+    Args:
+
+        from_pitch_class: The first pitch class.
+        to_pitch_class: The second pitch class.
+
+    Return:
+
+        The number of semitones, from 0 to 6.
+
+    """
+
+    semitones: int = (to_pitch_class - from_pitch_class) % NUM_PITCH_CLASSES
+
+    return min(semitones, NUM_PITCH_CLASSES - semitones)
+
+def interval_vector(mask: int) -> Tuple[int, ...]:
+
+    """
+    A function to count the intervals between every pair of pitch classes of a mask by interval class, which is the same for every transposition and inversion.
+
+    Args:
+
+        mask: An integer pitch class mask.
+
+    Return:
+
+        A tuple of six counts, from the semitone to the tritone.
+
+    """
+
+    pitch_classes: List[int] = mask_to_pitch_classes(mask=mask)
+
+    counts: List[int] = [0] * NUM_INTERVAL_CLASSES
+
+    for position, from_pitch_class in enumerate(pitch_classes):
+
+        for to_pitch_class in pitch_classes[position + 1:]:
+
+            counts[circular_distance(from_pitch_class=from_pitch_class, to_pitch_class=to_pitch_class) - 1] += 1
+
+    return tuple(counts)
+
+def minimal_voice_leading(from_pitch_classes: Sequence[int],
+                          to_pitch_classes: Sequence[int]
+                          ) -> Tuple[int, List[Tuple[int, int]]]:
+
+    """
+    A function to find the voice leading between two pitch class sets that moves the voices the fewest semitones in total, each voice moving up or down by its shortest route.
+    Where one set is larger, notes of the smaller set are doubled so that every note of both sets takes part.
+    Voices on a circle never need to cross, so each doubling is only paired with the cyclic rotations of the ascending notes.
+
+    Args:
+
+        from_pitch_classes: The pitch classes of the first chord or scale, without repeats.
+        to_pitch_classes: The pitch classes of the second chord or scale, without repeats.
+
+    Return:
+
+        A tuple of the total number of semitones and a list of pairs of from and to pitch classes, one per voice.
+
+    """
+
+    # The larger set is matched against doublings of the smaller, and the pairs swapped back afterwards
+    swapped: bool = len(from_pitch_classes) < len(to_pitch_classes)
+
+    larger, smaller = (sorted(to_pitch_classes), sorted(from_pitch_classes)) if swapped else (sorted(from_pitch_classes), sorted(to_pitch_classes))
+
+    num_voices: int = len(larger)
+
+    best_cost: Optional[int] = None
+
+    best_pairs: List[Tuple[int, int]] = []
+
+    for doubled in combinations_with_replacement(smaller, num_voices - len(smaller)):
+
+        voices: List[int] = sorted(smaller + list(doubled))
+
+        for rotation in range(num_voices):
+
+            cost: int = sum(circular_distance(from_pitch_class=larger[voice], to_pitch_class=voices[(voice + rotation) % num_voices]) for voice in range(num_voices))
+
+            if best_cost is None or cost < best_cost:
+
+                best_cost = cost
+
+                best_pairs = [(larger[voice], voices[(voice + rotation) % num_voices]) for voice in range(num_voices)]
+
+    if swapped:
+
+        best_pairs = [(to_pitch_class, from_pitch_class) for from_pitch_class, to_pitch_class in best_pairs]
+
+    return best_cost if best_cost is not None else 0, best_pairs
+
+def build_distance_tables(scale_sequence: Dict[str, Tuple[int, ...]],
+                          chord_sequence: Dict[Tuple[int, ...], str]
+                          ) -> DistanceTables:
+
+    """
+    A function to precompute every metric between every pair of scale and chord masks, in every key, including the chords stacked on each scale degree.
+    Transposing both masks by the same interval never changes a distance, so the voice leading of each pair is searched once and copied to its eleven transpositions.
+
+    Args:
+
+        scale_sequence: The dictionary containing scale intervals.
+        chord_sequence: The dictionary containing chord symbol suffixes keyed by chord intervals in semitones.
+
+    Return:
+
+        The distance tables, made read-only as they are shared by every caller.
+
+    """
+
+    names: Dict[int, List[str]] = {}
+
+    scale_masks: set = set()
+
+    chord_masks: set = set()
+
+    for root in range(NUM_PITCH_CLASSES):
+
+        for intervals, symbol in chord_sequence.items():
+
+            mask: int = intervals_to_mask(intervals=intervals, start_position=root)
+
+            names.setdefault(mask, []).append(f"{CHROMATIC_SCALE[root]}{symbol}")
+
+            chord_masks.add(mask)
+
+    # Named before the stacked chords, so that an inversion of a named chord keeps its chord symbol
+    named_chord_masks: set = set(chord_masks)
+
+    for root in range(NUM_PITCH_CLASSES):
+
+        for scale_type, intervals in scale_sequence.items():
+
+            mask = intervals_to_mask(intervals=intervals, start_position=root)
+
+            names.setdefault(mask, []).append(f"{CHROMATIC_SCALE[root]} {scale_type}")
+
+            scale_masks.add(mask)
+
+            scale_pitch_classes: List[int] = mask_to_pitch_classes(mask=mask, start_position=root)
+
+            # Chords stacked on the degrees of some scales, such as the pentatonic scales, have no chord symbol and are named by their intervals
+            for degree_intervals in chord_intervals.values():
+
+                for chord_root, chord_mask in zip(scale_pitch_classes, chord_masks_from_scale_mask(scale_mask=mask, start_position=root, intervals=degree_intervals)):
+
+                    if chord_mask in named_chord_masks:
+
+                        continue
+
+                    chord_name: str = f"{CHROMATIC_SCALE[chord_root]}{tuple(sorted((pitch_class - chord_root) % NUM_PITCH_CLASSES for pitch_class in mask_to_pitch_classes(mask=chord_mask)))}"
+
+                    if chord_name not in names.setdefault(chord_mask, []):
+
+                        names[chord_mask].append(chord_name)
+
+                    chord_masks.add(chord_mask)
+
+    masks: Tuple[int, ...] = tuple(sorted(names))
+
+    index: Dict[int, int] = {mask: position for position, mask in enumerate(masks)}
+
+    mask_array: np.ndarray = np.array(masks, dtype=np.int32)
+
+    # Set operations broadcast a column of masks against a row of masks
+    common_tones: np.ndarray = _POPCOUNTS[mask_array[:, None] & mask_array[None, :]]
+
+    hamming: np.ndarray = _POPCOUNTS[mask_array[:, None] ^ mask_array[None, :]]
+
+    interval_vectors: np.ndarray = np.array([interval_vector(mask=mask) for mask in masks], dtype=np.int16)
+
+    interval_vector_distances: np.ndarray = np.abs(interval_vectors[:, None, :] - interval_vectors[None, :, :]).sum(axis=2).astype(np.uint8)
+
+    voice_leading: np.ndarray = np.zeros((len(masks), len(masks)), dtype=np.uint8)
+
+    searched: np.ndarray = np.zeros((len(masks), len(masks)), dtype=bool)
+
+    pitch_classes: List[List[int]] = [mask_to_pitch_classes(mask=mask) for mask in masks]
+
+    for from_position, from_mask in enumerate(masks):
+
+        for to_position in range(from_position, len(masks)):
+
+            if searched[from_position, to_position]:
+
+                continue
+
+            cost: int = minimal_voice_leading(from_pitch_classes=pitch_classes[from_position], to_pitch_classes=pitch_classes[to_position])[0]
+
+            # Every key of the library holds the same scales and chords, so each transposition of the pair is present
+            for semitones in range(NUM_PITCH_CLASSES):
+
+                from_transposed: int = index[rotate_mask(mask=from_mask, semitones=semitones)]
+
+                to_transposed: int = index[rotate_mask(mask=masks[to_position], semitones=semitones)]
+
+                voice_leading[from_transposed, to_transposed] = voice_leading[to_transposed, from_transposed] = cost
+
+                searched[from_transposed, to_transposed] = searched[to_transposed, from_transposed] = True
+
+    tables: DistanceTables = DistanceTables(masks=masks,
+                                            index=index,
+                                            names={mask: tuple(mask_names) for mask, mask_names in names.items()},
+                                            is_scale=np.array([mask in scale_masks for mask in masks]),
+                                            is_chord=np.array([mask in chord_masks for mask in masks]),
+                                            voice_leading=voice_leading,
+                                            common_tones=common_tones,
+                                            hamming=hamming,
+                                            interval_vector=interval_vector_distances)
+
+    for array in tables[3:]:
+
+        array.setflags(write=False)
+
+    return tables
+
+def get_distance_tables(scale_sequence: Dict[str, Tuple[int, ...]] = scale_intervals,
+                        chord_sequence: Dict[Tuple[int, ...], str] = chord_symbols
+                        ) -> DistanceTables:
+
+    """
+    A function to retrieve the distance tables for a scale and chord dictionary, building them on first use.
+
+    Args:
+
+        scale_sequence: The dictionary containing scale intervals.
+        chord_sequence: The dictionary containing chord symbol suffixes keyed by chord intervals in semitones.
+
+    Return:
+
+        The distance tables.
+
+    """
+
+    tables: DistanceTables = get_or_build_table(build_distance_tables, scale_sequence, chord_sequence)
+
+    return tables
+
+def mask_distance(from_mask: int,
+                  to_mask: int,
+                  metric: str = "voice_leading",
+                  tables: Optional[DistanceTables] = None
+                  ) -> int:
+
+    """
+    A function to look up a metric between two pitch class masks, computing it only when a mask is not a library scale or chord.
+
+    Args:
+
+        from_mask: The first pitch class mask.
+        to_mask: The second pitch class mask.
+        metric: The name of the metric, one of METRICS.
+        tables: The distance tables, defaulting to those of the library.
+
+    Return:
+
+        The value of the metric.
+
+    """
+
+    if metric not in METRICS:
+
+        raise ValueError(f"Unknown metric {metric}, expected one of {', '.join(METRICS)}")
+
+    tables = tables if tables is not None else get_distance_tables()
+
+    from_position: Optional[int] = tables.index.get(from_mask)
+
+    to_position: Optional[int] = tables.index.get(to_mask)
+
+    if from_position is not None and to_position is not None:
+
+        return int(getattr(tables, metric)[from_position, to_position])
+
+    if metric == "voice_leading":
+
+        return minimal_voice_leading(from_pitch_classes=mask_to_pitch_classes(mask=from_mask), to_pitch_classes=mask_to_pitch_classes(mask=to_mask))[0]
+
+    if metric == "common_tones":
+
+        return int(_POPCOUNTS[from_mask & to_mask])
+
+    if metric == "hamming":
+
+        return int(_POPCOUNTS[from_mask ^ to_mask])
+
+    return sum(abs(from_count - to_count) for from_count, to_count in zip(interval_vector(mask=from_mask), interval_vector(mask=to_mask)))
+
+def distance(from_notes: Sequence[str],
+             to_notes: Sequence[str],
+             metric: str = "voice_leading"
+             ) -> int:
+
+    """
+    A function to measure how far apart two scales or chords are.
+
+    Args:
+
+        from_notes: The notes of the first scale or chord.
+        to_notes: The notes of the second scale or chord.
+        metric: The name of the metric, one of METRICS.
+
+    Return:
+
+        The value of the metric.
+
+    """
+
+    return mask_distance(from_mask=notes_to_mask(notes=from_notes), to_mask=notes_to_mask(notes=to_notes), metric=metric)
+
+def voice_leading(from_notes: Sequence[str],
+                  to_notes: Sequence[str]
+                  ) -> Tuple[int, List[Tuple[str, str]]]:
+
+    """
+    A function to find the smoothest voice leading from one chord to another, spelling each voice as the chords do.
+
+    Args:
+
+        from_notes: The notes of the first chord.
+        to_notes: The notes of the second chord.
+
+    Return:
+
+        A tuple of the total number of semitones moved and a list of pairs of from and to notes, one per voice.
+
+    """
+
+    from_spellings: Dict[int, str] = {PITCH_CLASSES[note]: note for note in from_notes}
+
+    to_spellings: Dict[int, str] = {PITCH_CLASSES[note]: note for note in to_notes}
+
+    cost, pairs = minimal_voice_leading(from_pitch_classes=list(from_spellings), to_pitch_classes=list(to_spellings))
+
+    return cost, [(from_spellings[from_pitch_class], to_spellings[to_pitch_class]) for from_pitch_class, to_pitch_class in pairs]
+
+def common_tones(from_notes: Sequence[str],
+                 to_notes: Sequence[str]
+                 ) -> List[str]:
+
+    """
+    A function to list the notes of a scale or chord whose pitch class is also in another.
+
+    Args:
+
+        from_notes: The notes of the first scale or chord.
+        to_notes: The notes of the second scale or chord.
+
+    Return:
+
+        A list of notes of the first scale or chord, in its order.
+
+    """
+
+    to_mask: int = notes_to_mask(notes=to_notes)
+
+    return [note for note in from_notes if to_mask >> PITCH_CLASSES[note] & 1]
+
+def nearest(notes: Sequence[str],
+            metric: str = "voice_leading",
+            count: int = 5,
+            kind: Optional[str] = None
+            ) -> List[Tuple[int, Tuple[str, ...]]]:
+
+    """
+    A function to find the library scales or chords nearest to some notes, by reading one row of a distance table.
+
+    Args:
+
+        notes: The notes of the scale or chord.
+        metric: The name of the metric, one of METRICS.
+        count: The number of results.
+        kind: "scale" or "chord" to search only scales or only chords, or None for both.
+
+    Return:
+
+        A list of tuples of the value of the metric and the names of the scales or chords sharing a mask, nearest first, excluding the notes themselves.
+
+    """
+
+    if metric not in METRICS:
+
+        raise ValueError(f"Unknown metric {metric}, expected one of {', '.join(METRICS)}")
+
+    tables: DistanceTables = get_distance_tables()
+
+    mask: int = notes_to_mask(notes=notes)
+
+    position: Optional[int] = tables.index.get(mask)
+
+    if position is not None:
+
+        row: np.ndarray = getattr(tables, metric)[position]
+
+    else:
+
+        row = np.array([mask_distance(from_mask=mask, to_mask=to_mask, metric=metric, tables=tables) for to_mask in tables.masks])
+
+    eligible: np.ndarray = np.array(tables.masks) != mask
+
+    if kind is not None:
+
+        eligible &= tables.is_scale if kind == "scale" else tables.is_chord
+
+    # Rows are unsigned, so they are widened before common tones are negated to sort the most shared first, and a stable sort keeps equally near masks in ascending order
+    order: np.ndarray = np.argsort(row.astype(np.int16) * METRICS[metric], kind="stable")
+
+    return [(int(row[to_position]), tables.names[tables.masks[to_position]]) for to_position in order if eligible[to_position]][:count]
+
+def rank(notes: Sequence[str],
+         candidates: Sequence[Sequence[str]],
+         metric: str = "voice_leading"
+         ) -> List[Tuple[int, int]]:
+
+    """
+    A function to order candidate scales or chords by their distance from some notes, such as the chords of a key as next chords in a progression.
+
+    Args:
+
+        notes: The notes of the scale or chord.
+        candidates: A sequence of candidate scales or chords, each a sequence of notes.
+        metric: The name of the metric, one of METRICS.
+
+    Return:
+
+        A list of tuples of the value of the metric and the position of the candidate, nearest first.
+
+    """
+
+    tables: DistanceTables = get_distance_tables()
+
+    mask: int = notes_to_mask(notes=notes)
+
+    distances: List[Tuple[int, int]] = [(mask_distance(from_mask=mask, to_mask=notes_to_mask(notes=candidate), metric=metric, tables=tables), position) for position, candidate in enumerate(candidates)]
+
+    return sorted(distances, key=lambda item: (item[0] * METRICS[metric], item[1]))
+
+def smoothest_path(slots: Sequence[Sequence[Sequence[str]]]) -> Tuple[int, List[int]]:
+
+    """
+    A function to choose one chord for each step of a progression, from the alternatives of each step, moving the voices the fewest semitones in total.
+    Only the best path into each alternative of a step is kept, so the search grows with the number of steps rather than the number of paths.
+
+    Args:
+
+        slots: A sequence of steps, each a sequence of alternative chords, each a sequence of notes.
+
+    Return:
+
+        A tuple of the total number of semitones moved and a list of the position of the chosen alternative in each step.
+
+    """
+
+    if not slots:
+
+        return 0, []
+
+    tables: DistanceTables = get_distance_tables()
+
+    masks: List[List[int]] = [[notes_to_mask(notes=chord) for chord in alternatives] for alternatives in slots]
+
+    costs: List[int] = [0] * len(masks[0])
+
+    back_pointers: List[List[int]] = []
+
+    for step in range(1, len(masks)):
+
+        step_costs: List[int] = []
+
+        step_pointers: List[int] = []
+
+        for to_mask in masks[step]:
+
+            best_cost, best_position = min((costs[from_position] + mask_distance(from_mask=from_mask, to_mask=to_mask, tables=tables), from_position) for from_position, from_mask in enumerate(masks[step - 1]))
+
+            step_costs.append(best_cost)
+
+            step_pointers.append(best_position)
+
+        costs = step_costs
+
+        back_pointers.append(step_pointers)
+
+    # Follows the best path back from the cheapest final chord
+    total, position = min((cost, position) for position, cost in enumerate(costs))
+
+    path: List[int] = [position]
+
+    for step_pointers in reversed(back_pointers):
+
+        position = step_pointers[position]
+
+        path.append(position)
+
+    return total, path[::-1]
+
+
+
+if __name__ == "__main__":
+
+    print("--------------------")
+
+    demo_scale_notes = ScaleGenerator().get_or_generate_scale(scale_key="C", scale_type=ScaleTypes.MAJOR_SCALE)
+
+    demo_chord_notes = ChordGenerator().get_or_generate_chord(scale_notes=demo_scale_notes, scale_type=ScaleTypes.MAJOR_SCALE, chord_type=ChordTypes.SEVENTH)
+
+    print(voice_leading(from_notes=demo_chord_notes["ii7"], to_notes=demo_chord_notes["V7"]))
+
+    print(common_tones(from_notes=demo_chord_notes["V7"], to_notes=demo_chord_notes["Imaj7"]))
+
+    print(distance(from_notes=demo_chord_notes["V7"], to_notes=demo_chord_notes["Imaj7"], metric="interval_vector"))
+
+    print("--------------------")
+
+    print(nearest(notes=demo_scale_notes, metric="hamming", kind="scale"))
+
+    print(nearest(notes=demo_chord_notes["V7"], kind="chord"))
+
+    print(rank(notes=demo_chord_notes["Imaj7"], candidates=list(demo_chord_notes.values())))
+
+    print("--------------------")
+
+    # Each step offers a chord of the key or its tritone substitution
+    print(smoothest_path(slots=[[demo_chord_notes["ii7"]], [demo_chord_notes["V7"], ("Db", "F", "Ab", "Cb")], [demo_chord_notes["Imaj7"]]]))
+
+    print("--------------------")
@@ -0,0 +1,156 @@
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import List, Dict, Tuple, Any, Optional, Callable
+
+from config.config import CHROMATIC_SCALE
+from app.library.tunings import tunings
+from app.library.enums import ChordTypes
+from app.cache import LRUCache
+from app.scale_generator import ScaleGenerator
+from app.chord_generator import ChordGenerator
+from app.scale_fretboard import ScaleFretboard
+from app.chord_fretboard import ChordFretboard
+from app.binary_catalogue import BinaryCatalogue, BinaryCatalogueCache
+from app.build_catalogue import build_catalogue
+from benchmarks.bench_hot_paths import summarise, time_calls, scale_types
+
+def build_string_calls(cache: Any) -> List[Callable[[], Any]]:
+
+    """
+    A function to list a scale strings and chord strings lookup for every key, scale type, chord type and tuning, against one cache.
+
+    Args:
+
+        cache: The cache backend the fretboard generators store their strings in.
+
+    Return:
+
+        A list of zero argument callables.
+
+    """
+
+    scale_generator: ScaleGenerator = ScaleGenerator()
+    chord_generator: ChordGenerator = ChordGenerator()
+    scale_fretboard: ScaleFretboard = ScaleFretboard(cache=cache)
+    chord_fretboard: ChordFretboard = ChordFretboard(cache=cache)
+
+    calls: List[Callable[[], Any]] = []
+
+    for tuning in tunings.values():
+
+        for scale_key in CHROMATIC_SCALE:
+
+            for scale_type in scale_types():
+
+                scale_notes = scale_generator.get_or_generate_scale(scale_key=scale_key, scale_type=scale_type)
+
+                calls.append(lambda scale_notes=scale_notes, scale_type=scale_type, tuning=tuning: scale_fretboard.get_or_generate_scale_strings(scale_notes=scale_notes, scale_type=scale_type, tuning=tuning))
+
+                for chord_type in ChordTypes:
+
+                    chord_notes = chord_generator.get_or_generate_chord(scale_notes=scale_notes, scale_type=scale_type, chord_type=chord_type)
+
+                    calls.append(lambda scale_notes=scale_notes, scale_type=scale_type, chord_notes=chord_notes, chord_type=chord_type, tuning=tuning: chord_fretboard.get_or_generate_chord_strings(scale_notes=scale_notes, scale_type=scale_type, chord_notes=chord_notes, chord_type=chord_type, tuning=tuning))
+
+    return calls
+
+def bench_rows(catalogue: BinaryCatalogue,
+               num_reads: int
+               ) -> Dict[str, float]:
+
+    """
+    A function to time random reads of single fretboard rows.
+
+    Args:
+
+        catalogue: The open binary catalogue.
+        num_reads: The number of rows to read.
+
+    Return:
+
+        A per read summary.
+
+    """
+
+    generator: random.Random = random.Random(0)
+
+    requests: List[Tuple[Any, ...]] = []
+
+    for _ in range(num_reads):
+
+        scale_type = generator.choice(scale_types())
+
+        tuning_name: str = generator.choice(list(catalogue.tunings))
+
+        requests.append((generator.choice(CHROMATIC_SCALE), scale_type, tuning_name, generator.randrange(len(catalogue.tunings[tuning_name]))))
+
+    return summarise(samples_ns=time_calls(calls=[lambda request=request: catalogue.row(scale_key=request[0], scale_type=request[1], tuning_name=request[2], string_index=request[3]) for request in requests]))
+
+def main(argv: Optional[List[str]] = None) -> None:
+
+    """
+    A function to build a binary catalogue and compare its lookups with the in-memory cache, reporting the results as JSON.
+
+    """
+
+    parser = argparse.ArgumentParser(description="Binary catalogue benchmark")
+    parser.add_argument("--reads", type=int, default=100000, help="Number of random row reads")
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Any] = {}
+
+    with tempfile.TemporaryDirectory() as catalogue_directory:
+
+        path: str = os.path.join(catalogue_directory, "catalogue.fbc")
+
+        start: int = time.perf_counter_ns()
+
+        results["records"] = build_catalogue(path=path)
+
+        results["build_ms"] = (time.perf_counter_ns() - start) / 1e6
+
+        results["file_bytes"] = os.path.getsize(path)
+
+        start = time.perf_counter_ns()
+
+        catalogue_cache: BinaryCatalogueCache = BinaryCatalogueCache(path=path, fallback=LRUCache(max_entries=None))
+
+        results["open_ms"] = (time.perf_counter_ns() - start) / 1e6
+
+        results["row_read"] = bench_rows(catalogue=catalogue_cache.catalogue, num_reads=args.reads)
+
+        # The in-memory cache is timed cold, as each worker process fills its own, and warm
+        memory_calls: List[Callable[[], Any]] = build_string_calls(cache=LRUCache(max_entries=None))
+
+        results["memory_cache"] = {"cold": summarise(samples_ns=time_calls(calls=memory_calls)), "warm": summarise(samples_ns=time_calls(calls=memory_calls))}
+
+        # The first lookup also indexes the catalogue masks
+        catalogue_calls: List[Callable[[], Any]] = build_string_calls(cache=catalogue_cache)
+
+        results["catalogue_cache"] = {"cold": summarise(samples_ns=time_calls(calls=catalogue_calls)), "warm": summarise(samples_ns=time_calls(calls=catalogue_calls))}
+
+        # Bytes each worker process holds once every lookup has been made, measured on separate caches as estimating sizes slows the lookups
+        for name, cache in (("memory_cache", LRUCache(max_entries=None, max_bytes=sys.maxsize)), ("catalogue_cache", BinaryCatalogueCache(path=path, fallback=LRUCache(max_entries=None, max_bytes=sys.maxsize)))):
+
+            for call in build_string_calls(cache=cache):
+
+                call()
+
+            results[name]["process_bytes"] = cache.cache_info().nbytes
+
+        catalogue_cache.catalogue.close()
+
+    json.dump(results, sys.stdout, indent=2)
+
+    print()
+
+
+
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,181 @@
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Tuple, Any, Optional
+
+from config.config import CHROMATIC_SCALE
+from app.library.tunings import tunings
+from app.library.enums import ScaleTypes, ChordTypes
+from app.cache import CacheBackend, LRUCache
+from app.scale_generator import ScaleGenerator
+from app.chord_generator import ChordGenerator
+from app.chord_fretboard import ChordFretboard
+from app.thread_safe import ThreadSafeGenerators
+from benchmarks.bench_hot_paths import scale_types
+
+class _SharedGenerators:
+
+    """
+    The generators sharing one check-then-set cache, as before the thread safe facade, standing in as the baseline.
+
+    """
+
+    def __init__(self,
+                 cache: CacheBackend
+                 ) -> None:
+
+        self._scale_generator: ScaleGenerator = ScaleGenerator(cache=cache)
+        self._chord_generator: ChordGenerator = ChordGenerator(cache=cache)
+        self._chord_fretboard: ChordFretboard = ChordFretboard(cache=cache)
+
+    def get_or_generate_scale(self, **kwargs) -> Any:
+
+        return self._scale_generator.get_or_generate_scale(**kwargs)
+
+    def get_or_generate_chord(self, **kwargs) -> Any:
+
+        return self._chord_generator.get_or_generate_chord(**kwargs)
+
+    def get_or_generate_chord_strings(self, **kwargs) -> Any:
+
+        return self._chord_fretboard.get_or_generate_chord_strings(**kwargs)
+
+def build_requests() -> List[Tuple[str, ScaleTypes, ChordTypes]]:
+
+    """
+    A function to list one chord fretboard request for every key, scale type and chord type.
+
+    Return:
+
+        A list of tuples of scale key, scale type and chord type.
+
+    """
+
+    return [(scale_key, scale_type, chord_type) for scale_key in CHROMATIC_SCALE for scale_type in scale_types() for chord_type in ChordTypes]
+
+def run_burst(generators: Any,
+              requests: List[Tuple[str, ScaleTypes, ChordTypes]],
+              num_threads: int,
+              tuning: Tuple[str, ...]
+              ) -> float:
+
+    """
+    A function to release every thread at once against cold caches, each thread making the same requests in the same order, as hot keys arriving at a threaded web server.
+
+    Args:
+
+        generators: The generators under test.
+        requests: The requests each thread makes.
+        num_threads: The number of threads.
+        tuning: The tuning of the chord fretboards.
+
+    Return:
+
+        The wall time of the burst in seconds.
+
+    """
+
+    barrier: threading.Barrier = threading.Barrier(num_threads + 1)
+
+    def worker() -> None:
+
+        barrier.wait()
+
+        for scale_key, scale_type, chord_type in requests:
+
+            scale_notes = generators.get_or_generate_scale(scale_key=scale_key, scale_type=scale_type)
+
+            chord_notes = generators.get_or_generate_chord(scale_notes=scale_notes, scale_type=scale_type, chord_type=chord_type)
+
+            generators.get_or_generate_chord_strings(scale_notes=scale_notes, scale_type=scale_type, chord_notes=chord_notes, chord_type=chord_type, tuning=tuning)
+
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
+
+        futures: List[Any] = [executor.submit(worker) for _ in range(num_threads)]
+
+        barrier.wait()
+
+        start: int = time.perf_counter_ns()
+
+        for future in futures:
+
+            future.result()
+
+        return (time.perf_counter_ns() - start) / 1e9
+
+def bench_contention(thread_counts: List[int],
+                     repeat: int
+                     ) -> Dict[str, Dict[str, Any]]:
+
+    """
+    A function to compare the shared check-then-set cache with the single flight facade across thread counts, counting computations and timing each burst.
+
+    Args:
+
+        thread_counts: The numbers of threads to run.
+        repeat: The number of bursts per thread count, each against fresh caches, of which the fastest is reported.
+
+    Return:
+
+        A dictionary, keyed by thread count, containing the wall time and number of computations of each approach.
+
+    """
+
+    requests: List[Tuple[str, ScaleTypes, ChordTypes]] = build_requests()
+
+    tuning: Tuple[str, ...] = tunings["e_standard"]
+
+    results: Dict[str, Dict[str, Any]] = {}
+
+    for num_threads in thread_counts:
+
+        runs: Dict[str, List[Tuple[float, int]]] = {"check_then_set": [], "single_flight": []}
+
+        for _ in range(repeat):
+
+            # Every miss of the baseline computes, so its misses count its computations
+            baseline_cache: LRUCache = LRUCache(max_entries=None)
+
+            wall_s: float = run_burst(generators=_SharedGenerators(cache=baseline_cache), requests=requests, num_threads=num_threads, tuning=tuning)
+
+            runs["check_then_set"].append((wall_s, baseline_cache.cache_info().misses))
+
+            # Only the first caller of each cache key computes, and its miss is the only one the backend sees
+            backend: LRUCache = LRUCache(max_entries=None)
+
+            wall_s = run_burst(generators=ThreadSafeGenerators(backend=backend), requests=requests, num_threads=num_threads, tuning=tuning)
+
+            runs["single_flight"].append((wall_s, backend.cache_info().misses))
+
+        results[str(num_threads)] = {name: {"wall_s": min(wall_s for wall_s, _ in samples), "computations": max(computations for _, computations in samples)} for name, samples in runs.items()}
+
+        results[str(num_threads)]["speedup"] = results[str(num_threads)]["check_then_set"]["wall_s"] / results[str(num_threads)]["single_flight"]["wall_s"]
+
+    return results
+
+def main(argv: Optional[List[str]] = None) -> None:
+
+    """
+    A function to run the contention benchmark and write the results as JSON.
+
+    """
+
+    parser = argparse.ArgumentParser(description="Thread contention benchmark of the generator caches")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32], help="Thread counts to run")
+    parser.add_argument("--repeat", type=int, default=3, help="Bursts per thread count")
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Any] = {"requests_per_thread": len(build_requests()), "threads": bench_contention(thread_counts=args.threads, repeat=args.repeat)}
+
+    json.dump(results, sys.stdout, indent=2)
+
+    print()
+
+
+
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,350 @@
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import List, Dict, Tuple, Callable, Any, Optional
+
+from config.config import CHROMATIC_SCALE, PITCH_CLASSES, FRETBOARD_LEN
+from app.library.intervals import scale_intervals
+from app.library.tunings import tunings
+from app.library.enums import ScaleTypes, ChordTypes, PositionSystems
+from app.cache import LRUCache, set_default_cache
+from app.scale_generator import ScaleGenerator
+from app.chord_generator import ChordGenerator
+from app.scale_fretboard import ScaleFretboard
+from app.chord_fretboard import ChordFretboard
+from app.scale_positions import ScalePositions, supports_tuning
+from app.utils import generate_string, determine_pattern_type
+
+# Extended range tunings, where an exhaustive fingering search would grow fastest
+EXTENDED_TUNINGS: Dict[str, Tuple[str, ...]] = {
+
+    "b_standard_7": ("B", "E", "A", "D", "G", "B", "E"),
+    "f_sharp_standard_8": ("F#", "B", "E", "A", "D", "G", "B", "E")
+
+}
+
+def summarise(samples_ns: List[int]) -> Dict[str, float]:
+
+    """
+    A function to summarise per-call timings.
+
+    Args:
+
+        samples_ns: A list of call durations in nanoseconds.
+
+    Return:
+
+        A dictionary of call count, total seconds and per-call statistics in microseconds.
+
+    """
+
+    ordered: List[int] = sorted(samples_ns)
+
+    return {
+
+        "calls": len(ordered),
+        "total_s": sum(ordered) / 1e9,
+        "mean_us": statistics.fmean(ordered) / 1e3,
+        "median_us": statistics.median(ordered) / 1e3,
+        "p95_us": ordered[int(len(ordered) * 0.95)] / 1e3,
+        "min_us": ordered[0] / 1e3,
+        "max_us": ordered[-1] / 1e3
+
+    }
+
+def time_calls(calls: List[Callable[[], Any]]) -> List[int]:
+
+    """
+    A function to time each call individually.
+
+    Args:
+
+        calls: A list of zero argument callables.
+
+    Return:
+
+        A list of call durations in nanoseconds.
+
+    """
+
+    samples_ns: List[int] = []
+
+    for call in calls:
+
+        start: int = time.perf_counter_ns()
+
+        call()
+
+        samples_ns.append(time.perf_counter_ns() - start)
+
+    return samples_ns
+
+def reset_caches() -> None:
+
+    """
+    A function to empty every cache a sweep could otherwise find warm: the process-wide cache backend and the memoised helpers of the package.
+    The process-wide backend is replaced with an empty one rather than cleared, so a persistent cache configured through the environment is left intact.
+
+    """
+
+    set_default_cache(LRUCache(max_entries=None))
+
+    for module_name, module in list(sys.modules.items()):
+
+        if module_name != "app" and not module_name.startswith("app."):
+
+            continue
+
+        for value in vars(module).values():
+
+            if callable(getattr(value, "cache_clear", None)) and getattr(value, "__module__", None) == module_name:
+
+                value.cache_clear()
+
+def scale_types() -> List[ScaleTypes]:
+
+    """
+    A function to list the scale types that have interval definitions, so the sweep never stops on a missing table entry.
+
+    Return:
+
+        A list of scale types.
+
+    """
+
+    return [scale_type for scale_type in ScaleTypes if scale_type.value in scale_intervals]
+
+def bench_cached(build_calls: Callable[[LRUCache], List[Callable[[], Any]]],
+                 repeat: int
+                 ) -> Dict[str, Dict[str, float]]:
+
+    """
+    A function to time a cached hot path over a full sweep, once against empty caches and once against the same caches when full.
+
+    Args:
+
+        build_calls: A function that receives a fresh cache and returns the calls of one sweep.
+        repeat: The number of sweeps, each with a fresh cache.
+
+    Return:
+
+        A dictionary with cold and warm summaries.
+
+    """
+
+    cold_ns: List[int] = []
+    warm_ns: List[int] = []
+
+    for _ in range(repeat):
+
+        # Shared caches and memoised helpers would otherwise stay warm from the previous sweep
+        reset_caches()
+
+        calls: List[Callable[[], Any]] = build_calls(LRUCache(max_entries=None))
+
+        cold_ns.extend(time_calls(calls=calls))
+
+        warm_ns.extend(time_calls(calls=calls))
+
+    return {"cold": summarise(samples_ns=cold_ns), "warm": summarise(samples_ns=warm_ns)}
+
+def bench_uncached(build_calls: Callable[[], List[Callable[[], Any]]],
+                   repeat: int
+                   ) -> Dict[str, Dict[str, float]]:
+
+    """
+    A function to time an uncached hot path over a full sweep.
+
+    Args:
+
+        build_calls: A function that returns the calls of one sweep.
+        repeat: The number of sweeps.
+
+    Return:
+
+        A dictionary with a single summary, reported as both cold and warm so runs compare uniformly.
+
+    """
+
+    samples_ns: List[int] = []
+
+    for _ in range(repeat):
+
+        samples_ns.extend(time_calls(calls=build_calls()))
+
+    summary: Dict[str, float] = summarise(samples_ns=samples_ns)
+
+    return {"cold": summary, "warm": summary}
+
+def run_benchmarks(repeat: int) -> Dict[str, Dict[str, Dict[str, float]]]:
+
+    """
+    A function to run every hot path benchmark over all keys, scale types, chord types and tunings.
+
+    Args:
+
+        repeat: The number of sweeps per benchmark.
+
+    Return:
+
+        A dictionary, keyed by benchmark name, containing cold and warm summaries.
+
+    """
+
+    # Inputs shared by the downstream benchmarks are computed once, outside the timings
+    reference_scales: Dict[Tuple[str, ScaleTypes], List[str]] = {(scale_key, scale_type): ScaleGenerator(cache=LRUCache(max_entries=None)).get_or_generate_scale(scale_key=scale_key, scale_type=scale_type)
+                                                                  for scale_key in CHROMATIC_SCALE for scale_type in scale_types()}
+
+    reference_generator: ChordGenerator = ChordGenerator(cache=LRUCache(max_entries=None))
+
+    reference_chords: Dict[Tuple[str, ScaleTypes, ChordTypes], Dict[str, List[str]]] = {(scale_key, scale_type, chord_type): reference_generator.get_or_generate_chord(scale_notes=scale_notes, scale_type=scale_type, chord_type=chord_type)
+                                                                                        for (scale_key, scale_type), scale_notes in reference_scales.items() for chord_type in ChordTypes}
+
+    frets: range = range(FRETBOARD_LEN)
+
+    def scale_generator_calls(cache: LRUCache) -> List[Callable[[], Any]]:
+
+        generator: ScaleGenerator = ScaleGenerator(cache=cache)
+
+        return [lambda scale_key=scale_key, scale_type=scale_type: generator.get_or_generate_scale(scale_key=scale_key, scale_type=scale_type)
+                for scale_key, scale_type in reference_scales]
+
+    def chord_generator_calls(cache: LRUCache) -> List[Callable[[], Any]]:
+
+        generator: ChordGenerator = ChordGenerator(cache=cache)
+
+        return [lambda scale_type=scale_type, chord_type=chord_type, scale_notes=reference_scales[(scale_key, scale_type)]: generator.get_or_generate_chord(scale_notes=scale_notes, scale_type=scale_type, chord_type=chord_type)
+                for scale_key, scale_type, chord_type in reference_chords]
+
+    def scale_fretboard_calls(cache: LRUCache) -> List[Callable[[], Any]]:
+
+        fretboard: ScaleFretboard = ScaleFretboard(cache=cache)
+
+        return [lambda scale_type=scale_type, scale_notes=scale_notes, tuning=tuning: fretboard.get_or_generate_scale_strings(scale_notes=scale_notes, scale_type=scale_type, tuning=tuning)
+                for (scale_key, scale_type), scale_notes in reference_scales.items() for tuning in tunings.values()]
+
+    def chord_fretboard_calls(cache: LRUCache) -> List[Callable[[], Any]]:
+
+        fretboard: ChordFretboard = ChordFretboard(cache=cache)
+
+        return [lambda scale_type=scale_type, chord_type=chord_type, chord_notes=chord_notes, tuning=tuning, scale_notes=reference_scales[(scale_key, scale_type)]: fretboard.get_or_generate_chord_strings(scale_notes=scale_notes, scale_type=scale_type, chord_notes=chord_notes, chord_type=chord_type, tuning=tuning)
+                for (scale_key, scale_type, chord_type), chord_notes in reference_chords.items() for tuning in tunings.values()]
+
+    def scale_position_calls(cache: LRUCache) -> List[Callable[[], Any]]:
+
+        positions: ScalePositions = ScalePositions(cache=cache)
+
+        return [lambda scale_notes=scale_notes, tuning=tuning, position_system=position_system: list(positions.get_or_generate_positions(scale_notes=scale_notes, tuning=tuning, position_system=position_system))
+                for scale_notes in reference_scales.values() for tuning in [*tunings.values(), *EXTENDED_TUNINGS.values()] for position_system in PositionSystems
+                if supports_tuning(position_system=position_system, tuning=tuning)]
+
+    def generate_string_calls() -> List[Callable[[], Any]]:
+
+        return [lambda scale_notes=scale_notes, root_note=root_note: generate_string(start_position=PITCH_CLASSES[root_note], note_sequence=CHROMATIC_SCALE, scale_or_chord=scale_notes, frets=frets)
+                for scale_notes in reference_scales.values() for tuning in tunings.values() for root_note in tuning]
+
+    def determine_pattern_type_calls() -> List[Callable[[], Any]]:
+
+        return [lambda scale_notes=scale_notes: determine_pattern_type(note_sequence=scale_notes, interval_sequence=scale_intervals)
+                for scale_notes in reference_scales.values()]
+
+    return {
+
+        "ScaleGenerator.get_or_generate_scale": bench_cached(build_calls=scale_generator_calls, repeat=repeat),
+        "ChordGenerator.get_or_generate_chord": bench_cached(build_calls=chord_generator_calls, repeat=repeat),
+        "ScaleFretboard.get_or_generate_scale_strings": bench_cached(build_calls=scale_fretboard_calls, repeat=repeat),
+        "ChordFretboard.get_or_generate_chord_strings": bench_cached(build_calls=chord_fretboard_calls, repeat=repeat),
+        "ScalePositions.get_or_generate_positions": bench_cached(build_calls=scale_position_calls, repeat=repeat),
+        "generate_string": bench_uncached(build_calls=generate_string_calls, repeat=repeat),
+        "determine_pattern_type": bench_uncached(build_calls=determine_pattern_type_calls, repeat=repeat)
+
+    }
+
+def compare(baseline: Dict[str, Any],
+            candidate: Dict[str, Any]
+            ) -> None:
+
+    """
+    A function to print the median speed-up of a candidate run over a baseline run, per benchmark.
+
+    Args:
+
+        baseline: A previous run, as written by this script.
+        candidate: A later run, as written by this script.
+
+    """
+
+    for name, phases in candidate["benchmarks"].items():
+
+        if name not in baseline["benchmarks"]:
+
+            continue
+
+        for phase in ("cold", "warm"):
+
+            before: float = baseline["benchmarks"][name][phase]["median_us"]
+
+            after: float = phases[phase]["median_us"]
+
+            print(f"{name:<48} {phase:<5} {before:10.2f} us -> {after:10.2f} us   x{before / after if after else float('inf'):.2f}")
+
+def main(argv: Optional[List[str]] = None) -> None:
+
+    """
+    A function to run the benchmark suite and write the results as JSON, or to compare two earlier runs.
+
+    """
+
+    parser = argparse.ArgumentParser(description="Generator and fretboard hot path benchmarks")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of sweeps per benchmark")
+    parser.add_argument("--output", default="-", help="JSON output path, or - for stdout")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CANDIDATE"), help="Compare two earlier JSON runs instead of benchmarking")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+
+        with open(args.compare[0]) as baseline_file, open(args.compare[1]) as candidate_file:
+
+            compare(baseline=json.load(baseline_file), candidate=json.load(candidate_file))
+
+        return
+
+    results: Dict[str, Any] = {
+
+        "meta": {
+
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": sys.version,
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "keys": len(CHROMATIC_SCALE),
+            "scale_types": [scale_type.value for scale_type in scale_types()],
+            "chord_types": [chord_type.value for chord_type in ChordTypes],
+            "tunings": list(tunings)
+
+        },
+
+        "benchmarks": run_benchmarks(repeat=args.repeat)
+
+    }
+
+    if args.output == "-":
+
+        json.dump(results, sys.stdout, indent=2)
+
+        print()
+
+    else:
+
+        with open(args.output, "w") as output_file:
+
+            json.dump(results, output_file, indent=2)
+
+
+
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import List, Dict
+
+# Cold import budgets in milliseconds, measured by the interpreter's own import timer
+IMPORT_BUDGETS_MS: Dict[str, float] = {
+
+    "app": 10.0,
+    "app.library": 10.0,
+    "app.scale_generator": 40.0,
+    "app.print_fretboard": 60.0
+
+}
+
+PROJECT_ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def measure_import_ms(module_name: str) -> float:
+
+    """
+    A function to measure the cold import time of a module in a fresh interpreter, excluding interpreter startup.
+
+    Args:
+
+        module_name: The dotted name of the module to be imported.
+
+    Return:
+
+        The cumulative import time of the module in milliseconds.
+
+    """
+
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+                               cwd=PROJECT_ROOT,
+                               capture_output=True,
+                               text=True,
+                               check=True)
+
+    # Each line reads "import time: self | cumulative | name", the top level module being reported last
+    for line in reversed(completed.stderr.splitlines()):
+
+        fields: List[str] = [field.strip() for field in line.split("|")]
+
+        if len(fields) == 3 and fields[2] == module_name:
+
+            return int(fields[1]) / 1000
+
+    raise RuntimeError(f"No import time reported for {module_name}")
+
+def main() -> None:
+
+    """
+    A function to time cold imports against their budgets, exiting with status 1 if any median exceeds its budget.
+
+    """
+
+    parser = argparse.ArgumentParser(description="Cold import time benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of fresh interpreters per module")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier applied to every budget, for slower machines")
+    args = parser.parse_args()
+
+    failed: bool = False
+
+    for module_name, budget_ms in IMPORT_BUDGETS_MS.items():
+
+        median_ms: float = statistics.median(measure_import_ms(module_name=module_name) for _ in range(args.repeat))
+
+        within_budget: bool = median_ms <= budget_ms * args.scale
+
+        failed = failed or not within_budget
+
+        print(f"{module_name:<24} {median_ms:8.2f} ms   budget {budget_ms * args.scale:8.2f} ms   {'ok' if within_budget else 'OVER BUDGET'}")
+
+    sys.exit(1 if failed else 0)
+
+
+
+if __name__ == "__main__":
+
+    main()
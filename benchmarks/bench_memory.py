@@ -0,0 +1,188 @@
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from typing import List, Dict, Callable, Any, Optional
+
+from config.config import CHROMATIC_SCALE, PITCH_CLASSES, FRETBOARD_LEN
+from app.library.intervals import scale_intervals
+from app.library.tunings import tunings
+from app.library.enums import ScaleTypes, ChordTypes
+from app.cache import LRUCache, get_default_cache
+from app.scale_generator import ScaleGenerator
+from app.chord_generator import ChordGenerator
+from app.fretboard import Fretboard
+
+def legacy_string(start_position: int,
+                  notes: List[str]
+                  ) -> List[str]:
+
+    """
+    A function to build a guitar string representation the way results were stored before the value types, with a freshly formatted string per fret.
+
+    Args:
+
+        start_position: The pitch class of the open string.
+        notes: The scale notes or chord notes.
+
+    Return:
+
+        A list of formatted notes.
+
+    """
+
+    return [f"{CHROMATIC_SCALE[(start_position + fret) % len(CHROMATIC_SCALE)]:<2}" if CHROMATIC_SCALE[(start_position + fret) % len(CHROMATIC_SCALE)] in notes else "__"
+            for fret in range(FRETBOARD_LEN)]
+
+def build_legacy_catalogue() -> List[Any]:
+
+    """
+    A function to build the full catalogue from lists and dictionaries, as every generator returned before the value types.
+
+    Return:
+
+        A list of every scale, chord set, scale fretboard and chord fretboard.
+
+    """
+
+    scale_generator: ScaleGenerator = ScaleGenerator(cache=LRUCache(max_entries=None))
+
+    chord_generator: ChordGenerator = ChordGenerator(cache=LRUCache(max_entries=None))
+
+    catalogue: List[Any] = []
+
+    for scale_key in CHROMATIC_SCALE:
+
+        for scale_type in ScaleTypes:
+
+            if scale_type.value not in scale_intervals:
+
+                continue
+
+            scale_notes: List[str] = list(scale_generator.get_or_generate_scale(scale_key=scale_key, scale_type=scale_type))
+
+            catalogue.append(scale_notes)
+
+            for tuning in tunings.values():
+
+                catalogue.append({root_note: legacy_string(start_position=PITCH_CLASSES[root_note], notes=scale_notes) for root_note in tuning})
+
+            for chord_type in ChordTypes:
+
+                chord_notes: Dict[str, List[str]] = {chord_degree: list(chord) for chord_degree, chord in chord_generator.get_or_generate_chord(scale_notes=scale_notes, scale_type=scale_type, chord_type=chord_type).items()}
+
+                catalogue.append(chord_notes)
+
+                for tuning in tunings.values():
+
+                    catalogue.append({chord_degree: {root_note: legacy_string(start_position=PITCH_CLASSES[root_note], notes=chord) for root_note in tuning}
+                                      for chord_degree, chord in chord_notes.items()})
+
+    return catalogue
+
+def build_catalogue() -> List[Any]:
+
+    """
+    A function to build the full catalogue from the immutable value types.
+
+    Return:
+
+        A list of every scale, chord set, scale fretboard and chord fretboard.
+
+    """
+
+    scale_generator: ScaleGenerator = ScaleGenerator(cache=LRUCache(max_entries=None))
+
+    chord_generator: ChordGenerator = ChordGenerator(cache=LRUCache(max_entries=None))
+
+    catalogue: List[Any] = []
+
+    for scale_key in CHROMATIC_SCALE:
+
+        for scale_type in ScaleTypes:
+
+            if scale_type.value not in scale_intervals:
+
+                continue
+
+            scale_notes = scale_generator.get_or_generate_scale(scale_key=scale_key, scale_type=scale_type)
+
+            catalogue.append(scale_notes)
+
+            for tuning in tunings.values():
+
+                catalogue.append(Fretboard(mask=scale_notes.mask, tuning=tuning))
+
+            for chord_type in ChordTypes:
+
+                chord_notes = chord_generator.get_or_generate_chord(scale_notes=scale_notes, scale_type=scale_type, chord_type=chord_type)
+
+                catalogue.append(chord_notes)
+
+                for tuning in tunings.values():
+
+                    catalogue.append({chord_degree: Fretboard(mask=chord.mask, tuning=tuning) for chord_degree, chord in chord_notes.items()})
+
+    return catalogue
+
+def measure(build_function: Callable[[], List[Any]]) -> Dict[str, Any]:
+
+    """
+    A function to measure the memory retained by a catalogue, including any cache entries created while building it.
+
+    Args:
+
+        build_function: A zero argument callable returning the catalogue.
+
+    Return:
+
+        A dictionary of retained bytes, peak bytes and top level entries.
+
+    """
+
+    # Shared fret cycles are part of the catalogue footprint, so none may survive from an earlier build
+    get_default_cache().clear()
+
+    gc.collect()
+
+    tracemalloc.start()
+
+    catalogue: List[Any] = build_function()
+
+    gc.collect()
+
+    retained, peak = tracemalloc.get_traced_memory()
+
+    tracemalloc.stop()
+
+    return {"entries": len(catalogue), "retained_bytes": retained, "peak_bytes": peak}
+
+def main(argv: Optional[List[str]] = None) -> None:
+
+    """
+    A function to report the full catalogue footprint before and after the immutable value types, as JSON.
+
+    """
+
+    parser = argparse.ArgumentParser(description="Full catalogue memory footprint, plain containers against value types")
+    parser.parse_args(argv)
+
+    results: Dict[str, Dict[str, Any]] = {
+
+        "legacy": measure(build_function=build_legacy_catalogue),
+        "value_types": measure(build_function=build_catalogue)
+
+    }
+
+    results["ratio"] = {"retained": results["legacy"]["retained_bytes"] / results["value_types"]["retained_bytes"]}
+
+    json.dump(results, sys.stdout, indent=2)
+
+    print()
+
+
+
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,181 @@
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import List, Dict, Any, Optional
+
+from config.config import CHROMATIC_SCALE, NUM_PITCH_CLASSES
+from app.library.intervals import scale_intervals, chord_symbols
+from app.chord_recogniser import ChordRecogniser, NoteEvent, read_events, get_recognition_table
+from app.utils import determine_pattern_type
+from benchmarks.bench_hot_paths import summarise
+
+def synthesise_session(path: str,
+                       num_events: int,
+                       seed: int = 0
+                       ) -> None:
+
+    """
+    A function to write a practice session of fast playing as an event file, standing in for a recording when none is supplied.
+    Random chords in random inversions are arpeggiated at sixteenth notes of 200 beats per minute, each note ringing into the next chord.
+
+    Args:
+
+        path: The path of the event file to write.
+        num_events: The number of note events to write.
+        seed: The random seed, so sessions are reproducible.
+
+    """
+
+    generator: random.Random = random.Random(seed)
+
+    chord_shapes: List[tuple] = list(chord_symbols)
+
+    step: float = 60 / 200 / 4
+
+    now: float = 0.0
+
+    held: List[int] = []
+
+    written: int = 0
+
+    with open(path, "w") as event_file:
+
+        while written < num_events:
+
+            intervals: tuple = generator.choice(chord_shapes)
+
+            root: int = 40 + generator.randrange(NUM_PITCH_CLASSES)
+
+            inversion: int = generator.randrange(len(intervals))
+
+            notes: List[int] = [root + interval + (NUM_PITCH_CLASSES if index < inversion else 0) for index, interval in enumerate(intervals)]
+
+            # The previous chord is released as the next one begins
+            for note in held:
+
+                event_file.write(json.dumps({"time": round(now, 4), "note": note, "on": False}) + "\n")
+
+                written += 1
+
+            held = sorted(notes)
+
+            for note in held:
+
+                event_file.write(json.dumps({"time": round(now, 4), "note": note, "on": True}) + "\n")
+
+                written += 1
+
+                now += step
+
+def replay(events: List[NoteEvent]) -> Dict[str, Any]:
+
+    """
+    A function to time the recogniser on every event of a session, and the same session matched by rebuilding a note list per event.
+
+    Args:
+
+        events: The note events of the session.
+
+    Return:
+
+        A dictionary of per event summaries for the streaming recogniser and the note list baseline.
+
+    """
+
+    recogniser: ChordRecogniser = ChordRecogniser()
+
+    streaming_ns: List[int] = []
+
+    for event in events:
+
+        start: int = time.perf_counter_ns()
+
+        recogniser.feed(event=event)
+
+        streaming_ns.append(time.perf_counter_ns() - start)
+
+    # The baseline keeps the held notes as a list and matches it whole after every event
+    patterns: Dict[str, tuple] = {**scale_intervals, **{symbol or "major": intervals for intervals, symbol in chord_symbols.items()}}
+
+    baseline_ns: List[int] = []
+
+    held: List[int] = []
+
+    for event in events:
+
+        start = time.perf_counter_ns()
+
+        if event.on and event.note not in held:
+
+            held.append(event.note)
+
+        elif not event.on and event.note in held:
+
+            held.remove(event.note)
+
+        if held:
+
+            determine_pattern_type(note_sequence=[CHROMATIC_SCALE[note % NUM_PITCH_CLASSES] for note in sorted(held)], interval_sequence=patterns)
+
+        baseline_ns.append(time.perf_counter_ns() - start)
+
+    return {"streaming": summarise(samples_ns=streaming_ns), "note_list_baseline": summarise(samples_ns=baseline_ns)}
+
+def main(argv: Optional[List[str]] = None) -> None:
+
+    """
+    A function to replay recorded event files through the streaming recogniser and report per event timings as JSON.
+
+    """
+
+    parser = argparse.ArgumentParser(description="Streaming chord recogniser replay benchmark")
+    parser.add_argument("event_files", nargs="*", help="JSON Lines event files, or none for a synthesised session")
+    parser.add_argument("--events", type=int, default=100000, help="Number of events in a synthesised session")
+    args = parser.parse_args(argv)
+
+    start: int = time.perf_counter_ns()
+
+    get_recognition_table()
+
+    results: Dict[str, Any] = {"table_build_ms": (time.perf_counter_ns() - start) / 1e6, "sessions": {}}
+
+    with tempfile.TemporaryDirectory() as session_directory:
+
+        event_files: List[str] = args.event_files
+
+        if not event_files:
+
+            event_files = [os.path.join(session_directory, "synthesised.jsonl")]
+
+            synthesise_session(path=event_files[0], num_events=args.events)
+
+        for event_file in event_files:
+
+            # End to end replay includes reading and parsing the file
+            start = time.perf_counter_ns()
+
+            recogniser: ChordRecogniser = ChordRecogniser()
+
+            num_events: int = sum(1 for _ in recogniser.recognise(events=read_events(path=event_file)))
+
+            elapsed_s: float = (time.perf_counter_ns() - start) / 1e9
+
+            session: Dict[str, Any] = replay(events=list(read_events(path=event_file)))
+
+            session["file_replay"] = {"events": num_events, "total_s": elapsed_s, "events_per_s": num_events / elapsed_s}
+
+            results["sessions"][os.path.basename(event_file)] = session
+
+    json.dump(results, sys.stdout, indent=2)
+
+    print()
+
+
+
+if __name__ == "__main__":
+
+    main()
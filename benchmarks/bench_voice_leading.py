@@ -0,0 +1,101 @@
+import argparse
+import json
+import sys
+import time
+from typing import List, Dict, Tuple, Any, Optional, Callable
+
+from config.config import CHROMATIC_SCALE
+from app.library.enums import ChordTypes
+from app.scale_generator import ScaleGenerator
+from app.chord_generator import ChordGenerator
+from app.utils import notes_to_mask, mask_to_pitch_classes
+from app.voice_leading import DistanceTables, build_distance_tables, get_distance_tables, mask_distance, minimal_voice_leading, smoothest_path
+from app.library.intervals import scale_intervals, chord_symbols
+from benchmarks.bench_hot_paths import summarise, time_calls, scale_types
+
+def build_chord_pairs() -> List[Tuple[int, int]]:
+
+    """
+    A function to list every pair of chords within each key, scale type and chord type, as when suggesting the next chord of a progression.
+
+    Return:
+
+        A list of tuples of from and to chord masks.
+
+    """
+
+    scale_generator: ScaleGenerator = ScaleGenerator()
+    chord_generator: ChordGenerator = ChordGenerator()
+
+    pairs: List[Tuple[int, int]] = []
+
+    for scale_key in CHROMATIC_SCALE:
+
+        for scale_type in scale_types():
+
+            scale_notes = scale_generator.get_or_generate_scale(scale_key=scale_key, scale_type=scale_type)
+
+            for chord_type in ChordTypes:
+
+                masks: List[int] = [notes_to_mask(notes=chord) for chord in chord_generator.get_or_generate_chord(scale_notes=scale_notes, scale_type=scale_type, chord_type=chord_type).values()]
+
+                pairs.extend((from_mask, to_mask) for from_mask in masks for to_mask in masks)
+
+    return pairs
+
+def main(argv: Optional[List[str]] = None) -> None:
+
+    """
+    A function to time building the distance tables and compare voice leading lookups in them with computing each pair, reporting the results as JSON.
+
+    """
+
+    parser = argparse.ArgumentParser(description="Voice leading distance table benchmark")
+    parser.add_argument("--path-steps", type=int, default=16, help="Steps of the progression searched for its smoothest path")
+    args = parser.parse_args(argv)
+
+    results: Dict[str, Any] = {}
+
+    start: int = time.perf_counter_ns()
+
+    tables: DistanceTables = build_distance_tables(scale_sequence=scale_intervals, chord_sequence=chord_symbols)
+
+    results["build_ms"] = (time.perf_counter_ns() - start) / 1e6
+
+    results["masks"] = len(tables.masks)
+
+    results["table_bytes"] = sum(array.nbytes for array in tables[3:])
+
+    # Warms the shared tables, as mask_distance reads them
+    get_distance_tables()
+
+    pairs: List[Tuple[int, int]] = build_chord_pairs()
+
+    results["pairs"] = len(pairs)
+
+    lookup_calls: List[Callable[[], Any]] = [lambda pair=pair: mask_distance(from_mask=pair[0], to_mask=pair[1]) for pair in pairs]
+
+    compute_calls: List[Callable[[], Any]] = [lambda pair=pair: minimal_voice_leading(from_pitch_classes=mask_to_pitch_classes(mask=pair[0]), to_pitch_classes=mask_to_pitch_classes(mask=pair[1])) for pair in pairs]
+
+    results["table_lookup"] = summarise(samples_ns=time_calls(calls=lookup_calls))
+
+    results["pairwise_compute"] = summarise(samples_ns=time_calls(calls=compute_calls))
+
+    # Every diatonic seventh chord of C major at every step
+    chords: List[Tuple[str, ...]] = list(ChordGenerator().get_or_generate_chord(scale_notes=ScaleGenerator().get_or_generate_scale(scale_key="C", scale_type=scale_types()[0]), scale_type=scale_types()[0], chord_type=ChordTypes.SEVENTH).values())
+
+    start = time.perf_counter_ns()
+
+    smoothest_path(slots=[chords] * args.path_steps)
+
+    results["smoothest_path_ms"] = (time.perf_counter_ns() - start) / 1e6
+
+    json.dump(results, sys.stdout, indent=2)
+
+    print()
+
+
+
+if __name__ == "__main__":
+
+    main()
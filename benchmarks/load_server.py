@@ -0,0 +1,233 @@
+import argparse
+import asyncio
+import itertools
+import json
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Dict, Any, Optional
+from urllib.parse import urlencode
+
+from config.config import CHROMATIC_SCALE
+from app.library.intervals import scale_intervals
+from app.library.tunings import tunings
+from app.library.enums import ChordTypes
+
+def build_targets() -> List[str]:
+
+    """
+    A function to build a mix of request targets covering every GET endpoint.
+
+    Return:
+
+        A list of request targets.
+
+    """
+
+    targets: List[str] = []
+
+    for scale_key, scale_type in itertools.product(CHROMATIC_SCALE, scale_intervals):
+
+        targets.append("/scale?" + urlencode({"key": scale_key, "scale_type": scale_type}))
+
+        for tuning in tunings:
+
+            targets.append("/scale_fretboard?" + urlencode({"key": scale_key, "scale_type": scale_type, "tuning": tuning}))
+
+            for chord_type in ChordTypes:
+
+                targets.append("/chord_fretboard?" + urlencode({"key": scale_key, "scale_type": scale_type, "chord_type": chord_type.value, "tuning": tuning}))
+
+        for chord_type in ChordTypes:
+
+            targets.append("/chord?" + urlencode({"key": scale_key, "scale_type": scale_type, "chord_type": chord_type.value}))
+
+    targets.append("/identify?" + urlencode({"notes": "C,D,E,F,G,A,B"}))
+
+    return targets
+
+async def run_client(host: str,
+                     port: int,
+                     targets: List[str],
+                     offset: int,
+                     deadline: float,
+                     latencies: List[float]
+                     ) -> int:
+
+    """
+    A function to send requests over one keep-alive connection until the deadline, recording each latency.
+
+    Args:
+
+        host: The server host.
+        port: The server port.
+        targets: The request targets, cycled through.
+        offset: The index of the first target, so clients spread across the targets.
+        deadline: The monotonic time at which to stop.
+        latencies: A list receiving each latency in seconds.
+
+    Return:
+
+        The number of non 200 responses.
+
+    """
+
+    reader, writer = await asyncio.open_connection(host=host, port=port)
+
+    errors: int = 0
+
+    for target in itertools.islice(itertools.cycle(targets), offset, None):
+
+        if time.monotonic() >= deadline:
+
+            break
+
+        start: float = time.perf_counter()
+
+        writer.write(f"GET {target} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode("latin-1"))
+
+        status_line: bytes = await reader.readline()
+
+        content_length: int = 0
+
+        while True:
+
+            header_line: bytes = await reader.readline()
+
+            if header_line in (b"\r\n", b""):
+
+                break
+
+            name, _, value = header_line.decode("latin-1").partition(":")
+
+            if name.lower() == "content-length":
+
+                content_length = int(value)
+
+        await reader.readexactly(content_length)
+
+        latencies.append(time.perf_counter() - start)
+
+        if status_line.split()[1] != b"200":
+
+            errors += 1
+
+    writer.close()
+
+    return errors
+
+async def run_load(host: str,
+                   port: int,
+                   connections: int,
+                   duration: float
+                   ) -> Dict[str, Any]:
+
+    """
+    A function to drive the server with concurrent keep-alive clients for a fixed duration.
+
+    Return:
+
+        A dictionary of throughput and latency statistics.
+
+    """
+
+    targets: List[str] = build_targets()
+
+    latencies: List[float] = []
+
+    start: float = time.monotonic()
+
+    errors: List[int] = await asyncio.gather(*(run_client(host=host, port=port, targets=targets, offset=index * len(targets) // connections, deadline=start + duration, latencies=latencies)
+                                               for index in range(connections)))
+
+    elapsed: float = time.monotonic() - start
+
+    ordered: List[float] = sorted(latencies)
+
+    return {
+
+        "connections": connections,
+        "duration_s": elapsed,
+        "requests": len(ordered),
+        "errors": sum(errors),
+        "requests_per_s": len(ordered) / elapsed,
+        "p50_ms": statistics.median(ordered) * 1e3 if ordered else None,
+        "p99_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1e3 if ordered else None
+
+    }
+
+async def wait_for_server(host: str,
+                          port: int,
+                          timeout: float = 10.0
+                          ) -> None:
+
+    """
+    A function to wait until the server accepts connections.
+
+    """
+
+    deadline: float = time.monotonic() + timeout
+
+    while True:
+
+        try:
+
+            _, writer = await asyncio.open_connection(host=host, port=port)
+
+            writer.close()
+
+            return
+
+        except OSError:
+
+            if time.monotonic() >= deadline:
+
+                raise
+
+            await asyncio.sleep(0.05)
+
+def main(argv: Optional[List[str]] = None) -> None:
+
+    """
+    A function to measure requests per second and p99 latency against a local instance, optionally starting one.
+
+    """
+
+    parser = argparse.ArgumentParser(description="Load generator for app.server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load")
+    parser.add_argument("--spawn", action="store_true", help="Start a local server for the duration of the run")
+    args = parser.parse_args(argv)
+
+    server: Optional[subprocess.Popen] = None
+
+    if args.spawn:
+
+        server = subprocess.Popen([sys.executable, "-m", "app.server", "--host", args.host, "--port", str(args.port)])
+
+    try:
+
+        asyncio.run(wait_for_server(host=args.host, port=args.port))
+
+        results: Dict[str, Any] = asyncio.run(run_load(host=args.host, port=args.port, connections=args.connections, duration=args.duration))
+
+    finally:
+
+        if server is not None:
+
+            server.terminate()
+
+            server.wait()
+
+    json.dump(results, sys.stdout, indent=2)
+
+    print()
+
+
+
+if __name__ == "__main__":
+
+    main()
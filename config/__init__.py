@@ -1,10 +1,22 @@
-from config.config import CHROMATIC_SCALE, FRETBOARD_LEN, NUM_FRETS, FRETS
+from config.config import CHROMATIC_SCALE, NUM_PITCH_CLASSES, LETTER_NAMES, NATURAL_PITCH_CLASSES, ACCIDENTALS, ACCIDENTAL_ALIASES, PITCH_CLASSES, NOTE_SPELLINGS, PITCH_CLASS_MASK, NUM_MASKS, FRETBOARD_LEN, NUM_FRETS, FRETS, CACHE_MAX_ENTRIES, CACHE_MAX_BYTES, CACHE_PATH
 
 __all__ = [
 
     "CHROMATIC_SCALE",
+    "NUM_PITCH_CLASSES",
+    "LETTER_NAMES",
+    "NATURAL_PITCH_CLASSES",
+    "ACCIDENTALS",
+    "ACCIDENTAL_ALIASES",
+    "PITCH_CLASSES",
+    "NOTE_SPELLINGS",
+    "PITCH_CLASS_MASK",
+    "NUM_MASKS",
     "FRETBOARD_LEN",
     "NUM_FRETS",
-    "FRETS"
+    "FRETS",
+    "CACHE_MAX_ENTRIES",
+    "CACHE_MAX_BYTES",
+    "CACHE_PATH"
     
 ]
@@ -1,8 +1,31 @@
-from typing import List
+import os
+import sys
+from typing import List, Dict, Optional
 
 CHROMATIC_SCALE: List[str] = ["C", "C#", "D", "Eb", "E", "F", "F#", "G", "Ab", "A", "Bb", "B"]
 
+NUM_PITCH_CLASSES: int = len(CHROMATIC_SCALE)
+
+LETTER_NAMES: List[str] = ["C", "D", "E", "F", "G", "A", "B"]
+NATURAL_PITCH_CLASSES: Dict[str, int] = {"C": 0, "D": 2, "E": 4, "F": 5, "G": 7, "A": 9, "B": 11}
+ACCIDENTALS: Dict[str, int] = {"": 0, "#": 1, "b": -1, "##": 2, "bb": -2}
+ACCIDENTAL_ALIASES: Dict[str, str] = {"": "", "#": "#", "♯": "#", "b": "b", "♭": "b", "##": "##", "x": "##", "♯♯": "##", "𝄪": "##", "bb": "bb", "♭♭": "bb", "𝄫": "bb"}
+
+# Every spelling of every note, including enharmonic spellings such as Db and E#, mapped to its pitch class
+PITCH_CLASSES: Dict[str, int] = {sys.intern(LETTER + ACCIDENTAL): (NATURAL_PITCH_CLASSES[LETTER] + OFFSET) % NUM_PITCH_CLASSES for LETTER in LETTER_NAMES for ACCIDENTAL, OFFSET in ACCIDENTALS.items()}
+
+# Accepted note names, including lowercase letters and unicode accidentals, mapped to the interned spelling used throughout
+NOTE_SPELLINGS: Dict[str, str] = {CASE + ALIAS: sys.intern(LETTER + ACCIDENTAL) for LETTER in LETTER_NAMES for CASE in (LETTER, LETTER.lower()) for ALIAS, ACCIDENTAL in ACCIDENTAL_ALIASES.items()}
+
+PITCH_CLASS_MASK: int = (1 << NUM_PITCH_CLASSES) - 1
+NUM_MASKS: int = 1 << NUM_PITCH_CLASSES
+
 FRETBOARD_LEN = 16
 
 NUM_FRETS: int = FRETBOARD_LEN
 FRETS: List[str] = [f"{FRET:<2}" for FRET in range(NUM_FRETS)]
+
+CACHE_MAX_ENTRIES: Optional[int] = 4096
+CACHE_MAX_BYTES: Optional[int] = None
+CACHE_PATH: Optional[str] = os.environ.get("FRETBOARD_CACHE_PATH") or None
+CATALOGUE_PATH: Optional[str] = os.environ.get("FRETBOARD_CATALOGUE_PATH") or None
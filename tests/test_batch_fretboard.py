@@ -0,0 +1,43 @@
+from typing import List
+
+from app.library.tunings import tunings
+from app.library.enums import ScaleTypes, ChordTypes
+from app.cache import LRUCache
+from app.scale_generator import ScaleGenerator
+from app.chord_generator import ChordGenerator
+from app.scale_fretboard import ScaleFretboard
+from app.chord_fretboard import ChordFretboard
+from app.batch_fretboard import BatchFretboard, FretboardRequest
+
+def test_formatted_fretboards_match_the_generators() -> None:
+
+    cache: LRUCache = LRUCache()
+
+    requests: List[FretboardRequest] = []
+
+    expected: List[dict] = []
+
+    # Gb major spells Cb, and G# harmonic minor spells F##
+    for scale_key, scale_type in (("Gb", ScaleTypes.MAJOR_SCALE), ("G#", ScaleTypes.HARMONIC_MINOR), ("D", ScaleTypes.NATURAL_MINOR)):
+
+        scale_notes = ScaleGenerator(cache=cache).get_or_generate_scale(scale_key=scale_key, scale_type=scale_type)
+
+        requests.append(FretboardRequest(scale_key=scale_key, scale_type=scale_type, tuning=tunings["e_standard"]))
+
+        expected.append(ScaleFretboard(cache=cache).get_or_generate_scale_strings(scale_notes=scale_notes, scale_type=scale_type, tuning=tunings["e_standard"]).to_dict())
+
+        chord_notes = ChordGenerator(cache=cache).get_or_generate_chord(scale_notes=scale_notes, scale_type=scale_type, chord_type=ChordTypes.TRIAD)
+
+        chord_strings = ChordFretboard(cache=cache).get_or_generate_chord_strings(scale_notes=scale_notes, scale_type=scale_type, chord_notes=chord_notes, chord_type=ChordTypes.TRIAD, tuning=tunings["e_standard"])
+
+        for chord_degree_index, chord_degree in enumerate(chord_notes):
+
+            requests.append(FretboardRequest(scale_key=scale_key, scale_type=scale_type, tuning=tunings["e_standard"], chord_type=ChordTypes.TRIAD, chord_degree=chord_degree_index))
+
+            expected.append(chord_strings[chord_degree].to_dict())
+
+    batch_fretboard: BatchFretboard = BatchFretboard()
+
+    formatted: List[dict] = list(batch_fretboard.iter_formatted_fretboards(fretboards=batch_fretboard.compute_fretboards(requests=requests), requests=requests))
+
+    assert [{root_note: tuple(string) for root_note, string in strings.items()} for strings in formatted] == expected
@@ -0,0 +1,43 @@
+import subprocess
+from typing import List, Dict, Any
+
+import pytest
+
+from app.cache import LRUCache
+from app.binary_catalogue import BinaryCatalogueCache
+from app.build_catalogue import build_catalogue
+from tests.test_imports import module_names, run_python
+from tests.test_cache_backends import sweep
+
+@pytest.fixture(scope="module")
+def catalogue_path(tmp_path_factory) -> str:
+
+    path: str = str(tmp_path_factory.mktemp("catalogue") / "catalogue.fbc")
+
+    build_catalogue(path=path)
+
+    return path
+
+def test_binary_catalogue_cache_round_trip(catalogue_path: str) -> None:
+
+    expected: List[Any] = sweep(cache=LRUCache())
+
+    cache: BinaryCatalogueCache = BinaryCatalogueCache(path=catalogue_path, fallback=LRUCache())
+
+    results: List[Any] = sweep(cache=cache)
+
+    assert results == expected
+
+    assert [type(result) for result in results] == [type(result) for result in expected]
+
+    # Strings in catalogued tunings are answered from the catalogue rather than computed
+    assert cache.cache_info().hits > 0
+
+@pytest.mark.parametrize("module_name", module_names())
+def test_import_with_catalogue_path(module_name: str, catalogue_path: str) -> None:
+
+    environment: Dict[str, str] = {"FRETBOARD_CATALOGUE_PATH": catalogue_path}
+
+    completed: subprocess.CompletedProcess = run_python(arguments=["-c", f"import {module_name}"], environment=environment)
+
+    assert completed.returncode == 0, completed.stderr
@@ -0,0 +1,82 @@
+from typing import List, Any
+
+import pytest
+
+from app.library.tunings import tunings
+from app.library.enums import ScaleTypes, ChordTypes
+from app.cache import CacheBackend, LRUCache
+from app.persistent_cache import SQLiteCache
+from app.scale_generator import ScaleGenerator
+from app.chord_generator import ChordGenerator
+from app.scale_fretboard import ScaleFretboard
+from app.chord_fretboard import ChordFretboard
+
+def sweep(cache: CacheBackend) -> List[Any]:
+
+    """
+    A function to compute scales, chords and their fretboard strings through one cache backend, including a double accidental spelling and a tuning outside the library.
+
+    Args:
+
+        cache: The cache backend shared by every generator.
+
+    Return:
+
+        A list of every result, in a fixed order.
+
+    """
+
+    scale_generator: ScaleGenerator = ScaleGenerator(cache=cache)
+    chord_generator: ChordGenerator = ChordGenerator(cache=cache)
+    scale_fretboard: ScaleFretboard = ScaleFretboard(cache=cache)
+    chord_fretboard: ChordFretboard = ChordFretboard(cache=cache)
+
+    results: List[Any] = []
+
+    for scale_key, scale_type in (("C", ScaleTypes.MAJOR_SCALE), ("A", ScaleTypes.NATURAL_MINOR), ("G#", ScaleTypes.HARMONIC_MINOR)):
+
+        scale_notes = scale_generator.get_or_generate_scale(scale_key=scale_key, scale_type=scale_type)
+
+        results.append(scale_notes)
+
+        for tuning in (tunings["e_standard"], ("D", "A", "D", "G", "B", "E")):
+
+            results.append(scale_fretboard.get_or_generate_scale_strings(scale_notes=scale_notes, scale_type=scale_type, tuning=tuning))
+
+            for chord_type in (ChordTypes.TRIAD, ChordTypes.SEVENTH):
+
+                chord_notes = chord_generator.get_or_generate_chord(scale_notes=scale_notes, scale_type=scale_type, chord_type=chord_type)
+
+                results.append(chord_notes)
+
+                results.append(chord_fretboard.get_or_generate_chord_strings(scale_notes=scale_notes, scale_type=scale_type, chord_notes=chord_notes, chord_type=chord_type, tuning=tuning))
+
+    return results
+
+@pytest.fixture(scope="module")
+def expected() -> List[Any]:
+
+    return sweep(cache=LRUCache())
+
+def test_sqlite_cache_round_trip(tmp_path, expected: List[Any]) -> None:
+
+    path: str = str(tmp_path / "cache.sqlite")
+
+    writer: SQLiteCache = SQLiteCache(path=path)
+
+    assert sweep(cache=writer) == expected
+
+    writer.close()
+
+    # A new connection with an empty front cache reads every value back from the database
+    reader: SQLiteCache = SQLiteCache(path=path)
+
+    results: List[Any] = sweep(cache=reader)
+
+    assert results == expected
+
+    assert [type(result) for result in results] == [type(result) for result in expected]
+
+    assert reader.cache_info().misses == 0
+
+    reader.close()
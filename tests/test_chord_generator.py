@@ -0,0 +1,24 @@
+from typing import List
+
+from app.library.enums import ScaleTypes, ChordTypes
+from app.scale_generator import ScaleGenerator
+from app.chord_generator import ChordGenerator
+
+SOLFEGE: List[str] = ["Do", "Do#", "Re", "Re#", "Mi", "Fa", "Fa#", "Sol", "Sol#", "La", "La#", "Si"]
+
+def test_custom_chromatic_scale_chords() -> None:
+
+    scale_notes = ScaleGenerator(chromatic_scale=SOLFEGE).get_or_generate_scale(scale_key="Re", scale_type=ScaleTypes.MAJOR_SCALE)
+
+    chord_notes = ChordGenerator(chromatic_scale=SOLFEGE).get_or_generate_chord(scale_notes=scale_notes, scale_type=ScaleTypes.MAJOR_SCALE, chord_type=ChordTypes.TRIAD)
+
+    assert list(chord_notes.values())[0] == ("Re", "Fa#", "La")
+
+    assert list(chord_notes.values())[6] == ("Do#", "Mi", "Sol")
+
+    # The same chords named by the default chromatic scale
+    default_notes = ScaleGenerator().get_or_generate_scale(scale_key="D", scale_type=ScaleTypes.MAJOR_SCALE)
+
+    default_chords = ChordGenerator().get_or_generate_chord(scale_notes=default_notes, scale_type=ScaleTypes.MAJOR_SCALE, chord_type=ChordTypes.TRIAD)
+
+    assert list(chord_notes.keys()) == list(default_chords.keys())
@@ -0,0 +1,18 @@
+import json
+from typing import List
+
+from app.chord_recogniser import read_events
+
+def test_read_events_octaves_follow_the_letter(tmp_path) -> None:
+
+    path: str = str(tmp_path / "events.jsonl")
+
+    with open(path, "w") as event_file:
+
+        for note in ("C4", "Cb4", "B#3", "Bbb3", 61):
+
+            event_file.write(json.dumps({"time": 0.0, "note": note, "on": True}) + "\n")
+
+    notes: List[int] = [event.note for event in read_events(path=path)]
+
+    assert notes == [60, 59, 60, 57, 61]
@@ -0,0 +1,40 @@
+import itertools
+from typing import List, Tuple, Optional, Sequence
+
+from config.config import PITCH_CLASSES, NUM_PITCH_CLASSES
+from app.library.tunings import tunings
+from app.cache import LRUCache
+from app.chord_voicings import ChordVoicings
+
+def count_fingers(voicing: Sequence[Optional[int]]) -> int:
+
+    # Every note on the lowest fretted fret is played as one barre
+    frets: List[int] = [fret for fret in voicing if fret]
+
+    return len([fret for fret in frets if fret != min(frets)]) + 1 if frets else 0
+
+def test_voicings_match_an_exhaustive_search() -> None:
+
+    tuning: Tuple[str, ...] = tunings["e_standard"][:4]
+
+    chord_notes: List[str] = ["A", "C", "E", "G"]
+
+    num_frets: int = 8
+
+    for max_fingers in (1, 2, 3):
+
+        voicings = ChordVoicings(cache=LRUCache(), num_frets=num_frets).get_or_generate_voicings(chord_notes=chord_notes, tuning=tuning, max_span=3, max_fingers=max_fingers, root_in_bass=False)
+
+        expected: List[Tuple[Optional[int], ...]] = []
+
+        for voicing in itertools.product([None, *range(num_frets)], repeat=len(tuning)):
+
+            fretted: List[int] = [fret for fret in voicing if fret]
+
+            sounding = {(PITCH_CLASSES[root_note] + fret) % NUM_PITCH_CLASSES for root_note, fret in zip(tuning, voicing) if fret is not None}
+
+            if sounding == {PITCH_CLASSES[note] for note in chord_notes} and (not fretted or max(fretted) - min(fretted) <= 3) and count_fingers(voicing=voicing) <= max_fingers:
+
+                expected.append(voicing)
+
+        assert sorted(voicings, key=repr) == sorted(expected, key=repr)
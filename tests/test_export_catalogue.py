@@ -0,0 +1,36 @@
+import json
+import os
+from typing import Dict, Tuple, Any
+
+from app.library.tunings import tunings
+from app.export_catalogue import export_catalogue, shard_path
+
+def test_resume_skips_only_matching_shards(tmp_path) -> None:
+
+    output_dir: str = str(tmp_path)
+
+    first: Dict[str, Any] = export_catalogue(output_dir=output_dir, catalogue_tunings=dict(tunings), workers=2)
+
+    assert first["skipped"] == 0 and first["stale"] == 0
+
+    # A killed worker leaves its temporary file behind
+    orphan: str = f"{shard_path(output_dir=output_dir, shard=('C', 'major_scale'))}.12345.tmp"
+
+    open(orphan, "w").close()
+
+    resumed: Dict[str, Any] = export_catalogue(output_dir=output_dir, catalogue_tunings=dict(tunings), workers=2)
+
+    assert resumed["shards"] == 0 and resumed["skipped"] == first["shards"]
+
+    assert not os.path.exists(orphan)
+
+    # Other tunings make every earlier shard stale
+    extra_tunings: Dict[str, Tuple[str, ...]] = {**tunings, "drop_d": ("D", "A", "D", "G", "B", "E")}
+
+    changed: Dict[str, Any] = export_catalogue(output_dir=output_dir, catalogue_tunings=extra_tunings, workers=2)
+
+    assert changed["stale"] == first["shards"] and changed["shards"] == first["shards"]
+
+    with open(shard_path(output_dir=output_dir, shard=("C", "major_scale"))) as file:
+
+        assert "drop_d" in {json.loads(line)["tuning_name"] for line in file}
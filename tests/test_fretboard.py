@@ -0,0 +1,33 @@
+from typing import Iterator
+
+import pytest
+
+from app.library.tunings import tunings
+from app.cache import CacheBackend, LRUCache, get_default_cache, set_default_cache
+from app.fretboard import get_or_generate_fretboard
+
+@pytest.fixture
+def default_cache() -> Iterator[CacheBackend]:
+
+    # Swaps in an empty process-wide cache, restoring the original afterwards
+    original: CacheBackend = get_default_cache()
+
+    cache: LRUCache = LRUCache()
+
+    set_default_cache(cache)
+
+    yield cache
+
+    set_default_cache(original)
+
+def test_fretboard_cycle_uses_supplied_cache(default_cache: CacheBackend) -> None:
+
+    cache: LRUCache = LRUCache()
+
+    fretboard = get_or_generate_fretboard(mask=0xAB5, tuning=tunings["e_standard"], cache=cache)
+
+    assert fretboard.cycle.obj is get_or_generate_fretboard(mask=0xAB5, tuning=tunings["open_c"], cache=cache).cycle.obj
+
+    assert cache.cache_info("FretboardCycle").currsize == 1
+
+    assert default_cache.cache_info().currsize == 0
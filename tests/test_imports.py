@@ -0,0 +1,72 @@
+import os
+import pkgutil
+import subprocess
+import sys
+from typing import List, Dict
+
+import pytest
+
+import app
+import app.library
+
+# The repository root, from which the subprocesses import the package
+ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def module_names() -> List[str]:
+
+    """
+    A function to list every module of the package and its library.
+
+    Return:
+
+        A list of dotted module names.
+
+    """
+
+    return [module.name for package in (app, app.library) for module in pkgutil.iter_modules(package.__path__, prefix=f"{package.__name__}.") if not module.ispkg and module.name != "app.__main__"]
+
+def run_python(arguments: List[str],
+               environment: Dict[str, str]
+               ) -> subprocess.CompletedProcess:
+
+    """
+    A function to run a fresh interpreter from the repository root, so that every import starts from an empty module table.
+
+    Args:
+
+        arguments: The interpreter arguments.
+        environment: The environment variables to set on top of the current ones.
+
+    Return:
+
+        The completed process.
+
+    """
+
+    return subprocess.run([sys.executable, *arguments], cwd=ROOT, env={**os.environ, **environment}, capture_output=True, text=True, timeout=120)
+
+@pytest.fixture
+def cache_environment(tmp_path) -> Dict[str, str]:
+
+    return {"FRETBOARD_CACHE_PATH": str(tmp_path / "cache.sqlite")}
+
+
+@pytest.mark.parametrize("module_name", module_names())
+def test_import_with_cache_path(module_name: str, cache_environment: Dict[str, str]) -> None:
+
+    completed: subprocess.CompletedProcess = run_python(arguments=["-c", f"import {module_name}"], environment=cache_environment)
+
+    assert completed.returncode == 0, completed.stderr
+
+def test_export_catalogue_cli_with_cache_path(cache_environment: Dict[str, str]) -> None:
+
+    completed: subprocess.CompletedProcess = run_python(arguments=["-m", "app.export_catalogue", "--help"], environment=cache_environment)
+
+    assert completed.returncode == 0, completed.stderr
+
+def test_import_creates_no_generators() -> None:
+
+    # Importing the catalogue tools, as build_catalogue does for load_tunings, must not build generators or the default cache
+    completed: subprocess.CompletedProcess = run_python(arguments=["-c", "import app.build_catalogue, app.export_catalogue, app.cache; assert app.export_catalogue._worker_generators is None and app.cache._default_cache is None"], environment={})
+
+    assert completed.returncode == 0, completed.stderr
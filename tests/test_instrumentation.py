@@ -0,0 +1,42 @@
+from typing import Dict, Any
+
+import app.instrumentation as instrumentation
+from app.library.tunings import tunings
+from app.library.enums import ScaleTypes, ChordTypes
+from app.cache import LRUCache
+from app.scale_generator import ScaleGenerator
+from app.chord_generator import ChordGenerator
+from app.scale_fretboard import ScaleFretboard
+from app.chord_fretboard import ChordFretboard
+
+def test_lookups_are_reported_per_pattern() -> None:
+
+    cache: LRUCache = LRUCache()
+
+    instrumentation.reset()
+
+    instrumentation.enable()
+
+    try:
+
+        # Relative scales share content addressed cache entries, but are still reported under their own scale type
+        for scale_key, scale_type in (("C", ScaleTypes.MAJOR_SCALE), ("A", ScaleTypes.NATURAL_MINOR)):
+
+            scale_notes = ScaleGenerator(cache=cache).get_or_generate_scale(scale_key=scale_key, scale_type=scale_type)
+
+            ScaleFretboard(cache=cache).get_or_generate_scale_strings(scale_notes=scale_notes, scale_type=scale_type, tuning=tunings["e_standard"])
+
+            chord_notes = ChordGenerator(cache=cache).get_or_generate_chord(scale_notes=scale_notes, scale_type=scale_type, chord_type=ChordTypes.TRIAD)
+
+            ChordFretboard(cache=cache).get_or_generate_chord_strings(scale_notes=scale_notes, scale_type=scale_type, chord_notes=chord_notes, chord_type=ChordTypes.TRIAD, tuning=tunings["e_standard"])
+
+    finally:
+
+        instrumentation.disable()
+
+    patterns: Dict[str, Any] = instrumentation.snapshot()["patterns"]
+
+    assert {"major_scale/-", "major_scale/triad", "natural_minor/-", "natural_minor/triad"} <= set(patterns)
+
+    # The relative minor's scale strings are served from the major scale's entry
+    assert patterns["natural_minor/-"]["hits"] >= 1
@@ -0,0 +1,33 @@
+import io
+from typing import List
+
+from app.library.tunings import tunings
+from app.library.enums import ScaleTypes
+from app.scale_generator import ScaleGenerator
+from app.scale_fretboard import ScaleFretboard
+from app.print_fretboard import render_fretboard
+from app.transposition import transpose
+
+def test_double_accidentals_keep_frets_aligned() -> None:
+
+    # G# harmonic minor raises its seventh degree to F##
+    scale_notes = ScaleGenerator().get_or_generate_scale(scale_key="G#", scale_type=ScaleTypes.HARMONIC_MINOR)
+
+    scale_strings = ScaleFretboard().get_or_generate_scale_strings(scale_notes=scale_notes, scale_type=ScaleTypes.HARMONIC_MINOR, tuning=tunings["e_standard"])
+
+    stream: io.StringIO = io.StringIO()
+
+    render_fretboard(stream=stream, strings=scale_strings, tuning=tunings["e_standard"], fret_marker=True)
+
+    lines: List[str] = stream.getvalue().splitlines()
+
+    assert "F##" in lines[0]
+
+    assert len({len(line) for line in lines}) == 1
+
+    # Transposing to and from a key without double accidentals restores the padding of each key
+    a_strings = ScaleFretboard().get_or_generate_scale_strings(scale_notes=transpose(value=scale_notes, from_key="G#", to_key="A"), scale_type=ScaleTypes.HARMONIC_MINOR, tuning=tunings["e_standard"])
+
+    assert transpose(value=scale_strings, from_key="G#", to_key="A") == a_strings
+
+    assert transpose(value=a_strings, from_key="A", to_key="G#") == scale_strings
@@ -0,0 +1,37 @@
+from typing import List
+
+import pytest
+
+from app.library.tunings import tunings
+from app.library.enums import ScaleTypes, PositionSystems
+from app.cache import LRUCache
+from app.scale_generator import ScaleGenerator
+from app.scale_positions import ScalePositions, Position
+
+def test_caged_shapes_move_open_position_boxes() -> None:
+
+    scale_notes = ScaleGenerator(cache=LRUCache()).get_or_generate_scale(scale_key="G", scale_type=ScaleTypes.MAJOR_SCALE)
+
+    positions: List[Position] = list(ScalePositions(cache=LRUCache()).get_or_generate_positions(scale_notes=scale_notes, tuning=tunings["e_standard"], position_system=PositionSystems.CAGED))
+
+    # The G, E, D, C and A shapes, each the open position box of its chord moved up to G
+    assert [min(min(frets) for frets in position if frets) for position in positions] == [0, 3, 5, 7, 10]
+
+    assert positions[1] == ((3, 5, 7), (3, 5, 7), (4, 5, 7), (4, 5), (3, 5, 7), (3, 5, 7))
+
+def test_caged_shapes_follow_standard_family_tunings() -> None:
+
+    scale_positions: ScalePositions = ScalePositions(cache=LRUCache())
+
+    scale_notes = ScaleGenerator(cache=LRUCache()).get_or_generate_scale(scale_key="G", scale_type=ScaleTypes.MAJOR_SCALE)
+
+    standard: List[Position] = list(scale_positions.get_or_generate_positions(scale_notes=scale_notes, tuning=tunings["e_standard"], position_system=PositionSystems.CAGED))
+
+    # A seven string guitar adds a low B string beneath the same shapes
+    seven_string: List[Position] = list(scale_positions.get_or_generate_positions(scale_notes=scale_notes, tuning=("B", *tunings["e_standard"]), position_system=PositionSystems.CAGED))
+
+    assert [position[1:] for position in seven_string] == standard
+
+    with pytest.raises(ValueError):
+
+        scale_positions.get_or_generate_positions(scale_notes=scale_notes, tuning=tunings["open_c"], position_system=PositionSystems.CAGED)
@@ -0,0 +1,37 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Tuple, Any, Optional
+
+import app.server as server
+from app.server import FretboardServer, run_batch
+
+def failing_pattern_type(**kwargs: Any) -> str:
+
+    raise TypeError("unexpected")
+
+def test_batch_reports_malformed_and_failed_queries(monkeypatch) -> None:
+
+    monkeypatch.setattr(server, "determine_pattern_type", failing_pattern_type)
+
+    results: List[Dict[str, Any]] = run_batch(queries=[{"endpoint": "/scale", "params": {"key": "C", "scale_type": "major_scale"}},
+                                                       {"endpoint": "/scale", "params": {"key": 1}},
+                                                       "/scale",
+                                                       {"endpoint": "/scale", "params": {"key": "C"}},
+                                                       {"endpoint": "/identify", "params": {"notes": "C,E,G"}}])
+
+    assert results[0]["result"]["scale_notes"][0] == "C"
+
+    assert [result.get("status") for result in results[1:]] == [400, 400, 400, 500]
+
+def test_unexpected_errors_are_answered(monkeypatch) -> None:
+
+    monkeypatch.setattr(server, "determine_pattern_type", failing_pattern_type)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+
+        fretboard_server: FretboardServer = FretboardServer(executor=executor)
+
+        response: Tuple[int, bytes, Optional[str]] = asyncio.run(fretboard_server._dispatch(method="GET", target="/identify?notes=C,E,G", body=b"", if_none_match=None))
+
+    assert response[0] == 500 and "error" in json.loads(response[1])
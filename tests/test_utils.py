@@ -0,0 +1,22 @@
+from typing import Dict, Tuple, List
+
+from app.utils import get_or_build_table
+
+def count_patterns(interval_sequence: Dict[str, Tuple[int, ...]]) -> List[str]:
+
+    return sorted(interval_sequence)
+
+def test_tables_are_rebuilt_after_in_place_changes() -> None:
+
+    interval_sequence: Dict[str, Tuple[int, ...]] = {"major_triad": (0, 4, 7)}
+
+    table: List[str] = get_or_build_table(count_patterns, interval_sequence)
+
+    assert get_or_build_table(count_patterns, interval_sequence) is table
+
+    interval_sequence["minor_triad"] = (0, 3, 7)
+
+    assert get_or_build_table(count_patterns, interval_sequence) == ["major_triad", "minor_triad"]
+
+    # An equal dictionary with its own id builds its own table
+    assert get_or_build_table(count_patterns, dict(interval_sequence)) is not table
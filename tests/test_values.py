@@ -0,0 +1,51 @@
+import itertools
+import pickle
+from typing import List, Any
+
+import pytest
+
+from app.values import Scale, Chord, ChordSet, FretboardStrings
+
+# Groups of values, where values in the same group are equal and values in different groups are not
+GROUPS: List[List[Any]] = [
+
+    [Scale(["C", "D", "E"]), Scale(("C", "D", "E")), ("C", "D", "E")],
+    [Scale(["D", "E", "C"])],
+    [Chord(["C", "E", "G"]), Chord(("C", "E", "G"))],
+    [ChordSet({"I": ["C", "E", "G"], "ii": ["D", "F", "A"]}), ChordSet({"I": ("C", "E", "G"), "ii": Chord(["D", "F", "A"])})],
+    [ChordSet({"ii": ["D", "F", "A"], "I": ["C", "E", "G"]})],
+    [FretboardStrings({"E": ["E ", "__"], "A": ["__", "A#"]}), FretboardStrings({"A": ("__", "A#"), "E": ("E ", "__")})],
+    [FretboardStrings({"I": {"E": ["E ", "__"]}}), FretboardStrings({"I": FretboardStrings({"E": ("E ", "__")})})]
+
+]
+
+@pytest.mark.parametrize("first, second", [pair for group in GROUPS for pair in itertools.combinations(group, 2)])
+def test_equal_values_hash_alike(first: Any, second: Any) -> None:
+
+    assert first == second and second == first
+
+    assert hash(first) == hash(second)
+
+@pytest.mark.parametrize("first, second", [(first[0], second[0]) for first, second in itertools.combinations(GROUPS, 2)])
+def test_unequal_values(first: Any, second: Any) -> None:
+
+    assert first != second and second != first
+
+@pytest.mark.parametrize("value", [group[0] for group in GROUPS])
+def test_values_survive_pickling(value: Any) -> None:
+
+    restored: Any = pickle.loads(pickle.dumps(value))
+
+    assert restored == value and hash(restored) == hash(value) and type(restored) is type(value)
+
+def test_fretboard_strings_are_immutable() -> None:
+
+    strings: FretboardStrings = FretboardStrings({"E": ["E ", "__"]})
+
+    with pytest.raises(TypeError):
+
+        strings["E"] = ("__", "__")
+
+    with pytest.raises(AttributeError):
+
+        strings["E"].append("F ")
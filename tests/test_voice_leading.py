@@ -0,0 +1,23 @@
+from typing import List, Tuple
+
+import pytest
+
+from app.voice_leading import METRICS, nearest
+
+@pytest.mark.parametrize("metric", list(METRICS))
+def test_nearest_orders_every_metric(metric: str) -> None:
+
+    results: List[Tuple[int, Tuple[str, ...]]] = nearest(notes=["C", "E", "G"], metric=metric, count=10)
+
+    assert len(results) == 10
+
+    # Common tones are best when most, every other metric when least
+    values: List[int] = [value * METRICS[metric] for value, _ in results]
+
+    assert values == sorted(values)
+
+def test_nearest_rejects_unknown_metrics() -> None:
+
+    with pytest.raises(ValueError):
+
+        nearest(notes=["C", "E", "G"], metric="unknown")